@@ -3,16 +3,36 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import requests
+from urllib.parse import urlparse, urlencode
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import json
-from datetime import datetime, timedelta
+import multiprocessing
+import bisect
+import copy
+import functools
+import gzip
+import hashlib
+import os
+import re
+import tempfile
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from statistics import NormalDist
 import time
-from streamlit.components.v1 import html
+import streamlit.components.v1 as components
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import threading
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # Archive sur disque désactivée sans pyarrow
+    pa = None
+
 # Configuration de la page
 st.set_page_config(
     page_title="Ventusky Pro+ - Analytics Météo Avancées",
@@ -21,8 +41,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# CSS personnalisé avancé
-st.markdown("""
+# CSS personnalisé avancé (minifié une fois par processus, voir get_dashboard_style)
+DASHBOARD_CSS = """
 <style>
     .main-header {
         font-size: 3rem;
@@ -118,377 +138,2736 @@ st.markdown("""
         margin-right: 10px;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-class EnhancedWeatherAnalytics:
-    def __init__(self):
-        self.weather_data = self.generate_enhanced_sample_data()
-        self.storm_tracks = self.generate_enhanced_storm_data()
-        self.ai_predictions = self.generate_ai_predictions()
-        self.weather_alerts = self.generate_weather_alerts()
+def _scalar_or_array(values):
+    """Retourne un float pour une entrée scalaire, le tableau sinon"""
+    return float(values) if np.ndim(values) == 0 else values
+
+def calculate_heat_index(temperature, humidity):
+    """Indice de chaleur (°C) selon la régression de Rothfusz (NWS), vectorisé
+    
+    La formule simple de Steadman est utilisée en dessous de 80°F, avec les
+    corrections NWS pour les humidités très faibles ou très fortes.
+    """
+    t = np.asarray(temperature) * 9 / 5 + 32
+    rh = np.asarray(humidity)
+    simple = 0.5 * (t + 61 + (t - 68) * 1.2 + rh * 0.094)
+    full = (-42.379 + 2.04901523 * t + 10.14333127 * rh - 0.22475541 * t * rh
+            - 0.00683783 * t ** 2 - 0.05481717 * rh ** 2 + 0.00122874 * t ** 2 * rh
+            + 0.00085282 * t * rh ** 2 - 0.00000199 * t ** 2 * rh ** 2)
+    with np.errstate(invalid='ignore'):
+        dry = (rh < 13) & (t >= 80) & (t <= 112)
+        full = full - np.where(dry, (13 - rh) / 4 * np.sqrt(np.clip(17 - np.abs(t - 95), 0, None) / 17), 0)
+        humid = (rh > 85) & (t >= 80) & (t <= 87)
+        full = full + np.where(humid, (rh - 85) / 10 * (87 - t) / 5, 0)
+    heat_index = np.where((simple + t) / 2 < 80, simple, full)
+    return _scalar_or_array((heat_index - 32) * 5 / 9)
+
+def calculate_dew_point(temperature, humidity):
+    """Point de rosée (°C) par la formule de Magnus, vectorisé"""
+    t = np.asarray(temperature)
+    gamma = np.log(np.clip(np.asarray(humidity), 1e-3, 100) / 100) + 17.625 * t / (243.04 + t)
+    return _scalar_or_array(243.04 * gamma / (17.625 - gamma))
+
+def calculate_wind_chill(temperature, wind_speed):
+    """Refroidissement éolien (°C, vent en km/h), défini pour T ≤ 10°C et vent ≥ 4,8 km/h"""
+    t = np.asarray(temperature)
+    v = np.asarray(wind_speed)
+    v16 = np.power(np.clip(v, 0, None), 0.16)
+    wind_chill = 13.12 + 0.6215 * t - 11.37 * v16 + 0.3965 * t * v16
+    return _scalar_or_array(np.where((t <= 10) & (v >= 4.8), wind_chill, t))
+
+def calculate_apparent_temperature(temperature, humidity, wind_speed):
+    """Température ressentie (°C) de Steadman, humidité et vent (km/h) compris"""
+    t = np.asarray(temperature)
+    vapour_pressure = np.asarray(humidity) / 100 * 6.105 * np.exp(17.27 * t / (237.7 + t))
+    return _scalar_or_array(t + 0.33 * vapour_pressure - 0.70 * np.asarray(wind_speed) / 3.6 - 4.00)
+
+# Variables dérivées : fonction vectorisée et variables observées nécessaires
+DERIVED_VARIABLES = {
+    'heat_index': (calculate_heat_index, ('temperature', 'humidity')),
+    'dew_point': (calculate_dew_point, ('temperature', 'humidity')),
+    'wind_chill': (calculate_wind_chill, ('temperature', 'wind_speed')),
+    'feels_like': (calculate_apparent_temperature, ('temperature', 'humidity', 'wind_speed'))
+}
+
+# Marge du tampon d'observations au-delà des données initiales (une semaine horaire)
+OBSERVATION_HEADROOM = 24 * 7
+
+# Nombre de lignes par morceau lors des exports
+EXPORT_CHUNK_ROWS = 100_000
+
+# Taille visée d'une partie d'export : Streamlit charge le fichier entier en mémoire au clic,
+# les gros exports sont donc découpés en fichiers autonomes, chacun derrière son bouton
+EXPORT_PART_BYTES = 100 * 1024 * 1024
+
+# Durée de conservation des fichiers d'export temporaires (secondes)
+EXPORT_FILE_PREFIX = "ventusky-export-"
+EXPORT_FILE_TTL = 3600
+
+# Niveau de détail des graphiques : nombre maximal de points envoyés par courbe
+MAX_POINTS_PER_TRACE = 2000
+LOD_POINT_OPTIONS = [500, 1000, 2000, 4000]
+ANALYSIS_WINDOWS = {
+    "48 heures": pd.Timedelta(hours=48),
+    "7 jours": pd.Timedelta(days=7),
+    "30 jours": pd.Timedelta(days=30),
+    "Tout": None
+}
+
+def _as_numeric_axis(x):
+    """Convertit un axe (dates ou nombres) en float64 pour les calculs géométriques"""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+def downsample_minmax(x, y, n_out):
+    """Indices conservant le min et le max de chaque intervalle (n_out/2 intervalles)"""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= n_out or n_out < 4:
+        return np.arange(n)
+    n_buckets = n_out // 2
+    bucket_size = -(-n // n_buckets)
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, bucket_size)
+    valid = ~np.all(np.isnan(buckets), axis=1)
+    base = np.arange(n_buckets)[valid] * bucket_size
+    argmin = np.nanargmin(buckets[valid], axis=1) + base
+    argmax = np.nanargmax(buckets[valid], axis=1) + base
+    return np.unique(np.concatenate([[0], argmin, argmax, [n - 1]]))
+
+def downsample_lttb(x, y, n_out):
+    """Indices sélectionnés par l'algorithme Largest-Triangle-Three-Buckets"""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    x = _as_numeric_axis(x)
+    
+    # Intervalles intérieurs : le premier et le dernier point sont toujours conservés
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    n_buckets = len(sizes)
+    
+    # Moyenne de chaque intervalle (le dernier point sert de cible au dernier intervalle)
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    avg_x = np.append(sums_x / sizes, x[-1])
+    avg_y = np.append(sums_y / sizes, y[-1])
+    
+    # Candidats de chaque intervalle rangés dans une matrice (intervalles × taille max) ;
+    # le bourrage répète le premier candidat, que argmax préfère en cas d'égalité
+    width = sizes.max()
+    candidates = edges[:-1, np.newaxis] + np.arange(width)
+    candidates = np.where(candidates < edges[1:, np.newaxis], candidates, edges[:-1, np.newaxis])
+    cand_x = x[candidates]
+    cand_y = y[candidates]
+    
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous_x, previous_y = x[0], y[0]
+    for i in range(n_buckets):
+        # Aire du triangle (point retenu précédent, candidat, moyenne de l'intervalle suivant)
+        area = np.abs((previous_x - avg_x[i + 1]) * (cand_y[i] - previous_y)
+                      - (previous_x - cand_x[i]) * (avg_y[i + 1] - previous_y))
+        best = area.argmax()
+        selected[i + 1] = candidates[i, best]
+        previous_x, previous_y = cand_x[i, best], cand_y[i, best]
+    return selected
+
+def level_of_detail(frame, columns, max_points=MAX_POINTS_PER_TRACE, x_column='datetime', method='lttb'):
+    """Réduit chaque série à `max_points` points ; retourne {colonne: (x, y)}"""
+    x = frame[x_column].to_numpy()
+    downsample = downsample_lttb if method == 'lttb' else downsample_minmax
+    series = {}
+    for column in columns:
+        y = frame[column].to_numpy()
+        indices = downsample(x, y, max_points)
+        series[column] = (x[indices], y[indices])
+    return series
+
+def utc_now():
+    """Instant présent en UTC naïf : l'horloge de référence de toutes les séries horaires
+    
+    Open-Meteo est interrogé en UTC ; simulation, tempêtes, détecteur, nowcaster, alertes et
+    archive comparent leurs heures à cet instant, quel que soit le fuseau du serveur.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+class SyntheticWeatherGenerator:
+    """Générateur reproductible et vectorisé de données météo synthétiques (stations × temps)
+    
+    Toutes les variables d'un bloc stations × instants sont tirées en une seule passe
+    à partir d'un `np.random.Generator` ; les longues périodes sont produites par morceaux.
+    """
+    
+    VARIABLES = ['temperature', 'humidity', 'pressure', 'wind_speed', 'wind_direction',
+                 'precipitation', 'cloud_cover', 'visibility', 'uv_index', 'gust_speed']
+    
+    def __init__(self, seed=None, n_stations=1, dtype=np.float64):
+        self.rng = np.random.default_rng(seed)
+        self.n_stations = n_stations
+        self.dtype = dtype
+        # Décalage climatique propre à chaque station
+        self.station_offsets = self.rng.normal(0, 2, (n_stations, 1))
+        # Direction du vent de fin de bloc, pour enchaîner la marche aléatoire entre morceaux
+        self._wind_direction_state = np.zeros((n_stations, 1))
+        # Écart de pression et son incrément en fin de bloc (colonnes 0 et 1)
+        self._pressure_state = np.zeros((n_stations, 2))
+    
+    def generate_block(self, hours):
+        """Génère toutes les variables pour un bloc (n_stations, len(hours))
         
-    def generate_enhanced_sample_data(self):
-        """Génère des données météorologiques simulées plus réalistes et détaillées"""
-        dates = pd.date_range(start=datetime.now() - timedelta(days=14), 
-                             end=datetime.now() + timedelta(days=7), freq='H')
-        
-        # Génération de données plus réalistes avec saisonnalité
-        time_index = np.arange(len(dates))
-        
-        data = {
-            'datetime': dates,
-            'temperature': self.generate_realistic_temperature(time_index, len(dates)),
-            'humidity': np.clip(np.random.normal(65, 12, len(dates)) + np.sin(time_index * 0.05) * 10, 20, 95),
-            'pressure': np.random.normal(1013, 8, len(dates)) + np.sin(time_index * 0.02) * 5,
-            'wind_speed': self.generate_realistic_wind_speed(time_index, len(dates)),
-            'wind_direction': (np.cumsum(np.random.normal(0, 10, len(dates))) % 360),
-            'precipitation': self.generate_realistic_precipitation(time_index, len(dates)),
-            'cloud_cover': np.clip(np.random.normal(50, 25, len(dates)) + np.sin(time_index * 0.03) * 20, 0, 100),
-            'visibility': np.clip(np.random.normal(15, 5, len(dates)) - np.random.exponential(0.5, len(dates)) * 10, 1, 30),
-            'uv_index': np.clip(np.abs(np.sin(time_index * 0.1)) * 10 + np.random.normal(0, 1, len(dates)), 0, 12),
-            'dew_point': np.random.normal(15, 5, len(dates)) + np.sin(time_index * 0.05) * 3,
-            'feels_like': np.random.normal(25, 6, len(dates)),
-            'gust_speed': np.random.gamma(3, 2, len(dates)) + 5
-        }
+        `hours` est l'index temporel en heures depuis le début de la série.
+        """
+        rng = self.rng
+        hours = np.asarray(hours, dtype=np.float64)[np.newaxis, :]
+        shape = (self.n_stations, hours.shape[1])
+        daily_phase = np.sin(hours * 2 * np.pi / 24)
         
-        # Calcul de l'indice de chaleur
-        data['heat_index'] = self.calculate_heat_index(data['temperature'], data['humidity'])
+        temperature = self.generate_realistic_temperature(hours, daily_phase, shape) + self.station_offsets
+        humidity = np.clip(rng.normal(65, 12, shape) + np.sin(hours * 0.05) * 10, 20, 95)
         
-        return pd.DataFrame(data)
+        direction_steps = rng.normal(0, 10, shape)
+        wind_direction = self._wind_direction_state + np.cumsum(direction_steps, axis=1)
+        self._wind_direction_state = wind_direction[:, -1:] % 360
+        
+        block = {
+            'temperature': temperature,
+            'humidity': humidity,
+            'pressure': 1013 + self.generate_realistic_pressure_anomaly(shape) + np.sin(hours * 0.02) * 5,
+            'wind_speed': self.generate_realistic_wind_speed(daily_phase, shape),
+            'wind_direction': wind_direction % 360,
+            'precipitation': self.generate_realistic_precipitation(daily_phase, shape),
+            'cloud_cover': np.clip(rng.normal(50, 25, shape) + np.sin(hours * 0.03) * 20, 0, 100),
+            'visibility': np.clip(rng.normal(15, 5, shape) - rng.exponential(0.5, shape) * 10, 1, 30),
+            'uv_index': np.clip(np.abs(np.sin(hours * 0.1)) * 10 + rng.normal(0, 1, shape), 0, 12),
+            'gust_speed': rng.gamma(3, 2, shape) + 5
+        }
+        return {name: values.astype(self.dtype, copy=False) for name, values in block.items()}
     
-    def generate_realistic_temperature(self, time_index, n):
+    def generate_realistic_temperature(self, hours, daily_phase, shape):
         """Génère des températures réalistes avec cycle jour/nuit et tendance"""
-        base_temp = 25 + np.sin(time_index * 0.01) * 2  # Tendance saisonnière lente
-        daily_cycle = np.sin(time_index * 2 * np.pi / 24) * 8  # Cycle jour/nuit
-        noise = np.random.normal(0, 1.5, n)
+        base_temp = 25 + np.sin(hours * 0.01) * 2  # Tendance saisonnière lente
+        daily_cycle = daily_phase * 8  # Cycle jour/nuit
+        noise = self.rng.normal(0, 1.5, shape)
         return base_temp + daily_cycle + noise
     
-    def generate_realistic_wind_speed(self, time_index, n):
+    def generate_realistic_pressure_anomaly(self, shape):
+        """Écart de pression lisse : marche aléatoire à incréments AR(1), rappelée vers zéro
+        
+        Écart-type d'environ 8 hPa mais tendance sur 3 h de l'ordre de 0,5 hPa, comme une
+        pression réelle (un bruit blanc de même amplitude varie de ±11 hPa en 3 h).
+        """
+        if shape[1] == 0:
+            return np.zeros(shape)
+        from scipy.signal import lfilter
+        increment_phi, level_phi = 0.9, 0.995
+        increments = lfilter([1.0], [1.0, -increment_phi], self.rng.normal(0, 0.08, shape), axis=1,
+                             zi=increment_phi * self._pressure_state[:, 1:])[0]
+        anomaly = lfilter([1.0], [1.0, -level_phi], increments, axis=1,
+                          zi=level_phi * self._pressure_state[:, :1])[0]
+        self._pressure_state = np.column_stack([anomaly[:, -1], increments[:, -1]])
+        return anomaly
+    
+    def generate_realistic_wind_speed(self, daily_phase, shape):
         """Génère des vitesses de vent réalistes avec rafales"""
-        base_wind = np.random.gamma(1.5, 2, n) + 3
-        gusts = np.random.exponential(0.3, n) * 15
-        daily_variation = np.sin(time_index * 2 * np.pi / 24) * 2
+        base_wind = self.rng.gamma(1.5, 2, shape) + 3
+        gusts = self.rng.exponential(0.3, shape) * 15
+        daily_variation = daily_phase * 2
         return np.maximum(base_wind + gusts + daily_variation, 0)
     
-    def generate_realistic_precipitation(self, time_index, n):
+    def generate_realistic_precipitation(self, daily_phase, shape):
         """Génère des précipitations réalistes avec événements de pluie"""
         # Probabilité de pluie plus élevée la nuit
-        rain_prob = 0.3 + np.sin(time_index * 2 * np.pi / 24) * 0.2
-        rain_events = np.random.binomial(1, rain_prob, n)
-        intensity = np.random.exponential(2, n)
+        rain_prob = 0.3 + daily_phase * 0.2
+        rain_events = self.rng.random(shape) < rain_prob
+        intensity = self.rng.exponential(2, shape)
         return rain_events * intensity
     
-    def calculate_heat_index(self, temperature, humidity):
-        """Calcule l'indice de chaleur (heat index)"""
-        # Formule simplifiée de l'indice de chaleur
-        return temperature + 0.5 * (humidity / 100) * (temperature - 20)
+    def generate_frame(self, start, end, freq='h'):
+        """Génère un DataFrame pour la première station (schéma historique du dashboard)"""
+        dates = pd.date_range(start=start, end=end, freq=freq)
+        hours = (dates - dates[0]) / pd.Timedelta(hours=1)
+        block = self.generate_block(hours)
+        data = {'datetime': dates}
+        data.update({name: values[0] for name, values in block.items()})
+        return pd.DataFrame(data)
     
-    def generate_enhanced_storm_data(self):
-        """Génère des données de tempêtes plus réalistes avec modèles de trajectoire"""
-        storms = []
-        storm_names = ["ATLANTIC-01", "PACIFIC-ALPHA", "INDIAN-DELTA"]
+    def iter_chunks(self, start, end, freq='h', chunk_size=10_000):
+        """Produit des DataFrames longs (station, datetime, variables...) par morceaux
         
-        for i, name in enumerate(storm_names):
-            storm_start = datetime.now() - timedelta(hours=np.random.randint(12, 72))
-            track_points = []
-            
-            # Point de départ réaliste selon le bassin
-            if "ATLANTIC" in name:
-                lat, lon = np.random.uniform(10, 30), np.random.uniform(-80, -40)
-            elif "PACIFIC" in name:
-                lat, lon = np.random.uniform(5, 25), np.random.uniform(120, 160)
-            else:
-                lat, lon = np.random.uniform(-15, 5), np.random.uniform(50, 90)
+        `chunk_size` est le nombre d'instants par morceau : la mémoire reste bornée à
+        n_stations × chunk_size lignes, quelle que soit la longueur de la période.
+        """
+        start = pd.Timestamp(start)
+        step = pd.tseries.frequencies.to_offset(freq)
+        step_hours = pd.Timedelta(step) / pd.Timedelta(hours=1)
+        total = int((pd.Timestamp(end) - start) / pd.Timedelta(step)) + 1
+        station_ids = np.arange(self.n_stations, dtype=np.int32)
+        
+        for offset in range(0, total, chunk_size):
+            n_times = min(chunk_size, total - offset)
+            dates = pd.date_range(start=start + offset * step, periods=n_times, freq=freq)
+            hours = (offset + np.arange(n_times)) * step_hours
+            block = self.generate_block(hours)
             
-            for j in range(24):  # 6 jours de prévision
-                # Modèle de mouvement réaliste
-                lat += np.random.uniform(-0.3, 0.3)
-                lon += np.random.uniform(-0.4, 0.4)
-                
-                # Intensité qui évolue de manière réaliste
-                if j < 8:
-                    intensity = np.random.uniform(30, 80)  # Phase de développement
-                elif j < 16:
-                    intensity = np.random.uniform(80, 140)  # Phase mature
-                else:
-                    intensity = np.random.uniform(40, 100)  # Phase d'affaiblissement
-                
-                track_points.append({
-                    'datetime': storm_start + timedelta(hours=j*6),
-                    'lat': lat,
-                    'lon': lon,
-                    'intensity': intensity,
-                    'category': self.get_storm_category(intensity),
-                    'pressure': 1010 - (intensity / 5),
-                    'radius': intensity * 0.5 + np.random.uniform(50, 150)
-                })
-            storms.append({
-                'name': name,
-                'track': track_points,
-                'current_threat': np.random.choice(['Faible', 'Modéré', 'Élevé'], p=[0.3, 0.5, 0.2])
-            })
-        return storms
-    
-    def get_storm_category(self, wind_speed):
-        """Catégorise les tempêtes selon l'échelle de Saffir-Simpson améliorée"""
-        if wind_speed >= 252:
-            return "Catégorie 5"
-        elif wind_speed >= 209:
-            return "Catégorie 4"
-        elif wind_speed >= 178:
-            return "Catégorie 3"
-        elif wind_speed >= 154:
-            return "Catégorie 2"
-        elif wind_speed >= 119:
-            return "Catégorie 1"
-        elif wind_speed >= 63:
-            return "Tempête Tropicale"
-        else:
-            return "Dépression Tropicale"
+            chunk = {
+                'station': np.repeat(station_ids, n_times),
+                'datetime': np.tile(dates.values, self.n_stations)
+            }
+            chunk.update({name: values.ravel() for name, values in block.items()})
+            yield pd.DataFrame(chunk)
+
+# Échelle de Saffir-Simpson améliorée : seuils de vent (km/h) et libellés associés
+STORM_CATEGORY_BINS = np.array([63, 119, 154, 178, 209, 252])
+STORM_CATEGORY_LABELS = np.array([
+    "Dépression Tropicale", "Tempête Tropicale", "Catégorie 1", "Catégorie 2",
+    "Catégorie 3", "Catégorie 4", "Catégorie 5"
+])
+
+# Zones de genèse par bassin : (latitudes, longitudes)
+STORM_BASINS = {
+    'ATLANTIC': ((10, 30), (-80, -40)),
+    'PACIFIC': ((5, 25), (120, 160)),
+    'INDIAN': ((-15, 5), (50, 90))
+}
+
+def categorize_storm_intensity(wind_speed):
+    """Catégorise des vitesses de vent en un seul appel de binning vectorisé"""
+    return np.digitize(wind_speed, STORM_CATEGORY_BINS).astype(np.int8)
+
+class StormTrackStore:
+    """Stockage colonnaire des trajectoires de tempêtes
     
-    def generate_ai_predictions(self):
-        """Génère des prédictions IA simulées"""
-        current_time = datetime.now()
-        predictions = {
-            'short_term': {
-                'next_6h': {
-                    'trend': 'stable',
-                    'confidence': 0.85,
-                    'details': 'Conditions stables avec vent modéré'
-                },
-                'next_12h': {
-                    'trend': 'deteriorating', 
-                    'confidence': 0.72,
-                    'details': 'Arrivée d\'un front froid avec pluies'
-                }
-            },
-            'storm_development': {
-                'probability': 0.45,
-                'expected_intensity': 'Modérée',
-                'timeline': '24-48 heures'
-            },
-            'anomalies': [
-                'Pression anormalement basse dans le secteur Nord',
-                'Augmentation rapide de l\'humidité',
-                'Variations de vent inhabituelles'
-            ]
-        }
-        return predictions
+    Chaque champ est un tableau typé contenant tous les points de toutes les tempêtes,
+    concaténés ; `offsets` délimite la trajectoire de chaque tempête (style CSR).
+    """
     
-    def generate_weather_alerts(self):
-        """Génère des alertes météorologiques avancées"""
-        alerts = [
-            {
-                'type': 'VIGILANCE_ORANGE',
-                'title': 'Vent violent',
-                'region': 'Côtes Nord',
-                'severity': 'Élevée',
-                'start_time': datetime.now(),
-                'end_time': datetime.now() + timedelta(hours=12),
-                'description': 'Rafales attendues jusqu\'à 90 km/h',
-                'impact': 'Transport maritime perturbé',
-                'actions': 'Éviter les zones côtières'
-            },
-            {
-                'type': 'VIGILANCE_JAUNE',
-                'title': 'Fortes précipitations',
-                'region': 'Secteur Est', 
-                'severity': 'Modérée',
-                'start_time': datetime.now() + timedelta(hours=6),
-                'end_time': datetime.now() + timedelta(hours=18),
-                'description': 'Cumuls attendus: 40-60 mm',
-                'impact': 'Risque de ruissellement',
-                'actions': 'Surveillance des cours d\'eau'
-            }
-        ]
-        return alerts
+    def __init__(self, names, offsets, datetimes, lat, lon, intensity, pressure, radius, current_threat):
+        self.names = list(names)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.datetime = np.asarray(datetimes, dtype='datetime64[ns]')
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.intensity = np.asarray(intensity, dtype=np.float32)
+        self.pressure = np.asarray(pressure, dtype=np.float32)
+        self.radius = np.asarray(radius, dtype=np.float32)
+        self.category_code = categorize_storm_intensity(self.intensity)
+        self.storm_id = np.repeat(np.arange(len(self.names), dtype=np.int32), np.diff(self.offsets))
+        self.current_threat = np.asarray(current_threat)
+        self._index = {name: i for i, name in enumerate(self.names)}
     
-    def create_advanced_metrics_dashboard(self):
-        """Crée un tableau de bord de métriques avancées"""
-        current = self.weather_data.iloc[-1]
-        previous = self.weather_data.iloc[-2]
+    @classmethod
+    def generate(cls, names, n_points=24, step_hours=6, rng=None, start=None):
+        """Génère les trajectoires de toutes les tempêtes en une passe vectorisée
         
-        # Métriques principales avec tendances
-        col1, col2, col3, col4, col5 = st.columns(5)
+        `start` fixe le début de chaque trajectoire (par défaut : entre 12 h et 72 h avant maintenant).
+        """
+        rng = np.random.default_rng(rng)
+        n_storms = len(names)
+        shape = (n_storms, n_points)
         
-        with col1:
-            delta_temp = current['temperature'] - previous['temperature']
-            trend_icon = "📈" if delta_temp > 0 else "📉" if delta_temp < 0 else "➡️"
-            st.metric("🌡️ Température", f"{current['temperature']:.1f}°C", 
-                     f"{trend_icon} {delta_temp:+.1f}°C")
+        # Point de départ réaliste selon le bassin
+        basin_bounds = np.array([
+            next((bounds for basin, bounds in STORM_BASINS.items() if basin in name),
+                 STORM_BASINS['INDIAN'])
+            for name in names
+        ], dtype=np.float64).reshape(n_storms, 2, 2)
+        lat0 = rng.uniform(basin_bounds[:, 0, 0], basin_bounds[:, 0, 1])
+        lon0 = rng.uniform(basin_bounds[:, 1, 0], basin_bounds[:, 1, 1])
         
-        with col2:
-            delta_wind = current['wind_speed'] - previous['wind_speed']
-            st.metric("💨 Vent Moyen", f"{current['wind_speed']:.1f} km/h",
-                     f"{delta_wind:+.1f} km/h")
-            st.metric("💨 Rafales", f"{current['gust_speed']:.1f} km/h")
+        # Modèle de mouvement : marche aléatoire par somme cumulée
+        lat = lat0[:, np.newaxis] + np.cumsum(rng.uniform(-0.3, 0.3, shape), axis=1)
+        lon = lon0[:, np.newaxis] + np.cumsum(rng.uniform(-0.4, 0.4, shape), axis=1)
         
-        with col3:
-            delta_pressure = current['pressure'] - previous['pressure']
-            pressure_trend = "📉" if delta_pressure < -2 else "📈" if delta_pressure > 2 else "➡️"
-            st.metric("📊 Pression", f"{current['pressure']:.1f} hPa",
-                     f"{pressure_trend} {delta_pressure:+.1f} hPa")
+        # Intensité : développement, phase mature puis affaiblissement
+        phase = np.minimum(np.arange(n_points) * 3 // n_points, 2)
+        low = np.array([30, 80, 40])[phase]
+        high = np.array([80, 140, 100])[phase]
+        intensity = low + (high - low) * rng.random(shape)
         
-        with col4:
-            heat_index = current['heat_index']
-            risk_level = "⚠️" if heat_index > 30 else "✅"
-            st.metric("🔥 Indice Chaleur", f"{heat_index:.1f}°C", risk_level)
-            st.metric("💧 Point Rosée", f"{current['dew_point']:.1f}°C")
+        if start is None:
+            storm_start = np.datetime64(utc_now(), 'ns') - rng.integers(12, 72, n_storms).astype('timedelta64[h]')
+        else:
+            storm_start = np.broadcast_to(np.asarray(start, dtype='datetime64[ns]'), (n_storms,))
+        datetimes = storm_start[:, np.newaxis] + (np.arange(n_points) * step_hours).astype('timedelta64[h]')
         
-        with col5:
-            st.metric("🌧️ Précipitation", f"{current['precipitation']:.1f} mm/h")
-            st.metric("👁️ Visibilité", f"{current['visibility']:.1f} km")
+        return cls(
+            names=names,
+            offsets=np.arange(n_storms + 1) * n_points,
+            datetimes=datetimes.ravel(),
+            lat=lat.ravel(),
+            lon=lon.ravel(),
+            intensity=intensity.ravel(),
+            pressure=(1010 - intensity / 5).ravel(),
+            radius=(intensity * 0.5 + rng.uniform(50, 150, shape)).ravel(),
+            current_threat=rng.choice(['Faible', 'Modéré', 'Élevé'], size=n_storms, p=[0.3, 0.5, 0.2])
+        )
     
-    def create_ai_weather_analysis(self):
-        """Analyse météo avancée avec insights IA"""
-        st.markdown("### 🧠 IA Météo - Analyse Prédictive")
-        
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            # Graphique d'analyse de tendances
-            fig = make_subplots(rows=2, cols=1, 
-                               subplot_titles=('Analyse Multi-Variables', 'Indices de Confort'),
-                               vertical_spacing=0.12)
-            
-            # Variables principales
-            recent_data = self.weather_data.tail(48)
-            fig.add_trace(
-                go.Scatter(x=recent_data['datetime'], y=recent_data['temperature'],
-                          name='Température', line=dict(color='red', width=3)),
-                row=1, col=1
-            )
-            fig.add_trace(
-                go.Scatter(x=recent_data['datetime'], y=recent_data['pressure'],
-                          name='Pression', line=dict(color='blue', width=2), yaxis='y2'),
-                row=1, col=1
-            )
-            
-            # Indices de confort
-            fig.add_trace(
-                go.Scatter(x=recent_data['datetime'], y=recent_data['heat_index'],
-                          name='Indice Chaleur', line=dict(color='orange', width=2)),
-                row=2, col=1
-            )
-            fig.add_trace(
-                go.Scatter(x=recent_data['datetime'], y=recent_data['dew_point'],
-                          name='Point Rosée', line=dict(color='green', width=2)),
-                row=2, col=1
-            )
-            
-            fig.update_layout(height=500, showlegend=True)
-            fig.update_yaxes(title_text="Pression (hPa)", secondary_y=True, row=1, col=1)
-            
-            st.plotly_chart(fig, use_container_width=True)
+    def __len__(self):
+        return len(self.names)
+    
+    def storm_index(self, storm):
+        """Retourne l'indice d'une tempête à partir de son nom ou de son indice"""
+        return self._index[storm] if isinstance(storm, str) else int(storm)
+    
+    def track(self, storm):
+        """Vues (sans copie) sur les colonnes de la trajectoire d'une tempête"""
+        i = self.storm_index(storm)
+        window = slice(self.offsets[i], self.offsets[i + 1])
+        return {
+            'datetime': self.datetime[window],
+            'lat': self.lat[window],
+            'lon': self.lon[window],
+            'intensity': self.intensity[window],
+            'pressure': self.pressure[window],
+            'radius': self.radius[window],
+            'category_code': self.category_code[window]
+        }
+    
+    def latest(self, storm):
+        """État courant (dernier point) d'une tempête"""
+        i = self.storm_index(storm)
+        last = self.offsets[i + 1] - 1
+        return {
+            'datetime': self.datetime[last],
+            'lat': float(self.lat[last]),
+            'lon': float(self.lon[last]),
+            'intensity': float(self.intensity[last]),
+            'pressure': float(self.pressure[last]),
+            'radius': float(self.radius[last]),
+            'category': STORM_CATEGORY_LABELS[self.category_code[last]]
+        }
+
+# Historique synthétique des saisons cycloniques (~90 tempêtes par an dans le monde)
+STORM_HISTORY_SEASONS = 30
+STORM_HISTORY_STORMS_PER_SEASON = 90
+STORM_HISTORY_POINTS = 80  # 10 jours au pas de 3 h
+
+def historical_storm_tracks(seasons=STORM_HISTORY_SEASONS, storms_per_season=STORM_HISTORY_STORMS_PER_SEASON,
+                            n_points=STORM_HISTORY_POINTS, seed=None):
+    """Trajectoires des saisons passées, nommées BASSIN-ANNÉE-NN, dans un seul StormTrackStore"""
+    rng = np.random.default_rng(seed)
+    last_season = utc_now().year - 1
+    years = np.repeat(np.arange(last_season - seasons + 1, last_season + 1), storms_per_season)
+    numbers = np.tile(np.arange(1, storms_per_season + 1), seasons)
+    basins = list(STORM_BASINS)
+    names = [f"{basins[i % len(basins)]}-{year}-{number:02d}" for i, (year, number) in enumerate(zip(years, numbers))]
+    start = ((years - 1970).astype('datetime64[Y]').astype('datetime64[ns]')
+             + rng.integers(0, 365 * 24, len(names)).astype('timedelta64[h]'))
+    return StormTrackStore.generate(names, n_points=n_points, step_hours=3, rng=rng, start=start)
+
+def nan_separated(storm_id, *columns):
+    """Concatène des colonnes de trajectoires en polylignes séparées par des NaN
+    
+    `storm_id` doit être groupé (points d'une tempête contigus) ; un NaN est inséré après
+    chaque tempête, sans boucle Python : une seule trace dessine toutes les trajectoires.
+    Les colonnes entières (données de survol) gardent leur type, avec 0 comme séparateur.
+    """
+    storm_id = np.asarray(storm_id)
+    starts = np.r_[True, storm_id[1:] != storm_id[:-1]] if len(storm_id) else np.zeros(0, dtype=bool)
+    positions = np.arange(len(storm_id)) + np.cumsum(starts) - 1
+    size = len(storm_id) + int(starts.sum())
+    separated = []
+    for column in columns:
+        column = np.asarray(column)
+        if not np.issubdtype(column.dtype, np.integer):
+            column = column.astype(np.float64)
+        out = np.full((size,) + column.shape[1:], np.nan if column.dtype == np.float64 else 0, dtype=column.dtype)
+        out[positions] = column
+        separated.append(out)
+    return separated
+
+# Emprises côtières approximatives (latitudes, longitudes) pour les probabilités d'atterrissage
+LANDFALL_REGIONS = {
+    'Antilles': ((12.0, 18.5), (-68.0, -59.0)),
+    'Hispaniola': ((17.5, 20.0), (-74.5, -68.3)),
+    'Cuba': ((19.8, 23.3), (-85.0, -74.1)),
+    'Floride': ((25.0, 31.0), (-83.0, -80.0)),
+    'Philippines': ((5.0, 19.0), (117.0, 127.0)),
+    'Taïwan': ((21.9, 25.3), (120.0, 122.0)),
+    'Japon (Sud)': ((30.0, 35.0), (129.0, 141.0)),
+    'Guam': ((13.2, 13.7), (144.6, 145.0)),
+    'Madagascar': ((-25.6, -12.0), (43.2, 50.5)),
+    'La Réunion': ((-21.4, -20.8), (55.2, 55.9)),
+    'Maurice': ((-20.6, -19.9), (57.3, 57.8)),
+    'Sri Lanka': ((5.9, 9.9), (79.6, 81.9)),
+    'Inde (côte Est)': ((8.0, 21.0), (77.0, 87.0))
+}
+
+# Fond de carte sans tuiles distantes : serveur de tuiles XYZ local ou fond vectoriel hors ligne
+MAP_TILE_URL = os.environ.get('METEO_TILE_URL')  # ex. http://localhost:8080/tiles/{z}/{x}/{y}.png
+STORM_OVERVIEW_MAX_POINTS = 300_000  # au-delà, les trajectoires historiques sont décimées
+
+COASTLINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets', 'coastline.geojson')
+
+@functools.lru_cache(maxsize=1)
+def load_coastline():
+    """Traits de côte embarqués (contours simplifiés, domaine public), lus une seule fois"""
+    with open(COASTLINE_PATH, encoding='utf-8') as handle:
+        return json.load(handle)
+
+def offline_basemap_layers():
+    """Couches GeoJSON embarquées : traits de côte simplifiés et graticule de 10°"""
+    graticule = [[[lon, lat] for lat in range(-80, 81, 5)] for lon in range(-180, 181, 10)]
+    graticule += [[[lon, lat] for lon in range(-180, 181, 5)] for lat in range(-80, 81, 10)]
+    return [
+        dict(sourcetype='geojson', type='line', below='traces', color='rgba(120, 140, 160, 0.35)', line=dict(width=0.5),
+             source={'type': 'Feature', 'geometry': {'type': 'MultiLineString', 'coordinates': graticule}}),
+        dict(sourcetype='geojson', type='line', below='traces', color='rgba(70, 80, 90, 0.8)', line=dict(width=1),
+             source=load_coastline())
+    ]
+
+def landfall_regions_trace():
+    """Cadres des régions d'atterrissage (LANDFALL_REGIONS), nommés au survol
+    
+    Ce sont des emprises rectangulaires utilisées pour les probabilités, pas des côtes :
+    elles sont tracées en contour, sans remplissage, pour ne pas passer pour des terres.
+    """
+    lat, lon, text = [], [], []
+    for name, ((lat0, lat1), (lon0, lon1)) in LANDFALL_REGIONS.items():
+        lat += [lat0, lat0, lat1, lat1, lat0, None]
+        lon += [lon0, lon1, lon1, lon0, lon0, None]
+        text += [name] * 5 + [None]
+    return go.Scattermapbox(
+        lat=lat,
+        lon=lon,
+        mode='lines',
+        line=dict(width=1, color='rgba(150, 110, 60, 0.8)'),
+        name="Régions d'atterrissage",
+        text=text,
+        hovertemplate="Région d'atterrissage : %{text}<extra></extra>"
+    )
+
+def storm_map_style():
+    """Style mapbox des cartes de tempêtes : tuiles locales (METEO_TILE_URL) ou fond hors ligne"""
+    if MAP_TILE_URL:
+        return dict(style='white-bg', layers=[dict(sourcetype='raster', source=[MAP_TILE_URL], below='traces',
+                                                   sourceattribution="Tuiles locales")])
+    return dict(style='white-bg', layers=offline_basemap_layers())
+
+ENSEMBLE_MEMBERS = 2000
+ENSEMBLE_STEPS = 20  # 5 jours par pas de 6 h
+# Membres au total (toutes tempêtes) en deçà desquels l'envoi au pool coûte plus qu'il ne rapporte :
+# `benchmarks/bench_ensemble.py --calibrate` mesure ≈ 1,4 ms d'aller-retour contre ≈ 5 µs par membre,
+# soit ≈ 600 membres sur deux cœurs ; le seuil garde une marge pour les machines chargées
+PARALLEL_ENSEMBLE_MIN_MEMBERS = 2_000
+# Processus de travail démarrés depuis un serveur vierge : forker le serveur Streamlit, multithreadé,
+# depuis le thread de pré-calcul risquerait d'hériter d'un verrou tenu par un autre thread
+STORM_EXECUTOR_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+CONE_PROBABILITY = 67  # percentile des distances au centre (cône « deux tiers » du NHC)
+EARTH_RADIUS_KM = 6371.0
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Distance orthodromique (km), vectorisée"""
+    lat1, lon1, lat2, lon2 = (np.radians(value) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+def ar1_filter(noise, phi):
+    """Filtre AR(1) x_t = φ·x_{t-1} + e_t le long de l'axe 1, en un seul produit matriciel
+    
+    Le noyau triangulaire (pas × pas) contient φ^(t-k) : tous les membres et tous les pas
+    sont filtrés ensemble, sans boucle sur le temps.
+    """
+    lag = np.arange(noise.shape[1])[np.newaxis, :] - np.arange(noise.shape[1])[:, np.newaxis]
+    kernel = np.where(lag >= 0, phi ** np.clip(lag, 0, None), 0.0)
+    return np.moveaxis(np.moveaxis(noise, 1, -1) @ kernel, -1, 1)
+
+def simulate_storm_ensemble(start, velocity, intensity, n_members=ENSEMBLE_MEMBERS, n_steps=ENSEMBLE_STEPS,
+                            step_hours=6, seed=None, sample_members=30):
+    """Projette `n_members` trajectoires d'une tempête et résume l'ensemble
+    
+    Déplacement : persistance de la vitesse récente plus une perturbation AR(1) ; intensité :
+    affaiblissement lent, bruit AR(1) et décroissance exponentielle après l'arrivée sur terre.
+    Tout est vectorisé sur (membres × pas) ; seuls le résumé et un échantillon de membres
+    sont retournés (résultat léger, transmissible entre processus).
+    """
+    rng = np.random.default_rng(seed)
+    shape = (n_members, n_steps)
+    
+    # Perturbations de vitesse corrélées dans le temps (AR(1), φ = 0.85)
+    noise = rng.normal(0, 1, shape + (2,)) * np.array([0.12, 0.15])
+    perturbation = ar1_filter(noise, 0.85)
+    steps = np.asarray(velocity, dtype=np.float64) + perturbation
+    lat = start[0] + np.cumsum(steps[..., 0], axis=1)
+    lon = start[1] + np.cumsum(steps[..., 1], axis=1)
+    
+    on_land = np.zeros(shape, dtype=bool)
+    landfall = {}
+    for region, ((lat_min, lat_max), (lon_min, lon_max)) in LANDFALL_REGIONS.items():
+        inside = (lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)
+        hit = inside.any(axis=1)
+        if hit.any():
+            landfall[region] = float(hit.mean())
+        on_land |= inside
+    reached = on_land.any(axis=1)
+    first_landfall = np.argmax(on_land, axis=1)
+    
+    changes = ar1_filter(rng.normal(-0.6, 4.0, shape), 0.6)
+    land_hours = np.cumsum(on_land, axis=1) * step_hours
+    wind = np.clip((intensity + np.cumsum(changes, axis=1)) * np.exp(-land_hours / 24), 0, None)
+    
+    # Cône d'incertitude : centre de l'ensemble et rayon contenant CONE_PROBABILITY % des membres
+    center_lat = lat.mean(axis=0)
+    center_lon = lon.mean(axis=0)
+    radius = np.percentile(haversine_km(lat, lon, center_lat, center_lon), CONE_PROBABILITY, axis=0)
+    
+    center_lat = np.concatenate([[start[0]], center_lat])
+    center_lon = np.concatenate([[start[1]], center_lon])
+    radius = np.concatenate([[0.0], radius])
+    heading = np.arctan2(np.gradient(center_lat), np.gradient(center_lon) * np.cos(np.radians(center_lat)))
+    normal_lat = np.cos(heading) * radius / 111.0
+    normal_lon = -np.sin(heading) * radius / (111.0 * np.cos(np.radians(center_lat)))
+    cone_lat = np.concatenate([center_lat + normal_lat, (center_lat - normal_lat)[::-1], center_lat[:1] + normal_lat[:1]])
+    cone_lon = np.concatenate([center_lon + normal_lon, (center_lon - normal_lon)[::-1], center_lon[:1] + normal_lon[:1]])
+    
+    sample = slice(0, min(sample_members, n_members))
+    return {
+        'members': n_members,
+        'start_intensity': float(intensity),
+        'step_hours': step_hours,
+        'center_lat': center_lat,
+        'center_lon': center_lon,
+        'radius_km': radius,
+        'cone_lat': cone_lat,
+        'cone_lon': cone_lon,
+        'sample_lat': np.column_stack([np.full(sample.stop, start[0]), lat[sample]]).astype(np.float32),
+        'sample_lon': np.column_stack([np.full(sample.stop, start[1]), lon[sample]]).astype(np.float32),
+        'intensity_quantiles': np.percentile(np.column_stack([np.full(n_members, float(intensity)), wind]),
+                                             [10, 50, 90], axis=0).astype(np.float32),
+        'landfall': dict(sorted(landfall.items(), key=lambda item: -item[1])),
+        'landfall_probability': float(reached.mean()),
+        'landfall_hours': float(np.median(first_landfall[reached] + 1) * step_hours) if reached.any() else None
+    }
+
+def _simulate_storm_ensemble_task(arguments):
+    """Point d'entrée des processus de travail"""
+    args, options = arguments
+    return simulate_storm_ensemble(*args, **options)
+
+def forecast_storm_ensembles(store, n_members=ENSEMBLE_MEMBERS, n_steps=ENSEMBLE_STEPS, step_hours=6,
+                             seed=None, executor=None, now=None, parallel_min_members=PARALLEL_ENSEMBLE_MIN_MEMBERS):
+    """Ensembles de prévision de toutes les tempêtes d'un `StormTrackStore`
+    
+    Chaque tempête part de son dernier point observé (antérieur à `now`). Avec un
+    `executor` (pool de processus), les tempêtes sont simulées en parallèle dès que
+    le nombre total de membres atteint `parallel_min_members`.
+    """
+    now = np.datetime64(now or utc_now(), 'ns')
+    seeds = np.random.SeedSequence(seed).spawn(len(store))
+    tasks = []
+    start_times = []
+    for i in range(len(store)):
+        track = store.track(i)
+        observed = max(int(np.searchsorted(track['datetime'], now, side='right')) - 1, 0)
+        recent = slice(max(observed - 3, 0), observed + 1)
+        lat, lon = track['lat'][recent], track['lon'][recent]
+        velocity = (float(np.diff(lat).mean()), float(np.diff(lon).mean())) if len(lat) > 1 else (0.0, 0.0)
+        start = (float(track['lat'][observed]), float(track['lon'][observed]))
+        start_times.append(track['datetime'][observed])
+        tasks.append(((start, velocity, float(track['intensity'][observed])),
+                      dict(n_members=n_members, n_steps=n_steps, step_hours=step_hours, seed=seeds[i])))
+    
+    if executor is not None and len(tasks) > 1 and len(tasks) * n_members >= parallel_min_members:
+        results = list(executor.map(_simulate_storm_ensemble_task, tasks))
+    else:
+        results = [_simulate_storm_ensemble_task(task) for task in tasks]
+    for result, start_time in zip(results, start_times):
+        result['start_time'] = start_time
+    return dict(zip(store.names, results))
+
+def format_probability(probability):
+    """Probabilité en pourcentage entier (« <1% » pour un événement rare mais non nul)"""
+    return "<1%" if 0 < probability < 0.005 else f"{probability:.0%}"
+
+def assess_storm_threat(intensity, ensemble):
+    """Niveau de menace à partir de l'intensité courante et de la probabilité d'atterrissage"""
+    probability = ensemble['landfall_probability']
+    if probability >= 0.5 and intensity >= STORM_CATEGORY_BINS[1] or probability >= 0.8:
+        return 'Élevé'
+    if probability >= 0.2 or intensity >= STORM_CATEGORY_BINS[2]:
+        return 'Modéré'
+    return 'Faible'
+
+# Villes de référence (nom, latitude, longitude) exposées aux bassins cycloniques simulés
+GAZETTEER_CITIES = [
+    ("Saint-Denis", -20.8823, 55.4504), ("Saint-Pierre", -21.3393, 55.4781), ("Saint-Paul", -21.0096, 55.2707),
+    ("Saint-Benoît", -21.0339, 55.7128), ("Port-Louis", -20.1609, 57.5012), ("Curepipe", -20.3163, 57.5259),
+    ("Antananarivo", -18.8792, 47.5079), ("Toamasina", -18.1492, 49.4023), ("Mahajanga", -15.7167, 46.3167),
+    ("Toliara", -23.3568, 43.6691), ("Antsiranana", -12.2787, 49.2917), ("Moroni", -11.7172, 43.2473),
+    ("Mamoudzou", -12.7806, 45.2279), ("Victoria", -4.6191, 55.4513), ("Malé", 4.1755, 73.5093),
+    ("Colombo", 6.9271, 79.8612), ("Chennai", 13.0827, 80.2707), ("Visakhapatnam", 17.6868, 83.2185),
+    ("Kolkata", 22.5726, 88.3639),
+    ("Miami", 25.7617, -80.1918), ("Key West", 24.5551, -81.7800), ("Tampa", 27.9506, -82.4572),
+    ("La Havane", 23.1136, -82.3666), ("Santiago de Cuba", 20.0247, -75.8219), ("Saint-Domingue", 18.4861, -69.9312),
+    ("Port-au-Prince", 18.5944, -72.3074), ("San Juan", 18.4655, -66.1057), ("Pointe-à-Pitre", 16.2411, -61.5331),
+    ("Fort-de-France", 14.6161, -61.0588), ("Bridgetown", 13.0975, -59.6167), ("Nassau", 25.0443, -77.3504),
+    ("Kingston", 17.9712, -76.7936), ("Hamilton", 32.2949, -64.7814),
+    ("Manille", 14.5995, 120.9842), ("Cebu", 10.3157, 123.8854), ("Davao", 7.1907, 125.4553),
+    ("Legazpi", 13.1391, 123.7438), ("Taipei", 25.0330, 121.5654), ("Kaohsiung", 22.6273, 120.3014),
+    ("Naha", 26.2124, 127.6809), ("Kagoshima", 31.5966, 130.5571), ("Hong Kong", 22.3193, 114.1694),
+    ("Hagåtña", 13.4443, 144.7937), ("Saipan", 15.1850, 145.7467), ("Koror", 7.3419, 134.4792)
+]
+GAZETTEER_PATH = os.environ.get('METEO_GAZETTEER_PATH')  # CSV : name, lat, lon[, kind]
+GAZETTEER_MONITORING_POINTS = 5000
+
+def lat_lon_to_unit_xyz(lat, lon):
+    """Projection sur la sphère unité (coordonnées cartésiennes 3D), vectorisée"""
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+class PointOfInterestIndex:
+    """Index spatial d'un répertoire de lieux (k-d tree sur la sphère unité)
+    
+    Sur la sphère unité, un rayon orthodromique correspond exactement à une corde : la
+    recherche par boule du k-d tree sélectionne les candidats, dont la distance est ensuite
+    affinée par haversine en un seul appel vectorisé.
+    """
+    
+    def __init__(self, names, lat, lon, kinds=None):
+        from scipy.spatial import cKDTree
         
-        with col2:
-            # Insights IA
-            st.markdown("#### 📋 Insights IA")
-            
-            st.markdown("##### 🔮 Prévisions Court Terme")
-            for period, prediction in self.ai_predictions['short_term'].items():
-                with st.container():
-                    st.write(f"**{period.replace('_', ' ').title()}**")
-                    st.write(f"Tendance: {prediction['trend']}")
-                    st.write(f"Confiance: {prediction['confidence']*100}%")
-                    st.write(prediction['details'])
-                    st.progress(prediction['confidence'])
-                    st.markdown("---")
-            
-            st.markdown("##### ⚠️ Anomalies Détectées")
-            for anomaly in self.ai_predictions['anomalies']:
-                st.write(f"• {anomaly}")
+        self.names = np.asarray(names, dtype=object)
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.kinds = np.asarray(kinds if kinds is not None else ['Lieu'] * len(self.names), dtype=object)
+        self.tree = cKDTree(lat_lon_to_unit_xyz(self.lat, self.lon))
     
-    def create_advanced_storm_analytics(self):
-        """Analytics avancés pour les tempêtes"""
-        st.markdown("### 🌀 Analytics Tempêtes Avancés")
+    def __len__(self):
+        return len(self.names)
+    
+    @classmethod
+    def from_csv(cls, path):
+        """Charge un répertoire CSV (colonnes name, lat, lon et, optionnellement, kind)"""
+        frame = pd.read_csv(path)
+        return cls(frame['name'], frame['lat'], frame['lon'], frame['kind'] if 'kind' in frame else None)
+    
+    @classmethod
+    def default(cls, n_points=GAZETTEER_MONITORING_POINTS, seed=0):
+        """Villes de référence complétées de points de surveillance répartis sur les bassins"""
+        rng = np.random.default_rng(seed)
+        bounds = np.array(list(STORM_BASINS.values()), dtype=np.float64) + np.array([[-10, 10], [-15, 15]])
+        basin = rng.integers(len(bounds), size=n_points)
+        lat = rng.uniform(bounds[basin, 0, 0], bounds[basin, 0, 1])
+        lon = rng.uniform(bounds[basin, 1, 0], bounds[basin, 1, 1])
+        names, city_lat, city_lon = zip(*GAZETTEER_CITIES)
+        return cls(list(names) + [f"Point de surveillance {i:05d}" for i in range(n_points)],
+                   np.concatenate([city_lat, lat]), np.concatenate([city_lon, lon]),
+                   ['Ville'] * len(names) + ['Point de surveillance'] * n_points)
+    
+    def within(self, lat, lon, radius_km):
+        """Couples (requête, lieu, distance km) pour tous les lieux à moins de `radius_km` de chaque point"""
+        lat, lon = np.atleast_1d(lat).astype(np.float64), np.atleast_1d(lon).astype(np.float64)
+        radius_km = np.broadcast_to(np.asarray(radius_km, dtype=np.float64), lat.shape)
+        chord = 2 * np.sin(np.minimum(radius_km / (2 * EARTH_RADIUS_KM), np.pi / 2))
+        candidates = self.tree.query_ball_point(lat_lon_to_unit_xyz(lat, lon), chord)
+        counts = np.fromiter((len(found) for found in candidates), dtype=np.int64, count=len(candidates))
+        query = np.repeat(np.arange(len(lat)), counts)
+        poi = np.fromiter((i for found in candidates for i in found), dtype=np.int64, count=int(counts.sum()))
+        distance = haversine_km(lat[query], lon[query], self.lat[poi], self.lon[poi])
+        keep = distance <= radius_km[query]
+        return query[keep], poi[keep], distance[keep]
+
+def storm_threats(store, ensembles, index):
+    """Lieux situés dans le rayon d'une tempête, maintenant ou le long de la trajectoire prévue
+    
+    Le rayon d'un point prévu est le rayon d'action de la tempête augmenté de celui du cône
+    d'incertitude ; seuls les points d'intensité au moins tempête tropicale sont retenus.
+    Une ligne par (tempête, lieu) : la première échéance d'exposition et sa distance.
+    """
+    lat, lon, radius, lead, intensity, storm = [], [], [], [], [], []
+    for i, name in enumerate(store.names):
+        ensemble = ensembles[name]
+        track = store.track(i)
+        observed = max(int(np.searchsorted(track['datetime'], ensemble['start_time'], side='right')) - 1, 0)
+        n_points = len(ensemble['center_lat'])
+        lat.append(ensemble['center_lat'])
+        lon.append(ensemble['center_lon'])
+        radius.append(float(track['radius'][observed]) + ensemble['radius_km'])
+        lead.append(np.arange(n_points) * ensemble['step_hours'])
+        intensity.append(ensemble['intensity_quantiles'][1])
+        storm.append(np.full(n_points, i))
+    lat, lon, radius, lead, intensity, storm = (np.concatenate(values) for values in
+                                                (lat, lon, radius, lead, intensity, storm))
+    
+    active = intensity >= STORM_CATEGORY_BINS[0]
+    query, poi, distance = index.within(lat[active], lon[active], radius[active])
+    points = np.flatnonzero(active)[query]
+    threats = pd.DataFrame({
+        'storm': np.asarray(store.names, dtype=object)[storm[points]],
+        'location': index.names[poi],
+        'kind': index.kinds[poi],
+        'lead_hours': lead[points],
+        'distance_km': distance,
+        'intensity': intensity[points]
+    })
+    threats = threats.sort_values(['storm', 'lead_hours', 'distance_km'])
+    return threats.drop_duplicates(['storm', 'location']).reset_index(drop=True)
+
+# Correspondance des variables horaires Open-Meteo vers le schéma du dashboard
+OPEN_METEO_VARIABLES = {
+    'temperature_2m': 'temperature',
+    'relative_humidity_2m': 'humidity',
+    'pressure_msl': 'pressure',
+    'wind_speed_10m': 'wind_speed',
+    'wind_direction_10m': 'wind_direction',
+    'precipitation': 'precipitation',
+    'cloud_cover': 'cloud_cover',
+    'visibility': 'visibility',
+    'uv_index': 'uv_index',
+    'dew_point_2m': 'dew_point',
+    'apparent_temperature': 'feels_like',
+    'wind_gusts_10m': 'gust_speed'
+}
+
+DEFAULT_LOCATION = {'name': 'Saint-Denis (La Réunion)', 'latitude': -20.8823, 'longitude': 55.4504}
+
+class WeatherProvider:
+    """Adaptateur HTTP vers une API de prévision JSON au format Open-Meteo
+    
+    Une `requests.Session` mutualisée par hôte, revalidation conditionnelle
+    (ETag / If-Modified-Since), réessais avec backoff et récupération concurrente.
+    L'URL de base est configurable (variable METEO_API_URL) pour viser un serveur local.
+    """
+    
+    def __init__(self, base_url=None, timeout=10, retries=3, backoff_factor=0.5, pool_size=16):
+        self.base_url = base_url or os.environ.get('METEO_API_URL', 'https://api.open-meteo.com/v1/forecast')
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_size = pool_size
+        self.stats = {'requests': 0, 'not_modified': 0}
+        self._sessions = {}
+        self._validators = {}
+        self._lock = threading.Lock()
+    
+    def _session_for(self, url):
+        """Retourne la session mutualisée de l'hôte (connexions keep-alive réutilisées)"""
+        # Import différé : requests n'est chargé que si une source HTTP est utilisée
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
         
-        if not self.storm_tracks:
-            st.info("Aucune activité cyclonique significative détectée")
-            return
+        host = urlparse(url).netloc
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                retry = Retry(total=self.retries, backoff_factor=self.backoff_factor,
+                              status_forcelist=[429, 500, 502, 503, 504], allowed_methods=['GET'])
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+        return session
+    
+    def get_json(self, url, params):
+        """GET JSON avec revalidation conditionnelle : un 304 réutilise la réponse en cache"""
+        key = f"{url}?{urlencode(sorted(params.items()))}"
+        with self._lock:
+            cached = self._validators.get(key)
+            self.stats['requests'] += 1
         
-        # Sélection de la tempête
-        storm_names = [storm['name'] for storm in self.storm_tracks]
-        selected_storm = st.selectbox("Sélectionner une tempête:", storm_names)
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
         
-        storm_data = next(storm for storm in self.storm_tracks if storm['name'] == selected_storm)
+        response = self._session_for(url).get(url, params=params, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and cached:
+            with self._lock:
+                self.stats['not_modified'] += 1
+            return cached['payload']
+        response.raise_for_status()
         
-        # Cartographie avancée
-        col1, col2 = st.columns([3, 1])
+        payload = response.json()
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            with self._lock:
+                self._validators[key] = {'etag': etag, 'last_modified': last_modified, 'payload': payload}
+        return payload
+    
+    def fetch_location(self, latitude, longitude, past_days=14, forecast_days=7):
+        """Récupère les données horaires d'un point au format de `generate_enhanced_sample_data`
         
-        with col1:
-            fig = go.Figure()
-            
-            lats = [point['lat'] for point in storm_data['track']]
-            lons = [point['lon'] for point in storm_data['track']]
-            intensities = [point['intensity'] for point in storm_data['track']]
-            pressures = [point['pressure'] for point in storm_data['track']]
-            
-            # Trajectoire avec intensité
-            fig.add_trace(go.Scattermapbox(
-                lat=lats,
-                lon=lons,
-                mode='lines+markers',
-                marker=dict(
-                    size=10,
-                    color=intensities,
-                    colorscale='Viridis',
-                    colorbar=dict(title="Intensité (km/h)"),
-                    showscale=True
-                ),
-                line=dict(width=4, color='red'),
-                text=[f"Vitesse: {intensity:.1f} km/h<br>Pression: {pressure:.1f} hPa" 
-                      for intensity, pressure in zip(intensities, pressures)],
-                hoverinfo='text'
-            ))
-            
-            fig.update_layout(
-                mapbox=dict(
-                    style="stamen-terrain",
-                    center=dict(lat=np.mean(lats), lon=np.mean(lons)),
-                    zoom=3,
-                    bearing=0,
-                    pitch=0
-                ),
-                height=500,
-                margin=dict(l=0, r=0, t=0, b=0),
-                title=f"Trajectoire de {selected_storm}"
-            )
+        Les heures sont demandées en UTC (naïves dans le DataFrame) : sans ambiguïté quel que
+        soit le fuseau du point ou du serveur.
+        """
+        params = {
+            'latitude': latitude,
+            'longitude': longitude,
+            'hourly': ','.join(OPEN_METEO_VARIABLES),
+            'past_days': past_days,
+            'forecast_days': forecast_days,
+            'wind_speed_unit': 'kmh',
+            'timezone': 'UTC'
+        }
+        return self.to_frame(self.get_json(self.base_url, params))
+    
+    def fetch_many(self, locations, max_workers=8, **kwargs):
+        """Récupère plusieurs points en parallèle ; retourne {nom: DataFrame}"""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                location['name']: executor.submit(self.fetch_location, location['latitude'],
+                                                  location['longitude'], **kwargs)
+                for location in locations
+            }
+            return {name: future.result() for name, future in futures.items()}
+    
+    @staticmethod
+    def to_frame(payload):
+        """Convertit la section `hourly` d'une réponse JSON en DataFrame du dashboard"""
+        hourly = payload['hourly']
+        n = len(hourly['time'])
+        data = {'datetime': pd.to_datetime(hourly['time'])}
+        for source, column in OPEN_METEO_VARIABLES.items():
+            values = hourly.get(source)
+            data[column] = np.asarray(values if values is not None else [np.nan] * n, dtype=np.float64)
+        data['visibility'] = data['visibility'] / 1000  # m -> km
+        return pd.DataFrame(data).dropna(subset=['temperature']).reset_index(drop=True)
+
+class WeatherArchive:
+    """Archive des séries horaires partitionnée par station et par jour (Arrow IPC)
+    
+    Arborescence : <root>/station=<id>/date=<AAAA-MM-JJ>/part-<horodatage>.arrow.
+    Les ajouts créent de nouveaux fichiers sans réécrire les partitions existantes ;
+    les lectures par plage de dates mappent en mémoire uniquement les jours demandés.
+    """
+    
+    def __init__(self, root):
+        if pa is None:
+            raise ImportError("pyarrow est requis pour l'archive des séries météo")
+        self.root = root
+        self._lock = threading.Lock()
+    
+    def _station_dir(self, station):
+        return os.path.join(self.root, f"station={station}")
+    
+    def stations(self):
+        """Liste des stations présentes dans l'archive"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name.split('=', 1)[1] for name in os.listdir(self.root) if name.startswith('station='))
+    
+    def days(self, station):
+        """Liste triée des jours archivés pour une station"""
+        station_dir = self._station_dir(station)
+        if not os.path.isdir(station_dir):
+            return []
+        return sorted(pd.Timestamp(name.split('=', 1)[1]).date()
+                      for name in os.listdir(station_dir) if name.startswith('date='))
+    
+    def _read_day(self, station, day):
+        """Lit (par mapping mémoire) toutes les parties d'une partition journalière"""
+        day_dir = os.path.join(self._station_dir(station), f"date={day.isoformat()}")
+        tables = []
+        for name in sorted(os.listdir(day_dir)):
+            if name.endswith('.arrow'):
+                tables.append(pa_ipc.open_file(pa.memory_map(os.path.join(day_dir, name), 'r')).read_all())
+        return tables
+    
+    def latest_timestamp(self, station):
+        """Dernier horodatage archivé pour une station (None si vide)"""
+        days = self.days(station)
+        if not days:
+            return None
+        tables = self._read_day(station, days[-1])
+        if not tables:
+            return None
+        return pd.Timestamp(max(pc.max(table['datetime']).as_py() for table in tables))
+    
+    def append(self, station, frame):
+        """Ajoute uniquement les lignes plus récentes que le dernier horodatage archivé"""
+        with self._lock:
+            latest = self.latest_timestamp(station)
+            if latest is not None:
+                frame = frame[frame['datetime'] > latest]
+            if frame.empty:
+                return 0
             
-            st.plotly_chart(fig, use_container_width=True)
+            written_at = time.time_ns()
+            for day, rows in frame.groupby(frame['datetime'].dt.date, sort=True):
+                day_dir = os.path.join(self._station_dir(station), f"date={day.isoformat()}")
+                os.makedirs(day_dir, exist_ok=True)
+                table = pa.Table.from_pandas(rows, preserve_index=False)
+                path = os.path.join(day_dir, f"part-{written_at}.arrow")
+                with pa.OSFile(path, 'wb') as sink, pa_ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            return len(frame)
+    
+    def read_range(self, station, start, end):
+        """Lit la plage [start, end] d'une station en ne chargeant que les partitions concernées"""
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        tables = []
+        for day in self.days(station):
+            if start.date() <= day <= end.date():
+                tables.extend(self._read_day(station, day))
+        if not tables:
+            return pd.DataFrame()
         
-        with col2:
-            # Statistiques avancées de la tempête
-            current_state = storm_data['track'][-1]
-            
-            st.markdown("#### 📊 Statistiques")
-            st.metric("Intensité Actuelle", f"{current_state['intensity']:.1f} km/h")
-            st.metric("Catégorie", current_state['category'])
-            st.metric("Pression", f"{current_state['pressure']:.1f} hPa")
-            st.metric("Rayon d'Action", f"{current_state['radius']:.0f} km")
-            st.metric("Niveau de Menace", storm_data['current_threat'])
-            
-            # Évolution de l'intensité
-            intensity_history = [point['intensity'] for point in storm_data['track']]
-            fig_intensity = go.Figure(go.Scatter(
-                y=intensity_history,
-                mode='lines+markers',
-                line=dict(color='red', width=3),
-                marker=dict(size=6)
-            ))
-            fig_intensity.update_layout(
-                height=200,
-                title="Évolution Intensité",
-                margin=dict(l=0, r=0, t=30, b=0)
-            )
-            st.plotly_chart(fig_intensity, use_container_width=True)
+        # Les parties écrites avec un schéma antérieur sont complétées par des valeurs nulles
+        table = pa.concat_tables(tables, promote_options='default')
+        timestamps = table['datetime']
+        mask = pc.and_(pc.greater_equal(timestamps, pa.scalar(start.to_pydatetime(), timestamps.type)),
+                       pc.less_equal(timestamps, pa.scalar(end.to_pydatetime(), timestamps.type)))
+        return table.filter(mask).to_pandas().sort_values('datetime').reset_index(drop=True)
+
+# Formats d'export : extension, type MIME et compressions proposées (None = aucune)
+EXPORT_FORMATS = {
+    'CSV': {'extension': 'csv', 'mime': 'text/csv', 'compressions': [None, 'gzip', 'zstd']},
+    'Parquet': {'extension': 'parquet', 'mime': 'application/vnd.apache.parquet',
+                'compressions': [None, 'snappy', 'zstd', 'gzip']},
+    'Arrow IPC': {'extension': 'arrow', 'mime': 'application/vnd.apache.arrow.file',
+                  'compressions': [None, 'lz4', 'zstd']}
+}
+EXPORT_COMPRESSED_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+def export_file_name(stem, export_format, compression=None):
+    """Nom du fichier exporté (le CSV compressé prend le suffixe du codec)"""
+    name = f"{stem}.{EXPORT_FORMATS[export_format]['extension']}"
+    if export_format == 'CSV' and compression:
+        name += EXPORT_COMPRESSED_SUFFIXES[compression]
+    return name
+
+def _open_export_writer(path, export_format, compression, schema):
+    """Ouvre l'écrivain pyarrow d'un format ; retourne (écrivain, flux à fermer ensuite)"""
+    if export_format == 'Parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(path, schema, compression=compression or 'none'), None
     
-    def create_weather_impact_analysis(self):
-        """Analyse d'impact météorologique"""
-        st.markdown("### 📈 Analyse d'Impact Sectoriel")
+    if export_format == 'CSV':
+        import pyarrow.csv as pa_csv
+        if compression == 'gzip':
+            # zlib niveau 6 : environ trois fois plus rapide que le gzip par défaut de pyarrow
+            stream = gzip.open(path, 'wb', compresslevel=6)
+        elif compression:
+            stream = pa.CompressedOutputStream(pa.OSFile(path, 'wb'), compression)
+        else:
+            stream = pa.OSFile(path, 'wb')
+        return pa_csv.CSVWriter(stream, schema), stream
+    
+    stream = pa.OSFile(path, 'wb')
+    options = pa_ipc.IpcWriteOptions(compression=compression)
+    return pa_ipc.new_file(stream, schema, options=options), stream
+
+def sweep_stale_exports(ttl=EXPORT_FILE_TTL, directory=None, now=None):
+    """Supprime les exports temporaires plus vieux que ttl (sessions fermées ou abandonnées)"""
+    directory = directory or tempfile.gettempdir()
+    now = time.time() if now is None else now
+    removed = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.startswith(EXPORT_FILE_PREFIX):
+                continue
+            try:
+                if entry.is_file() and now - entry.stat().st_mtime > ttl:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                pass  # fichier supprimé entre-temps par une autre session
+    return removed
+
+def new_export_path(name):
+    """Fichier temporaire vide pour un export (balayé par sweep_stale_exports)"""
+    fd, path = tempfile.mkstemp(prefix=EXPORT_FILE_PREFIX, suffix=f"-{name}")
+    os.close(fd)
+    return path
+
+def read_export(path):
+    """Contenu d'un export, lu seulement au clic sur le bouton de téléchargement"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+def write_export(chunks, path, export_format, compression=None):
+    """Écrit les morceaux (DataFrames) dans `path` au fil de l'eau ; retourne le nombre de lignes
+    
+    Un seul morceau est en mémoire à la fois. Sans pyarrow, seul le CSV est disponible.
+    """
+    rows = 0
+    if pa is None:
+        opener = gzip.open if compression == 'gzip' else open
+        with opener(path, 'wt', encoding='utf-8', newline='') as f:
+            for chunk in chunks:
+                chunk.to_csv(f, header=(rows == 0), index=False)
+                rows += len(chunk)
+        return rows
+    
+    writer = stream = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer, stream = _open_export_writer(path, export_format, compression, table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+        if stream is not None:
+            stream.close()
+    return rows
+
+def write_export_parts(chunks, make_path, export_format, compression=None, part_bytes=EXPORT_PART_BYTES):
+    """Écrit l'export en fichiers autonomes d'environ `part_bytes` ; retourne [(chemin, lignes)]
+    
+    Une nouvelle partie commence dès que la précédente dépasse `part_bytes` après un
+    morceau : chaque partie se lit seule (en-tête CSV, pied Parquet/Arrow complets).
+    """
+    chunks = iter(chunks)
+    pending = next(chunks, None)
+    parts = []
+    while pending is not None or not parts:
+        path = make_path()
         
-        # Impacts par secteur
-        sectors = {
+        def part_chunks():
+            nonlocal pending
+            while pending is not None:
+                yield pending
+                pending = next(chunks, None)
+                if os.path.getsize(path) >= part_bytes:
+                    return
+        
+        parts.append((path, write_export(part_chunks(), path, export_format, compression)))
+    return parts
+
+def compute_data_version(weather_data, storm_tracks=None):
+    """Empreinte du contenu des données (clé de version pour les caches de figures)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pd.util.hash_pandas_object(weather_data, index=False).to_numpy().tobytes())
+    if storm_tracks is not None:
+        for column in (storm_tracks.lat, storm_tracks.lon, storm_tracks.intensity, storm_tracks.radius):
+            digest.update(column.tobytes())
+    return digest.hexdigest()
+
+class FigureCache:
+    """Cache LRU des figures Plotly, indexé par (figure, version des données, paramètres d'affichage)
+    
+    Les figures mises en cache sont partagées entre sessions et ne doivent pas être modifiées.
+    """
+    
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_or_build(self, name, version, build, **params):
+        """Retourne la figure en cache ou la construit avec `build()`"""
+        key = (name, version, tuple(sorted(params.items())))
+        with self._lock:
+            figure = self._entries.get(key)
+            if figure is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return figure
+        
+        figure = build()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = figure
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return figure
+    
+    def stats(self):
+        """Retourne les compteurs hits/misses et le taux de succès"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'hit_rate': self.hits / total if total else 0.0
+            }
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class SectionTimer:
+    """Histogrammes des durées d'exécution par section du dashboard
+    
+    Bornes fixes (style Prometheus) : l'enregistrement est en O(1) et sans allocation ;
+    les derniers événements sont conservés pour l'export JSONL.
+    """
+    
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    
+    def __init__(self, max_events=5000):
+        self._sections = {}
+        self._events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def section(self, name):
+        """Chronomètre le bloc `with` sous le nom de section donné"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+    
+    def observe(self, name, seconds):
+        """Enregistre une durée (secondes) pour une section"""
+        bucket = bisect.bisect_left(self.BUCKETS, seconds)
+        with self._lock:
+            stats = self._sections.get(name)
+            if stats is None:
+                stats = self._sections[name] = {'counts': [0] * (len(self.BUCKETS) + 1),
+                                                'count': 0, 'sum': 0.0, 'max': 0.0}
+            stats['counts'][bucket] += 1
+            stats['count'] += 1
+            stats['sum'] += seconds
+            stats['max'] = max(stats['max'], seconds)
+            self._events.append((time.time(), name, seconds))
+    
+    def _quantile(self, counts, total, q):
+        """Estime un quantile par interpolation linéaire dans les intervalles de l'histogramme"""
+        rank = q * total
+        cumulative = 0
+        for i, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                lower = self.BUCKETS[i - 1] if i > 0 else 0.0
+                upper = self.BUCKETS[i] if i < len(self.BUCKETS) else self.BUCKETS[-1]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.BUCKETS[-1]
+    
+    def summary(self):
+        """Résumé par section : nombre, moyenne, p50, p95, max (en millisecondes)"""
+        with self._lock:
+            sections = {name: dict(stats, counts=list(stats['counts'])) for name, stats in self._sections.items()}
+        return [
+            {
+                'section': name,
+                'count': stats['count'],
+                'mean_ms': 1000 * stats['sum'] / stats['count'],
+                'p50_ms': 1000 * min(self._quantile(stats['counts'], stats['count'], 0.5), stats['max']),
+                'p95_ms': 1000 * min(self._quantile(stats['counts'], stats['count'], 0.95), stats['max']),
+                'max_ms': 1000 * stats['max']
+            }
+            for name, stats in sorted(sections.items(), key=lambda item: -item[1]['sum'])
+        ]
+    
+    def to_jsonl(self):
+        """Exporte les derniers événements au format JSON Lines"""
+        with self._lock:
+            events = list(self._events)
+        return "".join(
+            json.dumps({'timestamp': datetime.fromtimestamp(ts).isoformat(), 'section': name,
+                        'seconds': round(seconds, 6)}, ensure_ascii=False) + "\n"
+            for ts, name, seconds in events
+        )
+    
+    def to_prometheus(self, metric='dashboard_section_duration_seconds'):
+        """Exporte les histogrammes au format texte Prometheus"""
+        lines = [f"# HELP {metric} Durée d'exécution des sections du dashboard.",
+                 f"# TYPE {metric} histogram"]
+        with self._lock:
+            sections = {name: dict(stats, counts=list(stats['counts'])) for name, stats in self._sections.items()}
+        for name, stats in sorted(sections.items()):
+            label = name.replace('\\', '\\\\').replace('"', '\\"')
+            cumulative = 0
+            for bound, count in zip(self.BUCKETS, stats['counts']):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{section="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{section="{label}",le="+Inf"}} {stats["count"]}')
+            lines.append(f'{metric}_sum{{section="{label}"}} {stats["sum"]:.6f}')
+            lines.append(f'{metric}_count{{section="{label}"}} {stats["count"]}')
+        return "\n".join(lines) + "\n"
+    
+    def reset(self):
+        with self._lock:
+            self._sections.clear()
+            self._events.clear()
+
+def timed_section(name=None):
+    """Décorateur : chronomètre chaque appel de la fonction dans le SectionTimer du processus"""
+    def decorator(func):
+        section_name = name or func.__name__
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_section_timer().section(section_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class StationNetwork:
+    """Réseau de stations : un tableau float32 (stations × temps) par variable
+    
+    La mémoire croît linéairement avec stations × instants (4 octets par valeur) ;
+    les indicateurs de tout le réseau sont calculés en une passe vectorisée.
+    """
+    
+    def __init__(self, station_ids, latitudes, longitudes, times, arrays):
+        self.station_ids = list(station_ids)
+        self.latitudes = np.asarray(latitudes, dtype=np.float32)
+        self.longitudes = np.asarray(longitudes, dtype=np.float32)
+        self.times = np.asarray(times, dtype='datetime64[ns]')
+        self.arrays = {name: np.ascontiguousarray(values, dtype=np.float32) for name, values in arrays.items()}
+        self._index = {station_id: i for i, station_id in enumerate(self.station_ids)}
+    
+    @classmethod
+    def generate(cls, n_stations, start, end, freq='h', seed=None):
+        """Génère un réseau synthétique en une passe (voir SyntheticWeatherGenerator)"""
+        generator = SyntheticWeatherGenerator(seed=seed, n_stations=n_stations, dtype=np.float32)
+        times = pd.date_range(start=start, end=end, freq=freq)
+        hours = (times - times[0]) / pd.Timedelta(hours=1)
+        arrays = generator.generate_block(hours)
+        # Stations réparties autour du point par défaut (±5°)
+        latitudes = DEFAULT_LOCATION['latitude'] + generator.rng.uniform(-5, 5, n_stations)
+        longitudes = DEFAULT_LOCATION['longitude'] + generator.rng.uniform(-5, 5, n_stations)
+        return cls(station_ids(n_stations), latitudes, longitudes, times.values, arrays)
+    
+    def __len__(self):
+        return len(self.station_ids)
+    
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for values in self.arrays.values()) + self.times.nbytes
+    
+    def station_frame(self, station):
+        """DataFrame d'une station au schéma de `generate_enhanced_sample_data`"""
+        i = self._index[station] if isinstance(station, str) else int(station)
+        data = {'datetime': self.times}
+        data.update({name: values[i] for name, values in self.arrays.items()})
+        return pd.DataFrame(data)
+    
+    def summary(self, offset=0):
+        """Conditions courantes et tendances de toutes les stations, en une passe vectorisée"""
+        last = len(self.times) - 1 - offset
+        temperature = self.arrays['temperature'][:, last]
+        humidity = self.arrays['humidity'][:, last]
+        return pd.DataFrame({
+            'station': self.station_ids,
+            'temperature': temperature,
+            'delta_temperature': temperature - self.arrays['temperature'][:, last - 1],
+            'wind_speed': self.arrays['wind_speed'][:, last],
+            'delta_wind_speed': self.arrays['wind_speed'][:, last] - self.arrays['wind_speed'][:, last - 1],
+            'pressure': self.arrays['pressure'][:, last],
+            'delta_pressure': self.arrays['pressure'][:, last] - self.arrays['pressure'][:, last - 1],
+            'heat_index': calculate_heat_index(temperature, humidity)
+        })
+    
+    def alerts(self, engine, after=None):
+        """Alertes de vigilance de toutes les stations, en une passe du moteur de règles"""
+        values = {variable: self._block(variable, slice(None)) for variable in engine.variables}
+        return engine.alerts(self.times, values, self.station_ids, after=after)
+
+    def _block(self, name, columns):
+        """Bloc (stations × instants) d'une variable observée ou dérivée"""
+        if name in self.arrays:
+            return self.arrays[name][:, columns]
+        function, inputs = DERIVED_VARIABLES[name]
+        return function(*(self._block(variable, columns) for variable in inputs))
+    
+    def iter_chunks(self, start, end, variables, chunk_rows=EXPORT_CHUNK_ROWS):
+        """DataFrames longs (station, datetime, variables) de la plage [start, end], par morceaux
+        
+        Chaque morceau couvre `chunk_rows // stations` instants, la mémoire reste donc
+        bornée quelle que soit la période ; les variables dérivées sont calculées par morceau.
+        """
+        lo = np.searchsorted(self.times, np.datetime64(pd.Timestamp(start), 'ns'), side='left')
+        hi = np.searchsorted(self.times, np.datetime64(pd.Timestamp(end), 'ns'), side='right')
+        n_stations = len(self.station_ids)
+        step = max(1, chunk_rows // n_stations)
+        for offset in range(lo, hi, step):
+            columns = slice(offset, min(offset + step, hi))
+            n_times = columns.stop - columns.start
+            chunk = {
+                'station': pd.Categorical.from_codes(np.repeat(np.arange(n_stations), n_times),
+                                                     categories=self.station_ids),
+                'datetime': np.tile(self.times[columns], n_stations)
+            }
+            chunk.update({name: self._block(name, columns).ravel() for name in variables})
+            yield pd.DataFrame(chunk)
+
+def station_ids(n_stations):
+    """Identifiants des stations du réseau simulé"""
+    return [f"ST-{i:04d}" for i in range(n_stations)]
+
+class ObservationRingBuffer:
+    """Tampon circulaire préalloué des observations (un tableau NumPy par variable)
+    
+    Chaque valeur est écrite deux fois (positions i et i + capacité) : la fenêtre
+    chronologique est toujours une tranche contiguë, exposée sans copie. Les vues
+    restent valides jusqu'à l'ajout suivant. Min/max/moyenne sont tenus à jour à
+    chaque ajout en O(1) par variable ; un min/max évincé est recalculé à la demande.
+    """
+    
+    def __init__(self, capacity, variables, dtype=np.float64):
+        self.capacity = int(capacity)
+        self.variables = list(variables)
+        self._index = {name: i for i, name in enumerate(self.variables)}
+        self._times = np.empty(2 * self.capacity, dtype='datetime64[ns]')
+        self._values = np.empty((len(self.variables), 2 * self.capacity), dtype=dtype)
+        self.head = 0  # prochaine position d'écriture
+        self.size = 0
+        self.version = 0  # incrémentée à chaque ajout
+        self._reset_stats()
+    
+    @classmethod
+    def from_frame(cls, frame, capacity=None, time_column='datetime'):
+        """Construit un tampon à partir d'un DataFrame (colonnes numériques)"""
+        variables = [column for column in frame.columns
+                     if column != time_column and pd.api.types.is_numeric_dtype(frame[column])]
+        buffer = cls(max(capacity or 0, len(frame), 2), variables)
+        buffer.extend(frame[time_column].to_numpy(), frame[variables].to_numpy(dtype=np.float64).T)
+        return buffer
+    
+    def _reset_stats(self):
+        n = len(self.variables)
+        self._sum = np.zeros(n)
+        self._count = np.zeros(n, dtype=np.int64)
+        self._min = np.full(n, np.inf)
+        self._max = np.full(n, -np.inf)
+        self._stale = np.zeros(n, dtype=bool)
+    
+    def append(self, timestamp, values):
+        """Ajoute une observation en O(1) ; `values` est un dict ou une séquence ordonnée"""
+        if isinstance(values, dict):
+            values = [values.get(name, np.nan) for name in self.variables]
+        values = np.asarray(values, dtype=self._values.dtype)
+        head, capacity = self.head, self.capacity
+        
+        if self.size == capacity:
+            evicted = self._values[:, head]
+            valid = ~np.isnan(evicted)
+            self._sum[valid] -= evicted[valid]
+            self._count[valid] -= 1
+            self._stale |= valid & ((evicted <= self._min) | (evicted >= self._max))
+        else:
+            self.size += 1
+        
+        self._times[head] = self._times[head + capacity] = np.datetime64(timestamp, 'ns')
+        self._values[:, head] = self._values[:, head + capacity] = values
+        valid = ~np.isnan(values)
+        self._sum[valid] += values[valid]
+        self._count[valid] += 1
+        self._min = np.fmin(self._min, values)
+        self._max = np.fmax(self._max, values)
+        self.head = (head + 1) % capacity
+        self.version += 1
+    
+    def extend(self, timestamps, values):
+        """Ajout vectorisé d'un bloc (variables × n) ; statistiques recalculées sur la fenêtre"""
+        timestamps = np.asarray(timestamps, dtype='datetime64[ns]')[-self.capacity:]
+        values = np.asarray(values, dtype=self._values.dtype)[:, -self.capacity:]
+        n = len(timestamps)
+        positions = (self.head + np.arange(n)) % self.capacity
+        for offset in (0, self.capacity):
+            self._times[positions + offset] = timestamps
+            self._values[:, positions + offset] = values
+        self.head = (self.head + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+        self.version += 1
+        self._recompute_stats()
+    
+    def _recompute_stats(self, rows=None):
+        window = self.values()
+        rows = np.arange(len(self.variables)) if rows is None else rows
+        if window.shape[1] == 0:
+            return
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            self._sum[rows] = np.nansum(window[rows], axis=1)
+            self._count[rows] = np.count_nonzero(~np.isnan(window[rows]), axis=1)
+            self._min[rows] = np.nanmin(window[rows], axis=1)
+            self._max[rows] = np.nanmax(window[rows], axis=1)
+        self._stale[rows] = False
+    
+    def _window(self):
+        start = self.head if self.size == self.capacity else 0
+        return slice(start, start + self.size)
+    
+    def times(self):
+        """Horodatages dans l'ordre chronologique (vue sans copie)"""
+        return self._times[self._window()]
+    
+    def values(self, variable=None):
+        """Valeurs dans l'ordre chronologique (vue sans copie), d'une variable ou de toutes"""
+        window = self._values[:, self._window()]
+        return window if variable is None else window[self._index[variable]]
+    
+    def to_frame(self, time_column='datetime'):
+        """DataFrame adossé au tampon (les colonnes numériques ne sont pas copiées)"""
+        frame = pd.DataFrame(self.values().T, columns=self.variables, copy=False)
+        frame.insert(0, time_column, self.times())
+        return frame
+    
+    def latest(self, offset=0):
+        """Observation la plus récente (offset=1 pour la précédente) sous forme de dict"""
+        position = (self.head - 1 - offset) % self.capacity
+        observation = dict(zip(self.variables, self._values[:, position].tolist()))
+        observation['datetime'] = pd.Timestamp(self._times[position])
+        return observation
+    
+    def delta(self, variable):
+        """Écart entre les deux dernières observations d'une variable"""
+        row = self._index[variable]
+        last = (self.head - 1) % self.capacity
+        return float(self._values[row, last] - self._values[row, last - 1])
+    
+    def stats(self, variable):
+        """Min/max/moyenne courants de la fenêtre pour une variable"""
+        row = self._index[variable]
+        if self._stale[row]:
+            self._recompute_stats(np.array([row]))
+        count = self._count[row]
+        return {
+            'min': float(self._min[row]),
+            'max': float(self._max[row]),
+            'mean': float(self._sum[row] / count) if count else float('nan')
+        }
+
+class DerivedVariables:
+    """Variables dérivées (DERIVED_VARIABLES) calculées à la demande sur un tampon d'observations
+    
+    Une colonne est calculée vectoriellement au premier accès puis conservée tant que
+    la version du tampon ne change pas. Une variable déjà présente dans la source
+    (ex. point de rosée mesuré par Open-Meteo) est retournée telle quelle.
+    """
+    
+    def __init__(self, observations):
+        self.observations = observations
+        self._cache = {}
+    
+    def __contains__(self, name):
+        return name in self.observations.variables or name in DERIVED_VARIABLES
+    
+    def values(self, name):
+        """Série chronologique complète d'une variable observée ou dérivée"""
+        if name in self.observations.variables:
+            return self.observations.values(name)
+        version = self.observations.version
+        cached = self._cache.get(name)
+        if cached is None or cached[0] != version:
+            function, inputs = DERIVED_VARIABLES[name]
+            cached = (version, function(*(self.values(variable) for variable in inputs)))
+            self._cache[name] = cached
+        return cached[1]
+    
+    def latest(self, names=(), offset=0):
+        """Dernière observation, complétée des variables dérivées demandées (calcul scalaire)"""
+        observation = self.observations.latest(offset)
+        for name in names:
+            if name not in observation:
+                function, inputs = DERIVED_VARIABLES[name]
+                observation[name] = function(*(observation[variable] for variable in inputs))
+        return observation
+    
+    def frame(self, columns, time_column='datetime'):
+        """DataFrame limité aux colonnes demandées (les colonnes observées ne sont pas copiées)"""
+        data = {time_column: self.observations.times()}
+        data.update({name: self.values(name) for name in columns})
+        return pd.DataFrame(data, copy=False)
+    
+    def iter_chunks(self, start, end, variables, chunk_rows=EXPORT_CHUNK_ROWS):
+        """DataFrames (datetime, variables) de la plage [start, end], par morceaux de `chunk_rows` lignes"""
+        times = self.observations.times()
+        lo = np.searchsorted(times, np.datetime64(pd.Timestamp(start), 'ns'), side='left')
+        hi = np.searchsorted(times, np.datetime64(pd.Timestamp(end), 'ns'), side='right')
+        columns = {name: self.values(name) for name in variables}
+        for offset in range(lo, hi, chunk_rows):
+            rows = slice(offset, min(offset + chunk_rows, hi))
+            chunk = {'datetime': times[rows]}
+            chunk.update({name: values[rows] for name, values in columns.items()})
+            yield pd.DataFrame(chunk)
+
+class RollupLevel:
+    """Agrégats d'une résolution : nombre/somme/min/max par période et par variable
+    
+    Les tableaux sont préalloués et agrandis par doublement ; un ajout chronologique
+    ne touche que la dernière période et la fin des tableaux.
+    """
+    
+    def __init__(self, unit, n_variables, capacity=64):
+        self.unit = unit
+        self.size = 0
+        self.keys = np.empty(capacity, dtype=f'datetime64[{unit}]')
+        self.count = np.zeros((n_variables, capacity), dtype=np.int64)
+        self.total = np.zeros((n_variables, capacity))
+        self.minimum = np.full((n_variables, capacity), np.inf)
+        self.maximum = np.full((n_variables, capacity), -np.inf)
+    
+    def _reserve(self, size):
+        capacity = len(self.keys)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity)
+        self.keys = np.resize(self.keys, capacity)
+        for name, fill in (('count', 0), ('total', 0.0), ('minimum', np.inf), ('maximum', -np.inf)):
+            old = getattr(self, name)
+            new = np.full((old.shape[0], capacity), fill, dtype=old.dtype)
+            new[:, :self.size] = old[:, :self.size]
+            setattr(self, name, new)
+    
+    def view(self):
+        """(clés, nombre, somme, min, max) des périodes existantes, sans copie"""
+        n = self.size
+        return (self.keys[:n], self.count[:, :n], self.total[:, :n],
+                self.minimum[:, :n], self.maximum[:, :n])
+    
+    def merge(self, keys, count, total, minimum, maximum):
+        """Fusionne des agrégats partiels déjà réduits (clés triées et uniques)"""
+        if len(keys) == 0:
+            return
+        n = self.size
+        if n and keys[0] < self.keys[n - 1]:
+            # Données hors ordre : re-réduction complète (rare)
+            merged = reduce_rollup(*(np.concatenate([old, new], axis=-1) for old, new in
+                                     zip(self.view(), (keys, count, total, minimum, maximum))))
+            self.size = 0
+            self.merge(*merged)
+            return
+        
+        if n and keys[0] == self.keys[n - 1]:
+            last = n - 1
+            self.count[:, last] += count[:, 0]
+            self.total[:, last] += total[:, 0]
+            np.minimum(self.minimum[:, last], minimum[:, 0], out=self.minimum[:, last])
+            np.maximum(self.maximum[:, last], maximum[:, 0], out=self.maximum[:, last])
+            keys, count, total, minimum, maximum = (array[..., 1:] for array in
+                                                    (keys, count, total, minimum, maximum))
+        
+        added = len(keys)
+        self._reserve(n + added)
+        self.keys[n:n + added] = keys
+        self.count[:, n:n + added] = count
+        self.total[:, n:n + added] = total
+        self.minimum[:, n:n + added] = minimum
+        self.maximum[:, n:n + added] = maximum
+        self.size = n + added
+
+def reduce_rollup(keys, count, total, minimum, maximum):
+    """Réduit des agrégats (variables × n) par clé ; retourne des clés triées et uniques"""
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    unique_keys, starts = np.unique(keys, return_index=True)
+    if len(unique_keys) == len(keys):
+        return keys, count[:, order], total[:, order], minimum[:, order], maximum[:, order]
+    return (unique_keys,
+            np.add.reduceat(count[:, order], starts, axis=1),
+            np.add.reduceat(total[:, order], starts, axis=1),
+            np.minimum.reduceat(minimum[:, order], starts, axis=1),
+            np.maximum.reduceat(maximum[:, order], starts, axis=1))
+
+class ClimateRollups:
+    """Agrégats multi-résolutions (heure → jour → mois → année) tenus à jour incrémentalement
+    
+    Les nouvelles lignes sont réduites à l'heure, puis chaque résolution est dérivée
+    de la précédente et fusionnée avec ses périodes existantes : les lignes brutes ne
+    sont jamais relues et une lecture coûte O(périodes).
+    """
+    
+    RESOLUTIONS = {'hour': 'h', 'day': 'D', 'month': 'M', 'year': 'Y'}
+    LABELS = {'hour': 'Heure', 'day': 'Jour', 'month': 'Mois', 'year': 'Année'}
+    
+    def __init__(self, variables):
+        self.variables = list(variables)
+        self._index = {name: i for i, name in enumerate(self.variables)}
+        self.levels = {name: RollupLevel(unit, len(self.variables)) for name, unit in self.RESOLUTIONS.items()}
+    
+    @classmethod
+    def from_frame(cls, frame, variables=None, time_column='datetime'):
+        """Construit les agrégats d'un DataFrame (colonnes numériques par défaut)"""
+        if variables is None:
+            variables = [column for column in frame.columns
+                         if column != time_column and pd.api.types.is_numeric_dtype(frame[column])]
+        rollups = cls(variables)
+        rollups.update(frame[time_column].to_numpy(), frame[variables].to_numpy(dtype=np.float64).T)
+        return rollups
+    
+    def update(self, timestamps, values):
+        """Intègre un bloc de lignes (`values` : variables × n, NaN ignorés)"""
+        timestamps = np.asarray(timestamps, dtype='datetime64[ns]')
+        if len(timestamps) == 0:
+            return
+        values = np.asarray(values, dtype=np.float64).reshape(len(self.variables), len(timestamps))
+        valid = ~np.isnan(values)
+        partial = reduce_rollup(timestamps.astype('datetime64[h]'),
+                                valid.astype(np.int64),
+                                np.where(valid, values, 0.0),
+                                np.where(valid, values, np.inf),
+                                np.where(valid, values, -np.inf))
+        for level in self.levels.values():
+            keys = partial[0].astype(f'datetime64[{level.unit}]')
+            partial = reduce_rollup(keys, *partial[1:])
+            level.merge(*partial)
+    
+    def append(self, timestamp, values):
+        """Intègre une observation ; `values` est un dict ou une séquence ordonnée"""
+        if isinstance(values, dict):
+            values = [values.get(name, np.nan) for name in self.variables]
+        self.update([np.datetime64(timestamp, 'ns')], np.asarray(values, dtype=np.float64)[:, np.newaxis])
+    
+    def resolution_for(self, min_buckets=6):
+        """Résolution la plus grossière offrant au moins `min_buckets` périodes"""
+        for name in ('year', 'month', 'day'):
+            if self.levels[name].size >= min_buckets:
+                return name
+        return 'hour'
+    
+    def aggregate(self, resolution, spec):
+        """DataFrame des périodes d'une résolution, ex. {'temperature': 'mean', 'precipitation': 'sum'}"""
+        keys, count, total, minimum, maximum = self.levels[resolution].view()
+        data = {'datetime': keys.astype('datetime64[ns]')}
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for variable, how in spec.items():
+                row = self._index[variable]
+                empty = count[row] == 0
+                result = {
+                    'mean': total[row] / count[row],
+                    'sum': total[row],
+                    'min': minimum[row],
+                    'max': maximum[row],
+                    'count': count[row]
+                }[how]
+                data[variable] = result if how in ('sum', 'count') else np.where(empty, np.nan, result)
+        return pd.DataFrame(data)
+
+# Variables surveillées par le détecteur d'anomalies : libellé et unité
+ANOMALY_VARIABLES = {
+    'temperature': ("Température", "°C"),
+    'humidity': ("Humidité", "%"),
+    'pressure': ("Pression", " hPa"),
+    'wind_speed': ("Vent", " km/h")
+}
+PRESSURE_TENDENCY_HOURS = 3
+PRESSURE_TENDENCY_THRESHOLD = 3.0  # hPa sur 3 h (seuil OMM d'une variation rapide)
+
+class StreamingAnomalyDetector:
+    """Détecteur d'anomalies en ligne : z-score EWMA, résidu du cycle de 24 h et tendance de pression
+    
+    L'état tient dans des tableaux (séries × variables) : chaque échantillon est traité en
+    O(1) par série et par variable, en une seule passe vectorisée sur toutes les stations.
+    Un événement horodaté est émis à l'entrée dans un état anormal, pas à chaque échantillon.
+    """
+    
+    def __init__(self, n_series=1, variables=None, series_names=None, alpha=0.05, seasonal_alpha=0.1,
+                 threshold=3.5, seasonal_threshold=3.0, warmup=48, max_events=200):
+        self.variables = list(variables or ANOMALY_VARIABLES)
+        self.series_names = list(series_names) if series_names is not None else station_ids(n_series)
+        self.alpha = alpha
+        self.seasonal_alpha = seasonal_alpha
+        self.threshold = threshold
+        self.seasonal_threshold = seasonal_threshold
+        self.warmup = warmup
+        shape = (n_series, len(self.variables))
+        self.shape = shape
+        
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.mean = np.zeros(shape)
+        self.var = np.zeros(shape)
+        self.season = np.full((24,) + shape, np.nan)  # profil moyen par heure du jour
+        self.residual_var = np.zeros(shape)
+        self.z = np.zeros(shape)
+        self.seasonal_z = np.zeros(shape)
+        self._active = {'ewma': np.zeros(shape, dtype=bool), 'seasonal': np.zeros(shape, dtype=bool)}
+        
+        # Pression brute mémorisée par heure du jour, pour la tendance sur 3 h (définition OMM) :
+        # l'EWMA des z-scores, trop lente, n'en restituerait qu'une faible part
+        self._pressure = self.variables.index('pressure') if 'pressure' in self.variables else None
+        self._pressure_levels = np.full((24, n_series), np.nan)
+        self._pressure_hours = np.full((24, n_series), -1, dtype=np.int64)
+        self.pressure_tendency = np.full(n_series, np.nan)
+        self._active['pressure_tendency'] = np.zeros(n_series, dtype=bool)
+        
+        self.events = deque(maxlen=max_events)
+        self.samples = 0
+    
+    @classmethod
+    def from_observations(cls, observations, until=None, history=timedelta(days=14), **options):
+        """Initialise le détecteur sur l'historique récent d'un tampon d'observations"""
+        variables = [name for name in ANOMALY_VARIABLES if name in observations.variables]
+        detector = cls(1, variables, series_names=options.pop('series_names', None), **options)
+        times = observations.times()
+        stop = len(times) if until is None else np.searchsorted(times, np.datetime64(pd.Timestamp(until), 'ns'), 'right')
+        start = np.searchsorted(times, times[stop - 1] - np.timedelta64(history), 'left') if stop else 0
+        values = np.stack([observations.values(name)[start:stop] for name in variables], axis=1)
+        for timestamp, row in zip(times[start:stop], values):
+            detector.update(timestamp, row)
+        return detector
+    
+    def update(self, timestamp, values):
+        """Intègre un échantillon (séries × variables, ou dict pour une série) ; retourne les nouveaux événements"""
+        if isinstance(values, dict):
+            values = [values.get(name, np.nan) for name in self.variables]
+        x = np.asarray(values, dtype=np.float64).reshape(self.shape)
+        valid = ~np.isnan(x)
+        hour = np.datetime64(timestamp, 'h').astype(np.int64)
+        slot = hour % 24
+        ready = self.count >= self.warmup
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # z-score par rapport à la moyenne/variance mobiles exponentielles (avant mise à jour)
+            diff = x - self.mean
+            std = np.sqrt(self.var)
+            self.z = np.where(ready & valid & (std > 0), diff / std, 0.0)
+            first = self.count == 0
+            increment = self.alpha * diff
+            self.var = np.where(valid & ~first, (1 - self.alpha) * (self.var + diff * increment), self.var)
+            self.mean = np.where(valid, np.where(first, x, self.mean + increment), self.mean)
+            self.count += valid
+            
+            # Résidu par rapport au profil de la même heure du jour
+            season = self.season[slot]
+            known = valid & ~np.isnan(season)
+            residual = x - season
+            residual_std = np.sqrt(self.residual_var)
+            self.seasonal_z = np.where(known & ready & (residual_std > 0), residual / residual_std, 0.0)
+            self.residual_var = np.where(known, (1 - self.alpha) * self.residual_var + self.alpha * residual ** 2,
+                                         self.residual_var)
+            self.season[slot] = np.where(valid, np.where(np.isnan(season), x, season + self.seasonal_alpha * residual),
+                                         season)
+        
+        events = []
+        events += self._transitions('ewma', self.z, self.threshold, timestamp, x)
+        events += self._transitions('seasonal', self.seasonal_z, self.seasonal_threshold, timestamp, x)
+        
+        if self._pressure is not None:
+            # Tendance sur 3 h : écart entre la pression mesurée et celle d'il y a 3 h
+            level = x[:, self._pressure]
+            past_slot = (slot - PRESSURE_TENDENCY_HOURS) % 24
+            past_known = self._pressure_hours[past_slot] == hour - PRESSURE_TENDENCY_HOURS
+            self.pressure_tendency = np.where(past_known, level - self._pressure_levels[past_slot], np.nan)
+            updated = valid[:, self._pressure]
+            self._pressure_levels[slot] = np.where(updated, level, self._pressure_levels[slot])
+            self._pressure_hours[slot] = np.where(updated, hour, self._pressure_hours[slot])
+            tendency = np.nan_to_num(self.pressure_tendency) / PRESSURE_TENDENCY_THRESHOLD
+            events += self._transitions('pressure_tendency', tendency, 1.0, timestamp, self.pressure_tendency)
+        
+        self.samples += 1
+        self.events.extend(events)
+        return events
+    
+    def _transitions(self, kind, score, threshold, timestamp, values):
+        """Événements des séries entrant dans l'état anormal (hystérésis d'un quart du seuil)"""
+        magnitude = np.abs(score)
+        active = self._active[kind]
+        entering = (magnitude >= threshold) & ~active
+        self._active[kind] = np.where(magnitude >= threshold, True, np.where(magnitude < 0.75 * threshold, False, active))
+        if not entering.any():
+            return []
+        
+        timestamp = pd.Timestamp(timestamp)
+        events = []
+        for index in zip(*np.nonzero(entering)):
+            series = index[0]
+            variable = self.variables[index[1]] if len(index) > 1 else 'pressure'
+            events.append(self._event(kind, timestamp, series, variable, float(values[index]), float(score[index])))
+        return events
+    
+    def _event(self, kind, timestamp, series, variable, value, score):
+        label, unit = ANOMALY_VARIABLES.get(variable, (variable, ""))
+        if kind == 'pressure_tendency':
+            direction = "Chute" if value < 0 else "Hausse"
+            message = f"{direction} rapide de la pression ({value:+.1f} hPa/{PRESSURE_TENDENCY_HOURS} h)"
+        elif kind == 'seasonal':
+            message = f"{label} : écart au cycle diurne ({value:.1f}{unit}, {score:+.1f}σ)"
+        else:
+            message = f"{label} : valeur anormalement {'haute' if score > 0 else 'basse'} ({value:.1f}{unit}, z = {score:+.1f})"
+        return {'time': timestamp, 'station': self.series_names[series], 'variable': variable,
+                'kind': kind, 'value': value, 'score': score, 'message': message}
+    
+    def recent_events(self, limit=5, station=None):
+        """Derniers événements, du plus récent au plus ancien"""
+        events = (event for event in reversed(self.events) if station is None or event['station'] == station)
+        return [event for _, event in zip(range(limit), events)]
+    
+    def behaviors(self, series=0):
+        """Synthèse (comportement, état, icône) d'une série à partir de l'état courant du détecteur"""
+        def z_of(variable, scores):
+            return scores[series, self.variables.index(variable)] if variable in self.variables else 0.0
+        
+        behaviors = []
+        diurnal = z_of('temperature', self.seasonal_z)
+        behaviors.append(("Cycle diurne", "Normal", "✅") if abs(diurnal) < 2
+                         else ("Cycle diurne", f"Écart au profil horaire ({diurnal:+.1f}σ)", "⚠️"))
+        
+        tendency = self.pressure_tendency[series] if self._pressure is not None else np.nan
+        if np.isnan(tendency):
+            behaviors.append(("Pression atmosphérique", "Tendance indisponible", "🔍"))
+        elif tendency <= -PRESSURE_TENDENCY_THRESHOLD:
+            behaviors.append(("Pression atmosphérique", f"Baisse rapide ({tendency:+.1f} hPa/3 h)", "⚠️"))
+        elif tendency < -1:
+            behaviors.append(("Pression atmosphérique", f"Légère baisse ({tendency:+.1f} hPa/3 h)", "⚠️"))
+        elif tendency > 1:
+            behaviors.append(("Pression atmosphérique", f"Hausse ({tendency:+.1f} hPa/3 h)", "📈"))
+        else:
+            behaviors.append(("Pression atmosphérique", "Stable", "✅"))
+        
+        wind = z_of('wind_speed', self.z)
+        behaviors.append(("Modèles de vent", "Stable", "✅") if abs(wind) < 2
+                         else ("Modèles de vent", "Inhabituels", "⚠️"))
+        
+        humidity = z_of('humidity', self.z)
+        behaviors.append(("Humidité relative",
+                          "Augmentation" if humidity >= 2 else "Diminution" if humidity <= -2 else "Stable",
+                          "🔍" if abs(humidity) >= 2 else "✅"))
+        return behaviors
+
+FORECAST_HORIZONS = (6, 12, 24)
+
+class HoltWintersNowcaster:
+    """Prévision immédiate par lissage exponentiel de Holt-Winters additif (saison de 24 h)
+    
+    Un modèle par série et par variable, tous stockés dans des tableaux (séries × variables).
+    L'ajustement évalue une grille de paramètres (α, β, γ) en une passe vectorisée et garde,
+    par modèle, celle de plus faible erreur de prévision à 1 h ; chaque nouvel échantillon
+    met ensuite l'état à jour en O(1), sans réajustement. Cadence horaire attendue.
+    """
+    
+    ALPHAS = (0.1, 0.3, 0.5, 0.8)
+    BETAS = (0.01, 0.1)
+    GAMMAS = (0.05, 0.2)
+    
+    def __init__(self, n_series=1, variables=None, season_length=24):
+        self.variables = list(variables or ANOMALY_VARIABLES)
+        self.season_length = season_length
+        self.shape = (n_series, len(self.variables))
+        self.last_hour = None
+        self.level = self.trend = self.season = None
+        self.alpha = self.beta = self.gamma = None
+        self.sse = np.zeros(self.shape)
+        self.errors = np.zeros(self.shape, dtype=np.int64)
+    
+    @classmethod
+    def from_observations(cls, observations, until=None, history=timedelta(days=14)):
+        """Ajuste un modèle par variable sur l'historique récent d'un tampon d'observations"""
+        variables = [name for name in ANOMALY_VARIABLES if name in observations.variables]
+        times = observations.times()
+        stop = len(times) if until is None else np.searchsorted(times, np.datetime64(pd.Timestamp(until), 'ns'), 'right')
+        start = np.searchsorted(times, times[stop - 1] - np.timedelta64(history), 'left') if stop else 0
+        values = np.stack([observations.values(name)[start:stop] for name in variables], axis=-1)
+        nowcaster = cls(1, variables)
+        nowcaster.fit(times[start:stop], values[:, np.newaxis, :])
+        return nowcaster
+    
+    @staticmethod
+    def _step(state, y, hours_elapsed, slot, alpha, beta, gamma):
+        """Une récurrence de Holt-Winters ; retourne l'erreur de prévision à un pas"""
+        level, trend, season = state
+        valid = ~np.isnan(y)
+        seasonal = season[slot]
+        expected_level = level + hours_elapsed * trend
+        error = y - (expected_level + seasonal)
+        new_level = np.where(valid, alpha * (y - seasonal) + (1 - alpha) * expected_level, expected_level)
+        trend[...] = np.where(valid, beta * (new_level - level) / hours_elapsed + (1 - beta) * trend, trend)
+        season[slot] = np.where(valid, gamma * (y - new_level) + (1 - gamma) * seasonal, seasonal)
+        level[...] = new_level
+        return np.where(valid, error, np.nan)
+    
+    def fit(self, times, values):
+        """Ajuste les modèles sur un historique (instants × séries × variables)"""
+        hours = np.asarray(times, dtype='datetime64[h]').astype(np.int64)
+        values = np.asarray(values, dtype=np.float64).reshape((len(hours),) + self.shape)
+        m = self.season_length
+        grid = np.array([(a, b, g) for a in self.ALPHAS for b in self.BETAS for g in self.GAMMAS])
+        alpha, beta, gamma = (grid[:, i].reshape(-1, 1, 1) for i in range(3))
+        k = len(grid)
+        
+        # Initialisation sur la première saison : niveau moyen, tendance entre les deux premières
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            first = np.nanmean(values[:m], axis=0) if len(hours) else np.zeros(self.shape)
+            second = np.nanmean(values[m:2 * m], axis=0) if len(hours) > m else first
+        first = np.nan_to_num(first)
+        level = np.broadcast_to(first, (k,) + self.shape).copy()
+        trend = np.broadcast_to(np.nan_to_num((second - first) / m), (k,) + self.shape).copy()
+        season = np.zeros((m, k) + self.shape)
+        for y, hour in zip(values[:m], hours[:m]):
+            season[hour % m] = np.nan_to_num(y - first)
+        
+        sse = np.zeros((k,) + self.shape)
+        errors = np.zeros((k,) + self.shape, dtype=np.int64)
+        previous = hours[min(m, len(hours)) - 1] if len(hours) else None
+        for y, hour in zip(values[m:], hours[m:]):
+            elapsed = hour - previous
+            if elapsed <= 0:
+                continue
+            error = self._step((level, trend, season), y, elapsed, hour % m, alpha, beta, gamma)
+            known = ~np.isnan(error)
+            sse += np.where(known, error ** 2, 0.0)
+            errors += known
+            previous = hour
+        
+        # Meilleur jeu de paramètres par modèle (erreur quadratique moyenne à 1 h)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            best = np.nanargmin(np.where(errors > 0, sse / errors, np.inf), axis=0)
+        take = lambda array: np.take_along_axis(array, best[np.newaxis], axis=0)[0]
+        self.level, self.trend = take(level), take(trend)
+        self.season = np.stack([take(season[slot]) for slot in range(m)])
+        self.alpha, self.beta, self.gamma = (take(np.broadcast_to(p, (k,) + self.shape)) for p in (alpha, beta, gamma))
+        self.sse, self.errors = take(sse), take(errors)
+        self.last_hour = previous
+        return self
+    
+    def update(self, timestamp, values):
+        """Intègre un nouvel échantillon en O(1) (dict pour une série unique)"""
+        if isinstance(values, dict):
+            values = [values.get(name, np.nan) for name in self.variables]
+        hour = np.datetime64(timestamp, 'h').astype(np.int64)
+        if self.last_hour is not None and hour <= self.last_hour:
+            return
+        y = np.asarray(values, dtype=np.float64).reshape(self.shape)
+        elapsed = 1 if self.last_hour is None else hour - self.last_hour
+        error = self._step((self.level, self.trend, self.season), y, elapsed, hour % self.season_length,
+                           self.alpha, self.beta, self.gamma)
+        known = ~np.isnan(error)
+        self.sse += np.where(known, error ** 2, 0.0)
+        self.errors += known
+        self.last_hour = hour
+    
+    def forecast(self, horizons=FORECAST_HORIZONS, coverage=0.8):
+        """Prévisions (séries × variables × horizons) et intervalles de prévision à `coverage`
+        
+        Variance à h pas : σ² · (1 + Σ_{j<h} (α(1 + jβ) + γ·[j multiple de la saison])²).
+        """
+        horizons = np.asarray(horizons)
+        slots = (self.last_hour + horizons) % self.season_length
+        mean = self.level[..., np.newaxis] + horizons * self.trend[..., np.newaxis] + np.moveaxis(self.season[slots], 0, -1)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sigma2 = np.where(self.errors > 0, self.sse / self.errors, np.nan)
+        j = np.arange(1, horizons.max())
+        seasonal_step = (j % self.season_length == 0)
+        weights = (self.alpha[..., np.newaxis] * (1 + j * self.beta[..., np.newaxis])
+                   + self.gamma[..., np.newaxis] * seasonal_step) ** 2
+        cumulative = np.concatenate([np.zeros(self.shape + (1,)), np.cumsum(weights, axis=-1)], axis=-1)
+        std = np.sqrt(sigma2[..., np.newaxis] * (1 + cumulative[..., horizons - 1]))
+        z = NormalDist().inv_cdf(0.5 + coverage / 2)
+        return {'horizons': horizons, 'mean': mean, 'lower': mean - z * std, 'upper': mean + z * std, 'std': std}
+
+# Règles de vigilance déclaratives : condition sur les colonnes, durée minimale et textes d'alerte
+WEATHER_ALERT_RULES = [
+    {'type': 'VIGILANCE_ROUGE', 'title': 'Vents cycloniques', 'condition': 'wind_speed > 118', 'min_hours': 1,
+     'severity': 'Élevée', 'unit': 'km/h', 'description': 'Vent moyen jusqu\'à {peak:.0f} km/h',
+     'impact': 'Dégâts importants aux structures', 'actions': 'Se mettre à l\'abri, ne pas se déplacer'},
+    {'type': 'VIGILANCE_ORANGE', 'title': 'Vent violent', 'condition': 'gust_speed > 90', 'min_hours': 2,
+     'severity': 'Élevée', 'unit': 'km/h', 'description': 'Rafales attendues jusqu\'à {peak:.0f} km/h',
+     'impact': 'Transport maritime perturbé', 'actions': 'Éviter les zones côtières'},
+    {'type': 'VIGILANCE_JAUNE', 'title': 'Vent fort', 'condition': 'gust_speed > 60', 'min_hours': 3,
+     'severity': 'Modérée', 'unit': 'km/h', 'description': 'Rafales jusqu\'à {peak:.0f} km/h',
+     'impact': 'Chutes de branches possibles', 'actions': 'Sécuriser les objets exposés au vent'},
+    {'type': 'VIGILANCE_ORANGE', 'title': 'Fortes précipitations', 'condition': 'precipitation > 10', 'min_hours': 2,
+     'severity': 'Élevée', 'unit': 'mm/h', 'description': 'Intensités jusqu\'à {peak:.1f} mm/h',
+     'impact': 'Risque d\'inondation', 'actions': 'Éviter les ravines et radiers'},
+    {'type': 'VIGILANCE_JAUNE', 'title': 'Pluies soutenues', 'condition': 'precipitation > 4', 'min_hours': 2,
+     'severity': 'Modérée', 'unit': 'mm/h', 'description': 'Intensités jusqu\'à {peak:.1f} mm/h',
+     'impact': 'Risque de ruissellement', 'actions': 'Surveillance des cours d\'eau'},
+    {'type': 'VIGILANCE_JAUNE', 'title': 'Orages', 'condition': 'precipitation > 5 and gust_speed > 50', 'min_hours': 1,
+     'severity': 'Modérée', 'unit': 'mm/h', 'description': 'Averses orageuses jusqu\'à {peak:.1f} mm/h avec rafales',
+     'impact': 'Coupures électriques possibles', 'actions': 'Éviter les activités de plein air'},
+    {'type': 'VIGILANCE_ORANGE', 'title': 'Canicule', 'condition': 'heat_index > 40', 'min_hours': 3,
+     'severity': 'Élevée', 'unit': '°C', 'description': 'Indice de chaleur jusqu\'à {peak:.0f}°C',
+     'impact': 'Risque sanitaire pour les personnes fragiles', 'actions': 'S\'hydrater, limiter les efforts'},
+    {'type': 'VIGILANCE_JAUNE', 'title': 'Fortes chaleurs', 'condition': 'heat_index > 35', 'min_hours': 4,
+     'severity': 'Modérée', 'unit': '°C', 'description': 'Indice de chaleur jusqu\'à {peak:.0f}°C',
+     'impact': 'Inconfort thermique', 'actions': 'Éviter les heures les plus chaudes'},
+    {'type': 'VIGILANCE_JAUNE', 'title': 'Visibilité réduite', 'condition': 'visibility < 2', 'min_hours': 2,
+     'severity': 'Modérée', 'unit': 'km', 'description': 'Visibilité minimale de {peak:.1f} km',
+     'impact': 'Circulation ralentie', 'actions': 'Adapter sa vitesse'}
+]
+ALERT_LEVELS = {"Toutes": ('Élevée', 'Modérée'), "Critiques seulement": ('Élevée',), "Désactivées": ()}
+
+def parse_condition(condition):
+    """« gust_speed > 90 and humidity >= 60 » → [(variable, opérateur, seuil), ...]"""
+    clauses = []
+    for clause in condition.split(' and '):
+        match = re.fullmatch(r'\s*(\w+)\s*(>=|<=|>|<)\s*(-?\d+(?:\.\d+)?)\s*', clause)
+        if match is None:
+            raise ValueError(f"Condition de règle invalide : {clause!r}")
+        clauses.append((match[1], match[2], float(match[3])))
+    return clauses
+
+class AlertRuleEngine:
+    """Moteur de règles de vigilance à seuils, compilé en masques booléens vectorisés
+    
+    Les clauses de toutes les règles sont regroupées par (variable, opérateur) : une seule
+    comparaison diffusée sur (seuils × séries × instants) par groupe. Les clauses suivantes
+    d'une règle sont combinées par ET rang par rang, puis les dépassements consécutifs sont
+    fusionnés en intervalles à partir des fronts montants et descendants (run-length).
+    """
+    
+    OPERATORS = {'>': np.greater, '>=': np.greater_equal, '<': np.less, '<=': np.less_equal}
+    MAX_MASK_CELLS = 1 << 24  # taille maximale des masques d'un morceau de séries
+    
+    def __init__(self, rules=WEATHER_ALERT_RULES):
+        self.rules = list(rules)
+        clauses = [(r, *clause) for r, rule in enumerate(self.rules) for clause in parse_condition(rule['condition'])]
+        self.n_clauses = len(clauses)
+        clause_rules = np.array([clause[0] for clause in clauses])
+        rank = np.arange(len(clauses)) - np.searchsorted(clause_rules, clause_rules)
+        # Première clause de chaque règle, puis clauses de rang k ≥ 1 (au plus une par règle)
+        self.first_clauses = np.flatnonzero(rank == 0)
+        self.extra_clauses = [(clause_rules[rank == k], np.flatnonzero(rank == k)) for k in range(1, rank.max(initial=0) + 1)]
+        groups = {}
+        for i, (_, variable, operator, threshold) in enumerate(clauses):
+            groups.setdefault((variable, operator), ([], []))
+            groups[(variable, operator)][0].append(i)
+            groups[(variable, operator)][1].append(threshold)
+        self.groups = [(variable, operator, np.array(rows), np.array(thresholds))
+                       for (variable, operator), (rows, thresholds) in groups.items()]
+        self.variables = sorted({variable for variable, *_ in self.groups})
+        self.min_hours = np.array([rule.get('min_hours', 1) for rule in self.rules], dtype=np.float64)
+        # La première clause de chaque règle donne la valeur de pointe affichée
+        primary = {}
+        for r, rule in enumerate(self.rules):
+            variable, operator, _ = parse_condition(rule['condition'])[0]
+            primary.setdefault((variable, operator in ('>', '>=')), []).append(r)
+        self.primary = [(variable, np.fmax if upper else np.fmin, np.array(rules))
+                        for (variable, upper), rules in primary.items()]
+    
+    def evaluate(self, times, values):
+        """Intervalles d'alerte de toutes les règles sur toutes les séries
+        
+        `values` associe à chaque variable des règles un tableau (séries × instants) ; retourne
+        un DataFrame (rule, series, start, end, peak) où `end` est exclusif (indices d'instants).
+        """
+        times = np.asarray(times, dtype='datetime64[ns]')
+        n_series, n_times = np.shape(values[self.variables[0]])
+        step_hours = float(np.median(np.diff(times)) / np.timedelta64(1, 'h')) if n_times > 1 else 1.0
+        chunk = max(1, self.MAX_MASK_CELLS // max(self.n_clauses * n_times, 1))
+        
+        runs = []
+        for first in range(0, n_series, chunk):
+            rows = slice(first, min(first + chunk, n_series))
+            masks = np.empty((self.n_clauses, rows.stop - rows.start, n_times), dtype=bool)
+            for variable, operator, clause_rows, thresholds in self.groups:
+                block = np.asarray(values[variable][rows])
+                with np.errstate(invalid='ignore'):
+                    masks[clause_rows] = self.OPERATORS[operator](block[np.newaxis], thresholds[:, np.newaxis, np.newaxis])
+            padded = np.zeros((len(self.rules), masks.shape[1], n_times + 2), dtype=bool)
+            padded[..., 1:-1] = masks[self.first_clauses]
+            for rules, clauses in self.extra_clauses:
+                padded[rules, :, 1:-1] &= masks[clauses]
+            
+            # Fronts alternés montant / descendant : un seul flatnonzero pour tous les intervalles
+            edges = np.flatnonzero(padded[..., 1:] != padded[..., :-1])
+            row, position = np.divmod(edges, n_times + 1)
+            rule, series = np.divmod(row[::2], masks.shape[1])
+            start, end = position[::2], position[1::2]
+            keep = (end - start) * step_hours >= self.min_hours[rule]
+            runs.append((rule[keep], series[keep] + first, start[keep], end[keep]))
+        
+        rule, series, start, end = (np.concatenate(parts) for parts in zip(*runs))
+        peak = np.full(len(rule), np.nan)
+        for variable, reduce, rules in self.primary:
+            selected = np.flatnonzero(np.isin(rule, rules))
+            if len(selected) == 0:
+                continue
+            # Pointe de chaque intervalle par reduceat sur la série aplatie (bornes entrelacées)
+            flat = np.append(np.asarray(values[variable], dtype=np.float64).ravel(), np.nan)
+            offsets = series[selected] * n_times
+            bounds = np.column_stack([offsets + start[selected], offsets + end[selected]]).ravel()
+            peak[selected] = reduce.reduceat(flat, bounds)[::2]
+        return pd.DataFrame({'rule': rule, 'series': series, 'start': start, 'end': end, 'peak': peak})
+    
+    def alerts(self, times, values, series_names, after=None):
+        """Alertes au format du dashboard, en cours ou à venir (fin postérieure à `after`)"""
+        times = np.asarray(times, dtype='datetime64[ns]')
+        intervals = self.evaluate(times, values)
+        step = np.median(np.diff(times)) if len(times) > 1 else np.timedelta64(1, 'h')
+        end_times = times[intervals['end'].to_numpy() - 1] + step
+        if after is not None:
+            active = end_times > np.datetime64(pd.Timestamp(after), 'ns')
+            intervals, end_times = intervals[active], end_times[active]
+        
+        alerts = []
+        for row, end_time in zip(intervals.itertuples(), end_times):
+            rule = self.rules[row.rule]
+            alerts.append({
+                'type': rule['type'],
+                'title': rule['title'],
+                'region': series_names[row.series],
+                'severity': rule['severity'],
+                'start_time': pd.Timestamp(times[row.start]).to_pydatetime(),
+                'end_time': pd.Timestamp(end_time).to_pydatetime(),
+                'description': rule['description'].format(peak=row.peak),
+                'impact': rule['impact'],
+                'actions': rule['actions']
+            })
+        return sorted(alerts, key=lambda alert: (alert['severity'] != 'Élevée', alert['start_time']))
+
+@st.cache_resource(show_spinner=False)
+def get_alert_engine():
+    """Moteur compilé des règles de vigilance, partagé par toutes les sessions"""
+    return AlertRuleEngine()
+
+def filter_alerts(alerts, alert_level):
+    """Alertes retenues pour le niveau choisi dans la barre latérale"""
+    severities = ALERT_LEVELS.get(alert_level, ALERT_LEVELS["Toutes"])
+    return [alert for alert in alerts if alert['severity'] in severities]
+
+ACTIVE_STORM_NAMES = ["ATLANTIC-01", "PACIFIC-ALPHA", "INDIAN-DELTA"]
+
+def simulate_active_storms(rng):
+    """Trajectoires des tempêtes actives (6 jours de prévision)"""
+    return StormTrackStore.generate(ACTIVE_STORM_NAMES, n_points=24, rng=rng)
+
+def forecast_active_storms(storm_tracks, rng):
+    """Ensembles Monte-Carlo de chaque tempête ; renseigne `current_threat` du stockage"""
+    ensembles = forecast_storm_ensembles(storm_tracks, seed=int(rng.integers(2 ** 63)),
+                                         executor=get_storm_executor())
+    storm_tracks.current_threat = np.array([
+        assess_storm_threat(ensembles[name]['start_intensity'], ensembles[name])
+        for name in storm_tracks.names
+    ])
+    return ensembles
+
+class EnhancedWeatherAnalytics:
+    def __init__(self, seed=None, weather_data=None, storms=None):
+        self.rng = np.random.default_rng(seed)
+        self._observation_appends = 0
+        self.stations = None
+        self.station_id = 'simulation'
+        self.alert_region = None  # zone des alertes (lieu par défaut si None)
+        self.provider = None  # fournisseur réel des données (None : simulation, jamais archivée)
+        self._generator = None  # générateur synthétique, poursuivi lors des rafraîchissements
+        self.weather_data = weather_data if weather_data is not None else self.generate_enhanced_sample_data()
+        if storms is None:
+            self.storm_tracks = self.generate_enhanced_storm_data()
+            self.storm_ensembles = self.generate_storm_ensembles()
+        else:
+            # Tempêtes communes à toute la fenêtre d'actualisation (partagées, en lecture seule)
+            self.storm_tracks, self.storm_ensembles = storms
+        self.ai_predictions = self.generate_ai_predictions()
+        self.weather_alerts = self.generate_weather_alerts()
+        self.data_version = compute_data_version(self.weather_data, self.storm_tracks)
+        self.built_at = time.time()
+    
+    @property
+    def weather_data(self):
+        """Vue DataFrame (sans copie des colonnes) sur le tampon d'observations"""
+        if self._weather_frame is None:
+            self._weather_frame = self.observations.to_frame()
+        return self._weather_frame
+    
+    @weather_data.setter
+    def weather_data(self, frame):
+        self.observations = ObservationRingBuffer.from_frame(frame, capacity=len(frame) + OBSERVATION_HEADROOM)
+        self.rollups = ClimateRollups.from_frame(frame, variables=self.observations.variables)
+        self.derived = DerivedVariables(self.observations)
+        # Seules les observations passées alimentent le détecteur (pas les prévisions)
+        now = utc_now()
+        self.anomaly_detector = StreamingAnomalyDetector.from_observations(self.observations, until=now)
+        self.nowcaster = HoltWintersNowcaster.from_observations(self.observations, until=now)
+        self.observed_until = np.datetime64(now, 'ns')
+        self._weather_frame = None
+    
+    def append_observation(self, timestamp, values):
+        """Ajoute une ligne (observée ou prévue) en O(1) sans régénérer le jeu de données
+        
+        Le détecteur et le nowcaster ne la voient qu'une fois passée (`catch_up`).
+        """
+        self.observations.append(timestamp, values)
+        self.rollups.append(timestamp, values)
+        self._weather_frame = None
+        self._observation_appends += 1
+        base_version = self.data_version.split(':')[0]
+        self.data_version = f"{base_version}:{self._observation_appends}"
+    
+    def catch_up(self, now=None):
+        """Fait entrer dans le détecteur et le nowcaster les heures du tampon devenues passées"""
+        now = np.datetime64(now or utc_now(), 'ns')
+        times = self.observations.times()
+        start = np.searchsorted(times, self.observed_until, side='right')
+        stop = np.searchsorted(times, now, side='right')
+        variables = self.anomaly_detector.variables
+        for i in range(start, stop):
+            values = [self.observations.values(name)[i] for name in variables]
+            self.anomaly_detector.update(times[i], values)
+            self.nowcaster.update(times[i], values)
+        self.observed_until = max(self.observed_until, now)
+    
+    def refreshed(self, frame=None, now=None, storms=None):
+        """Copie de l'instantané prolongée des seules lignes nouvelles (rafraîchissement périodique)
+        
+        `frame` : données fraîches de la source, dont seules les heures postérieures au tampon
+        sont ajoutées ; sans `frame`, le générateur synthétique poursuit sa série jusqu'à
+        l'horizon de prévision. Tampon, agrégats, détecteur et nowcaster avancent en O(1) par
+        ligne ; prédictions et alertes sont recalculées. `storms` : tempêtes partagées de la
+        fenêtre courante (régénérées sinon). L'instantané d'origine, partagé par les sessions,
+        n'est pas modifié.
+        """
+        now = now or utc_now()
+        analytics = copy.copy(self)
+        for name in ('observations', 'rollups', 'anomaly_detector', 'nowcaster', '_generator'):
+            setattr(analytics, name, copy.deepcopy(getattr(self, name)))
+        analytics.derived = DerivedVariables(analytics.observations)
+        analytics._weather_frame = None
+        
+        if frame is None:
+            frame = analytics.generate_following_rows(now)
+        if frame is not None:
+            variables = analytics.observations.variables
+            new = frame[frame['datetime'].to_numpy() > analytics.observations.times()[-1]]
+            for timestamp, values in zip(new['datetime'].to_numpy(), new.reindex(columns=variables).to_numpy(np.float64)):
+                analytics.append_observation(timestamp, values)
+        
+        analytics.catch_up(now)
+        if storms is None:
+            analytics.storm_tracks = analytics.generate_enhanced_storm_data()
+            analytics.storm_ensembles = analytics.generate_storm_ensembles()
+        else:
+            analytics.storm_tracks, analytics.storm_ensembles = storms
+        analytics.ai_predictions = analytics.generate_ai_predictions()
+        analytics.weather_alerts = analytics.generate_weather_alerts()
+        analytics.data_version = f"{compute_data_version(analytics.weather_data, analytics.storm_tracks)}:" \
+                                 f"{analytics._observation_appends}"
+        analytics.built_at = time.time()
+        return analytics
+    
+    def generate_enhanced_sample_data(self, days_back=14, days_ahead=7, freq='h'):
+        """Génère des données météorologiques simulées plus réalistes et détaillées"""
+        self._generator = SyntheticWeatherGenerator(seed=self.rng)
+        now = utc_now()
+        self._generator_start = pd.Timestamp(now - timedelta(days=days_back))
+        self._generator_ahead = timedelta(days=days_ahead)
+        return self._generator.generate_frame(self._generator_start, now + self._generator_ahead, freq=freq)
+    
+    def generate_following_rows(self, now=None):
+        """Heures suivantes de la série synthétique, jusqu'à l'horizon de prévision (None sans générateur)"""
+        if self._generator is None:
+            return None
+        last = pd.Timestamp(self.observations.times()[-1])
+        end = pd.Timestamp(now or utc_now()) + self._generator_ahead
+        first_hour = int((last - self._generator_start) / pd.Timedelta(hours=1)) + 1
+        hours = np.arange(first_hour, int((end - self._generator_start) / pd.Timedelta(hours=1)) + 1)
+        if len(hours) == 0:
+            return None
+        block = self._generator.generate_block(hours)
+        data = {'datetime': self._generator_start + pd.to_timedelta(hours, unit='h')}
+        data.update({name: values[0] for name, values in block.items()})
+        return pd.DataFrame(data)
+    
+    def calculate_heat_index(self, temperature, humidity):
+        """Calcule l'indice de chaleur (heat index)"""
+        return calculate_heat_index(temperature, humidity)
+    
+    def generate_enhanced_storm_data(self):
+        """Génère des données de tempêtes plus réalistes avec modèles de trajectoire"""
+        return simulate_active_storms(self.rng)
+    
+    def generate_storm_ensembles(self):
+        """Ensembles Monte-Carlo de chaque tempête ; le niveau de menace en est déduit"""
+        return forecast_active_storms(self.storm_tracks, self.rng)
+    
+    def get_storm_category(self, wind_speed):
+        """Catégorise les tempêtes selon l'échelle de Saffir-Simpson améliorée"""
+        return str(STORM_CATEGORY_LABELS[categorize_storm_intensity(wind_speed)])
+    
+    def generate_ai_predictions(self):
+        """Prévisions court terme (Holt-Winters) et indicateurs de développement orageux"""
+        forecast = self.nowcaster.forecast()
+        variables = self.nowcaster.variables
+        
+        def value(key, variable, i):
+            return float(forecast[key][0, variables.index(variable), i])
+        
+        short_term = {}
+        for i, hours in enumerate(forecast['horizons']):
+            pressure_change = value('mean', 'pressure', i) - float(self.nowcaster.level[0, variables.index('pressure')])
+            # Confiance : part de l'amplitude récente non couverte par l'intervalle de prévision
+            confidences = []
+            for variable in variables:
+                stats = self.observations.stats(variable)
+                spread = value('upper', variable, i) - value('lower', variable, i)
+                confidences.append(np.clip(1 - spread / max(stats['max'] - stats['min'], 1e-9), 0.05, 0.99))
+            short_term[f'next_{hours}h'] = {
+                'trend': 'deteriorating' if pressure_change <= -1.5 else 'improving' if pressure_change >= 1.5 else 'stable',
+                'confidence': round(float(np.nanmean(confidences)), 2),
+                'details': (f"Température {value('mean', 'temperature', i):.1f}°C "
+                            f"[{value('lower', 'temperature', i):.1f} – {value('upper', 'temperature', i):.1f}] • "
+                            f"Pression {value('mean', 'pressure', i):.0f} hPa ({pressure_change:+.1f}) • "
+                            f"Vent {value('mean', 'wind_speed', i):.0f} km/h"),
+                'forecast': {variable: (value('mean', variable, i), value('lower', variable, i),
+                                        value('upper', variable, i)) for variable in variables}
+            }
+        
+        predictions = {
+            'short_term': short_term,
+            'storm_development': {
+                'probability': 0.45,
+                'expected_intensity': 'Modérée',
+                'timeline': '24-48 heures'
+            }
+        }
+        return predictions
+    
+    def generate_weather_alerts(self, region=None):
+        """Alertes de vigilance en cours ou à venir, évaluées par le moteur de règles"""
+        engine = get_alert_engine()
+        values = {variable: self.derived.values(variable)[np.newaxis] for variable in engine.variables}
+        return engine.alerts(self.observations.times(), values, [region or self.alert_region or DEFAULT_LOCATION['name']],
+                             after=utc_now())
+    
+    @timed_section()
+    def create_advanced_metrics_dashboard(self):
+        """Crée un tableau de bord de métriques avancées"""
+        observations = self.observations
+        current = self.derived.latest(['heat_index', 'dew_point'])
+        
+        def window_help(variable, unit):
+            stats = observations.stats(variable)
+            return f"Fenêtre: min {stats['min']:.1f}{unit} • max {stats['max']:.1f}{unit} • moyenne {stats['mean']:.1f}{unit}"
+        
+        # Métriques principales avec tendances
+        col1, col2, col3, col4, col5 = st.columns(5)
+        
+        with col1:
+            delta_temp = observations.delta('temperature')
+            trend_icon = "📈" if delta_temp > 0 else "📉" if delta_temp < 0 else "➡️"
+            st.metric("🌡️ Température", f"{current['temperature']:.1f}°C", 
+                     f"{trend_icon} {delta_temp:+.1f}°C", help=window_help('temperature', "°C"))
+        
+        with col2:
+            delta_wind = observations.delta('wind_speed')
+            st.metric("💨 Vent Moyen", f"{current['wind_speed']:.1f} km/h",
+                     f"{delta_wind:+.1f} km/h", help=window_help('wind_speed', " km/h"))
+            st.metric("💨 Rafales", f"{current['gust_speed']:.1f} km/h")
+        
+        with col3:
+            delta_pressure = observations.delta('pressure')
+            pressure_trend = "📉" if delta_pressure < -2 else "📈" if delta_pressure > 2 else "➡️"
+            st.metric("📊 Pression", f"{current['pressure']:.1f} hPa",
+                     f"{pressure_trend} {delta_pressure:+.1f} hPa", help=window_help('pressure', " hPa"))
+        
+        with col4:
+            heat_index = current['heat_index']
+            risk_level = "⚠️" if heat_index > 30 else "✅"
+            st.metric("🔥 Indice Chaleur", f"{heat_index:.1f}°C", risk_level)
+            st.metric("💧 Point Rosée", f"{current['dew_point']:.1f}°C")
+        
+        with col5:
+            st.metric("🌧️ Précipitation", f"{current['precipitation']:.1f} mm/h")
+            st.metric("👁️ Visibilité", f"{current['visibility']:.1f} km")
+    
+    def build_ai_analysis_figure(self, window_label, max_points):
+        """Construit le graphique d'analyse de tendances multi-variables"""
+        from plotly.subplots import make_subplots
+        
+        fig = make_subplots(rows=2, cols=1, 
+                           subplot_titles=('Analyse Multi-Variables', 'Indices de Confort'),
+                           vertical_spacing=0.12)
+        
+        window = ANALYSIS_WINDOWS[window_label]
+        recent_data = self.derived.frame(['temperature', 'pressure', 'heat_index', 'dew_point'])
+        if window is not None:
+            recent_data = recent_data[recent_data['datetime'] >= recent_data['datetime'].iloc[-1] - window]
+        series = level_of_detail(recent_data, ['temperature', 'pressure', 'heat_index', 'dew_point'],
+                                 max_points=max_points)
+        
+        fig.add_trace(
+            go.Scatter(x=series['temperature'][0], y=series['temperature'][1],
+                      name='Température', line=dict(color='red', width=3)),
+            row=1, col=1
+        )
+        fig.add_trace(
+            go.Scatter(x=series['pressure'][0], y=series['pressure'][1],
+                      name='Pression', line=dict(color='blue', width=2), yaxis='y2'),
+            row=1, col=1
+        )
+        
+        # Indices de confort
+        fig.add_trace(
+            go.Scatter(x=series['heat_index'][0], y=series['heat_index'][1],
+                      name='Indice Chaleur', line=dict(color='orange', width=2)),
+            row=2, col=1
+        )
+        fig.add_trace(
+            go.Scatter(x=series['dew_point'][0], y=series['dew_point'][1],
+                      name='Point Rosée', line=dict(color='green', width=2)),
+            row=2, col=1
+        )
+        
+        fig.update_layout(height=500, showlegend=True)
+        fig.update_xaxes(title_text="Heure (UTC)", row=2, col=1)
+        fig.update_yaxes(title_text="Pression (hPa)", secondary_y=True, row=1, col=1)
+        return fig
+    
+    @timed_section()
+    def create_ai_weather_analysis(self):
+        """Analyse météo avancée avec insights IA"""
+        st.markdown("### 🧠 IA Météo - Analyse Prédictive")
+        
+        col1, col2 = st.columns([2, 1])
+        
+        with col1:
+            # Variables principales sur la fenêtre choisie, réduites au niveau de détail affichable
+            window_label = st.radio("Fenêtre d'analyse:", list(ANALYSIS_WINDOWS), index=0,
+                                    horizontal=True, key="ai_analysis_window")
+            max_points = st.session_state.get('lod_max_points', MAX_POINTS_PER_TRACE)
+            fig = get_figure_cache().get_or_build(
+                'ai_analysis', self.data_version,
+                lambda: self.build_ai_analysis_figure(window_label, max_points),
+                window=window_label, max_points=max_points
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            # Insights IA
+            st.markdown("#### 📋 Insights IA")
+            
+            st.markdown("##### 🔮 Prévisions Court Terme")
+            for period, prediction in self.ai_predictions['short_term'].items():
+                with st.container():
+                    st.write(f"**{period.replace('_', ' ').title()}**")
+                    st.write(f"Tendance: {prediction['trend']}")
+                    st.write(f"Confiance: {prediction['confidence']*100:.0f}%")
+                    st.write(prediction['details'])
+                    st.progress(prediction['confidence'])
+                    st.markdown("---")
+            
+            st.markdown("##### ⚠️ Anomalies Détectées")
+            anomalies = self.anomaly_detector.recent_events(5)
+            if not anomalies:
+                st.write("✅ Aucune anomalie sur la période récente")
+            for anomaly in anomalies:
+                st.write(f"• {anomaly['time']:%d/%m %H:%M} UTC — {anomaly['message']}")
+    
+    @timed_section()
+    def create_advanced_storm_analytics(self):
+        """Analytics avancés pour les tempêtes"""
+        st.markdown("### 🌀 Analytics Tempêtes Avancés")
+        
+        if not self.storm_tracks:
+            st.info("Aucune activité cyclonique significative détectée")
+            return
+        
+        figure_cache = get_figure_cache()
+        view = st.radio("Vue:", ["🌍 Vue d'ensemble", "🎯 Tempête"], horizontal=True, key="storm_view")
+        if view == "🌍 Vue d'ensemble":
+            history = get_storm_history()
+            fig = figure_cache.get_or_build(
+                'storm_overview', self.data_version,
+                lambda: self.build_storm_overview_figure(history),
+                history=len(history)
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            points = len(self.storm_tracks.lat) + min(len(history.lat), STORM_OVERVIEW_MAX_POINTS)
+            st.caption(f"🌀 {len(self.storm_tracks)} tempête(s) active(s) • {len(history):,} historiques "
+                       f"({STORM_HISTORY_SEASONS} saisons) • {points:,} points en 3 traces WebGL")
+            return
+        
+        # Sélection de la tempête
+        selected_storm = st.selectbox("Sélectionner une tempête:", self.storm_tracks.names)
+        
+        # Cartographie avancée
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            fig = figure_cache.get_or_build(
+                'storm_track', self.data_version,
+                lambda: self.build_storm_track_figure(selected_storm),
+                storm=selected_storm
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            # Statistiques avancées de la tempête
+            current_state = self.storm_tracks.latest(selected_storm)
+            
+            st.markdown("#### 📊 Statistiques")
+            st.metric("Intensité Actuelle", f"{current_state['intensity']:.1f} km/h")
+            st.metric("Catégorie", current_state['category'])
+            st.metric("Pression", f"{current_state['pressure']:.1f} hPa")
+            st.metric("Rayon d'Action", f"{current_state['radius']:.0f} km")
+            st.metric("Niveau de Menace", self.storm_tracks.current_threat[self.storm_tracks.storm_index(selected_storm)])
+            
+            ensemble = self.storm_ensembles[selected_storm]
+            landfall_hours = ensemble['landfall_hours']
+            st.metric("Probabilité d'Atterrissage", format_probability(ensemble['landfall_probability']),
+                      f"~{landfall_hours:.0f} h" if landfall_hours is not None else None, delta_color="off",
+                      help=f"Sur {ensemble['members']} membres d'ensemble")
+            for region, probability in list(ensemble['landfall'].items())[:3]:
+                st.caption(f"📍 {region} : {format_probability(probability)}")
+            step_48h = min(48 // ensemble['step_hours'], ensemble['intensity_quantiles'].shape[1] - 1)
+            low, median, high = ensemble['intensity_quantiles'][:, step_48h]
+            st.caption(f"Intensité à +48 h : {median:.0f} km/h [{low:.0f} – {high:.0f}]")
+            
+            # Évolution de l'intensité
+            fig_intensity = figure_cache.get_or_build(
+                'storm_intensity', self.data_version,
+                lambda: self.build_storm_intensity_figure(selected_storm),
+                storm=selected_storm
+            )
+            st.plotly_chart(fig_intensity, use_container_width=True)
+    
+    def build_storm_track_figure(self, storm):
+        """Construit la carte de trajectoire d'une tempête"""
+        track = self.storm_tracks.track(storm)
+        ensemble = self.storm_ensembles[storm]
+        fig = go.Figure(landfall_regions_trace())
+        
+        # Cône d'incertitude de l'ensemble
+        fig.add_trace(go.Scattermapbox(
+            lat=ensemble['cone_lat'],
+            lon=ensemble['cone_lon'],
+            mode='lines',
+            fill='toself',
+            fillcolor='rgba(255, 165, 0, 0.25)',
+            line=dict(width=1, color='orange'),
+            name=f"Cône d'incertitude ({CONE_PROBABILITY}%)",
+            hoverinfo='skip'
+        ))
+        
+        # Échantillon de membres : une seule trace, trajectoires séparées par des NaN
+        n_sample = ensemble['sample_lat'].shape[0]
+        separator = np.full((n_sample, 1), np.nan, dtype=np.float32)
+        fig.add_trace(go.Scattermapbox(
+            lat=np.hstack([ensemble['sample_lat'], separator]).ravel(),
+            lon=np.hstack([ensemble['sample_lon'], separator]).ravel(),
+            mode='lines',
+            line=dict(width=1, color='rgba(120, 120, 120, 0.5)'),
+            name=f"Membres ({n_sample} sur {ensemble['members']})",
+            hoverinfo='skip'
+        ))
+        
+        # Trajectoire moyenne prévue
+        lead_hours = np.arange(len(ensemble['center_lat'])) * ensemble['step_hours']
+        fig.add_trace(go.Scattermapbox(
+            lat=ensemble['center_lat'],
+            lon=ensemble['center_lon'],
+            mode='lines+markers',
+            marker=dict(size=6, color='orange'),
+            line=dict(width=3, color='orange'),
+            name="Prévision (moyenne d'ensemble)",
+            customdata=np.column_stack([lead_hours, ensemble['radius_km'], ensemble['intensity_quantiles'][1]]),
+            hovertemplate="+%{customdata[0]:.0f} h<br>Rayon du cône: %{customdata[1]:.0f} km"
+                          "<br>Intensité médiane: %{customdata[2]:.0f} km/h<extra></extra>"
+        ))
+        
+        # Trajectoire avec intensité (colonnes utilisées directement, sans reconstruire de listes)
+        fig.add_trace(go.Scattermapbox(
+            lat=track['lat'],
+            lon=track['lon'],
+            mode='lines+markers',
+            marker=dict(
+                size=10,
+                color=track['intensity'],
+                colorscale='Viridis',
+                colorbar=dict(title="Intensité (km/h)"),
+                showscale=True
+            ),
+            line=dict(width=4, color='red'),
+            name="Trajectoire",
+            customdata=np.column_stack([track['intensity'], track['pressure']]),
+            hovertemplate="Vitesse: %{customdata[0]:.1f} km/h<br>Pression: %{customdata[1]:.1f} hPa<extra></extra>"
+        ))
+        
+        fig.update_layout(
+            mapbox=dict(
+                storm_map_style(),
+                center=dict(lat=float(track['lat'].mean()), lon=float(track['lon'].mean())),
+                zoom=3,
+                bearing=0,
+                pitch=0
+            ),
+            height=500,
+            margin=dict(l=0, r=0, t=0, b=0),
+            legend=dict(x=0, y=1, bgcolor='rgba(255, 255, 255, 0.7)'),
+            title=f"Trajectoire de {storm}"
+        )
+        return fig
+    
+    def build_storm_overview_figure(self, history):
+        """Carte de toutes les tempêtes actives et historiques en trois traces WebGL
+        
+        Les trajectoires sont concaténées et séparées par des NaN ; le survol lit directement
+        les colonnes du stockage (customdata), sans texte par point. Au-delà de
+        STORM_OVERVIEW_MAX_POINTS, l'historique est décimé à pas constant (extrémités conservées).
+        """
+        fig = go.Figure(landfall_regions_trace())
+        
+        # Historique : une seule trace pour toutes les saisons
+        position = np.arange(len(history.lat)) - history.offsets[history.storm_id]
+        stride = -(-len(history.lat) // STORM_OVERVIEW_MAX_POINTS)
+        keep = (position % stride == 0) | (np.arange(len(history.lat)) == history.offsets[history.storm_id + 1] - 1)
+        season = history.datetime[keep].astype('datetime64[Y]').astype(np.int32) + 1970
+        # Numéro de la tempête dans sa saison (suffixe du nom BASSIN-ANNÉE-NN, sinon son rang)
+        number = np.array([int(match[1]) if (match := re.search(r'(\d+)$', name)) else i + 1
+                           for i, name in enumerate(history.names)], dtype=np.int32)
+        # Coordonnées arrondies (~1 km) et survol en entiers : charge JSON réduite
+        lat, lon, customdata = nan_separated(
+            history.storm_id[keep],
+            np.round(history.lat[keep], 2), np.round(history.lon[keep], 2),
+            np.column_stack([season, number[history.storm_id[keep]], np.rint(history.intensity[keep]).astype(np.int32)])
+        )
+        fig.add_trace(go.Scattermapbox(
+            lat=lat,
+            lon=lon,
+            mode='lines',
+            line=dict(width=1, color='rgba(90, 110, 140, 0.35)'),
+            name=f"Historique ({len(history):,} tempêtes)",
+            customdata=customdata,
+            hovertemplate="Saison %{customdata[0]:.0f} • n°%{customdata[1]:.0f}"
+                          "<br>Intensité: %{customdata[2]:.0f} km/h<extra></extra>"
+        ))
+        
+        # Tempêtes actives : une trace, couleur = intensité
+        storms = self.storm_tracks
+        lat, lon, storm_id, customdata = nan_separated(
+            storms.storm_id, storms.lat, storms.lon, storms.storm_id,
+            np.round(np.column_stack([storms.intensity, storms.pressure]).astype(np.float64), 1)
+        )
+        fig.add_trace(go.Scattermapbox(
+            lat=lat,
+            lon=lon,
+            mode='lines+markers',
+            marker=dict(size=6, color=customdata[:, 0], colorscale='Viridis', cmin=30, cmax=140,
+                        colorbar=dict(title="Intensité (km/h)"), showscale=True),
+            line=dict(width=3, color='red'),
+            name=f"Actives ({len(storms)})",
+            text=np.array(storms.names, dtype=object)[storm_id],
+            customdata=customdata,
+            hovertemplate="%{text}<br>Vitesse: %{customdata[0]:.1f} km/h"
+                          "<br>Pression: %{customdata[1]:.1f} hPa<extra></extra>"
+        ))
+        
+        fig.update_layout(
+            mapbox=dict(storm_map_style(), center=dict(lat=0, lon=float(np.nanmean(storms.lon))), zoom=1),
+            height=550,
+            margin=dict(l=0, r=0, t=0, b=0),
+            legend=dict(x=0, y=1, bgcolor='rgba(255, 255, 255, 0.7)')
+        )
+        return fig
+    
+    def build_storm_intensity_figure(self, storm):
+        """Construit le graphique d'évolution de l'intensité d'une tempête"""
+        fig_intensity = go.Figure(go.Scatter(
+            y=self.storm_tracks.track(storm)['intensity'],
+            mode='lines+markers',
+            line=dict(color='red', width=3),
+            marker=dict(size=6)
+        ))
+        fig_intensity.update_layout(
+            height=200,
+            title="Évolution Intensité",
+            margin=dict(l=0, r=0, t=30, b=0)
+        )
+        return fig_intensity
+    
+    @timed_section()
+    def create_weather_impact_analysis(self):
+        """Analyse d'impact météorologique"""
+        st.markdown("### 📈 Analyse d'Impact Sectoriel")
+        
+        # Impacts par secteur
+        sectors = {
             "Agriculture": {
                 "risk": "Modéré",
                 "impact": "Conditions favorables pour les cultures",
@@ -533,19 +2912,60 @@ class EnhancedWeatherAnalytics:
         # Graphique d'impact cumulatif
         st.markdown("#### 📊 Impact Économique Potentiel")
         
+        fig = get_figure_cache().get_or_build(
+            'impact_matrix', self.data_version,
+            lambda: self.build_impact_matrix_figure(list(sectors.keys()))
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    def figure_rng(self, figure):
+        """Générateur local dérivé de (figure, data_version)
+        
+        L'instantané est partagé entre sessions : les figures ne tirent jamais dans self.rng,
+        qui alimente aussi le générateur synthétique des rafraîchissements.
+        """
+        digest = hashlib.blake2b(f"{figure}:{self.data_version}".encode(), digest_size=8).digest()
+        return np.random.default_rng(int.from_bytes(digest, 'little'))
+    
+    def build_impact_matrix_figure(self, sectors):
+        """Construit la matrice risque-impact par secteur"""
+        import plotly.express as px  # import différé : seul l'onglet Impact l'utilise
+        
+        rng = self.figure_rng('impact_matrix')
         impact_data = pd.DataFrame({
-            'Secteur': list(sectors.keys()),
-            'Impact Potentiel (M€)': np.random.uniform(10, 100, len(sectors)),
-            'Probabilité (%)': np.random.uniform(20, 80, len(sectors))
+            'Secteur': sectors,
+            'Impact Potentiel (M€)': rng.uniform(10, 100, len(sectors)),
+            'Probabilité (%)': rng.uniform(20, 80, len(sectors))
         })
         
-        fig = px.scatter(impact_data, x='Probabilité (%)', y='Impact Potentiel (M€)',
-                        size='Impact Potentiel (M€)', color='Secteur',
-                        hover_name='Secteur', size_max=60,
-                        title="Matrice Risque-Impact par Secteur")
-        
+        return px.scatter(impact_data, x='Probabilité (%)', y='Impact Potentiel (M€)',
+                          size='Impact Potentiel (M€)', color='Secteur',
+                          hover_name='Secteur', size_max=60,
+                          title="Matrice Risque-Impact par Secteur")
+    
+    @timed_section()
+    def create_impact_timeline(self):
+        """Projection d'impact sur 7 jours"""
+        fig = get_figure_cache().get_or_build('impact_timeline', self.data_version,
+                                              self.build_impact_timeline_figure)
         st.plotly_chart(fig, use_container_width=True)
     
+    def build_impact_timeline_figure(self):
+        """Construit le graphique d'impact temporel"""
+        import plotly.express as px
+        
+        rng = self.figure_rng('impact_timeline')
+        impact_timeline = pd.DataFrame({
+            'Date': pd.date_range(start=utc_now(), periods=7, freq='D'),
+            'Impact Agricole': rng.uniform(10, 50, 7),
+            'Impact Transport': rng.uniform(20, 80, 7),
+            'Impact Énergie': rng.uniform(5, 30, 7)
+        })
+        
+        return px.area(impact_timeline, x='Date', y=['Impact Agricole', 'Impact Transport', 'Impact Énergie'],
+                       title="Projection d'Impact sur 7 Jours", labels={'Date': "Date (UTC)"})
+    
+    @timed_section()
     def create_climate_analytics(self):
         """Analytics climatiques avancés"""
         st.markdown("### 🌍 Analytics Climatiques")
@@ -553,49 +2973,26 @@ class EnhancedWeatherAnalytics:
         col1, col2 = st.columns(2)
         
         with col1:
-            # Analyse des tendances long terme
-            st.markdown("#### 📈 Tendances Climatiques")
-            
-            monthly_data = self.weather_data.groupby(
-                self.weather_data['datetime'].dt.to_period('M')
-            ).agg({
-                'temperature': 'mean',
-                'precipitation': 'sum',
-                'wind_speed': 'mean'
-            }).reset_index()
-            
-            monthly_data['datetime'] = monthly_data['datetime'].astype(str)
-            
-            fig = make_subplots(specs=[[{"secondary_y": True}]])
-            
-            fig.add_trace(
-                go.Scatter(x=monthly_data['datetime'], y=monthly_data['temperature'],
-                          name='Température Moyenne', line=dict(color='red', width=3)),
-                secondary_y=False,
-            )
+            # Analyse des tendances long terme
+            st.markdown("#### 📈 Tendances Climatiques")
             
-            fig.add_trace(
-                go.Bar(x=monthly_data['datetime'], y=monthly_data['precipitation'],
-                       name='Précipitations', marker_color='blue', opacity=0.6),
-                secondary_y=True,
-            )
+            choices = ['Auto'] + list(ClimateRollups.LABELS.values())
+            label = st.radio("Résolution:", choices, horizontal=True, key="climate_resolution")
+            resolutions = {value: key for key, value in ClimateRollups.LABELS.items()}
+            resolution = resolutions.get(label) or self.rollups.resolution_for()
             
-            fig.update_layout(
-                title="Tendances Mensuelles",
-                xaxis_title="Mois",
-                height=400
+            fig = get_figure_cache().get_or_build(
+                'climate_trends', self.data_version,
+                lambda: self.build_climate_trends_figure(resolution),
+                resolution=resolution
             )
-            
-            fig.update_yaxes(title_text="Température (°C)", secondary_y=False)
-            fig.update_yaxes(title_text="Précipitations (mm)", secondary_y=True)
-            
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             # Indices climatiques
             st.markdown("#### 🔍 Indices Avancés")
             
-            current = self.weather_data.iloc[-1]
+            current = self.derived.latest(['heat_index'])
             
             indices = [
                 ("🌡️ Indice de Chaleur", current['heat_index'], "°C", 
@@ -613,444 +3010,824 @@ class EnhancedWeatherAnalytics:
             
             # Radar des conditions
             st.markdown("#### 🎯 Conditions Actuelles")
-            categories = ['Température', 'Vent', 'Précipitation', 'Visibilité', 'Humidité']
-            values = [current['temperature']/40, current['wind_speed']/50, 
-                     current['precipitation']/10, current['visibility']/20, current['humidity']/100]
-            
-            fig_radar = go.Figure(data=go.Scatterpolar(
-                r=values,
-                theta=categories,
-                fill='toself',
-                line=dict(color='blue', width=2)
-            ))
-            
-            fig_radar.update_layout(
-                polar=dict(
-                    radialaxis=dict(visible=True, range=[0, 1])
-                ),
-                showlegend=False,
-                height=300,
-                margin=dict(l=50, r=50, t=30, b=30)
-            )
-            
+            fig_radar = get_figure_cache().get_or_build('conditions_radar', self.data_version,
+                                                        self.build_conditions_radar_figure)
             st.plotly_chart(fig_radar, use_container_width=True)
-
-def create_enhanced_ventusky_integration():
-    """Crée l'intégration Ventusky améliorée avec plus de fonctionnalités"""
-    
-    enhanced_ventusky_html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Ventusky Pro+ Intégré</title>
-        <style>
-            * {
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }
-            body {
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                background: linear-gradient(135deg, #1e1e1e 0%, #2d2d2d 100%);
-                color: white;
-            }
-            .browser-container {
-                width: 100%;
-                height: 750px;
-                background: #2d2d2d;
-                border-radius: 16px;
-                overflow: hidden;
-                box-shadow: 0 12px 40px rgba(0,0,0,0.4);
-                border: 1px solid rgba(255,255,255,0.1);
-            }
-            .browser-header {
-                background: linear-gradient(135deg, #3d3d3d 0%, #4d4d4d 100%);
-                padding: 18px 25px;
-                display: flex;
-                align-items: center;
-                gap: 20px;
-                border-bottom: 2px solid rgba(255,255,255,0.1);
-            }
-            .browser-controls {
-                display: flex;
-                gap: 10px;
-            }
-            .control-btn {
-                width: 14px;
-                height: 14px;
-                border-radius: 50%;
-                cursor: pointer;
-                transition: transform 0.2s ease;
-            }
-            .control-btn:hover {
-                transform: scale(1.1);
-            }
-            .close { background: #ff5f57; }
-            .minimize { background: #ffbd2e; }
-            .maximize { background: #28ca42; }
-            .url-display {
-                flex: 1;
-                background: rgba(255,255,255,0.1);
-                border: 2px solid rgba(255,255,255,0.2);
-                border-radius: 25px;
-                padding: 12px 25px;
-                color: white;
-                font-size: 14px;
-                margin: 0 25px;
-                backdrop-filter: blur(10px);
-                transition: all 0.3s ease;
-            }
-            .url-display:focus {
-                border-color: #00aaff;
-                box-shadow: 0 0 20px rgba(0,170,255,0.3);
-            }
-            .browser-actions {
-                display: flex;
-                gap: 15px;
-            }
-            .action-btn {
-                background: linear-gradient(135deg, #00aaff, #0066cc);
-                color: white;
-                border: none;
-                padding: 10px 18px;
-                border-radius: 8px;
-                cursor: pointer;
-                font-size: 14px;
-                font-weight: 600;
-                transition: all 0.3s ease;
-                display: flex;
-                align-items: center;
-                gap: 8px;
-                box-shadow: 0 4px 12px rgba(0,170,255,0.3);
-            }
-            .action-btn:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 6px 20px rgba(0,170,255,0.4);
-            }
-            .action-btn.secondary {
-                background: linear-gradient(135deg, #667eea, #764ba2);
-            }
-            .quick-layers {
-                display: flex;
-                gap: 10px;
-                margin-left: 20px;
-            }
-            .layer-btn {
-                background: rgba(255,255,255,0.1);
-                color: white;
-                border: none;
-                padding: 8px 15px;
-                border-radius: 20px;
-                cursor: pointer;
-                font-size: 12px;
-                transition: all 0.3s ease;
-            }
-            .layer-btn.active {
-                background: #00aaff;
-                box-shadow: 0 0 15px rgba(0,170,255,0.5);
-            }
-            .layer-btn:hover {
-                background: rgba(255,255,255,0.2);
-            }
-            .browser-content {
-                height: calc(100% - 70px);
-                background: white;
-                position: relative;
-            }
-            .ventusky-frame {
-                width: 100%;
-                height: 100%;
-                border: none;
-                transition: opacity 0.3s ease;
-            }
-            .status-bar {
-                background: rgba(0,0,0,0.8);
-                padding: 10px 25px;
-                font-size: 12px;
-                color: #ccc;
-                border-top: 1px solid rgba(255,255,255,0.1);
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-            }
-            .connection-status {
-                display: flex;
-                align-items: center;
-                gap: 8px;
-            }
-            .status-indicator {
-                width: 8px;
-                height: 8px;
-                border-radius: 50%;
-                background: #28ca42;
-                animation: pulse 2s infinite;
-            }
-            @keyframes pulse {
-                0% { opacity: 1; }
-                50% { opacity: 0.5; }
-                100% { opacity: 1; }
-            }
-            .loading-overlay {
-                position: absolute;
-                top: 0;
-                left: 0;
-                width: 100%;
-                height: 100%;
-                background: rgba(0,0,0,0.8);
-                display: none;
-                justify-content: center;
-                align-items: center;
-                z-index: 1000;
-            }
-            .loading-content {
-                text-align: center;
-                color: white;
-            }
-            .spinner {
-                border: 4px solid rgba(255,255,255,0.3);
-                border-top: 4px solid #00aaff;
-                border-radius: 50%;
-                width: 40px;
-                height: 40px;
-                animation: spin 1s linear infinite;
-                margin: 0 auto 15px;
-            }
-            @keyframes spin {
-                0% { transform: rotate(0deg); }
-                100% { transform: rotate(360deg); }
-            }
-        </style>
-    </head>
-    <body>
-        <div class="browser-container">
-            <div class="browser-header">
-                <div class="browser-controls">
-                    <div class="control-btn close"></div>
-                    <div class="control-btn minimize"></div>
-                    <div class="control-btn maximize"></div>
-                </div>
-                
-                <div class="quick-layers">
-                    <button class="layer-btn active" data-layer="wind">💨 Vent</button>
-                    <button class="layer-btn" data-layer="temp">🌡️ Température</button>
-                    <button class="layer-btn" data-layer="prec">🌧️ Précipitation</button>
-                    <button class="layer-btn" data-layer="press">📊 Pression</button>
-                    <button class="layer-btn" data-layer="cloud">☁️ Nuages</button>
-                </div>
-                
-                <div class="url-display" id="urlDisplay">https://www.ventusky.com</div>
-                
-                <div class="browser-actions">
-                    <button class="action-btn" onclick="refreshVentusky()">
-                        <span>🔄</span> Actualiser
-                    </button>
-                    <button class="action-btn" onclick="fullscreenVentusky()">
-                        <span>📺</span> Plein Écran
-                    </button>
-                    <button class="action-btn secondary" onclick="showAnalytics()">
-                        <span>📈</span> Analytics
-                    </button>
-                </div>
-            </div>
-            
-            <div class="browser-content">
-                <div class="loading-overlay" id="loadingOverlay">
-                    <div class="loading-content">
-                        <div class="spinner"></div>
-                        <div>Chargement Ventusky...</div>
-                    </div>
-                </div>
-                
-                <iframe class="ventusky-frame" id="ventuskyFrame" 
-                        src="https://www.ventusky.com"
-                        allowfullscreen></iframe>
-            </div>
-            
-            <div class="status-bar">
-                <span id="statusText">Ventusky Pro+ - Surveillance météo active</span>
-                <div class="connection-status">
-                    <div class="status-indicator"></div>
-                    <span id="connectionStatus">Connecté</span>
-                    <span id="lastUpdate">• Dernière MAJ: <span id="updateTime">--:--:--</span></span>
-                </div>
-            </div>
-        </div>
-
-        <script>
-        let currentLayer = 'wind';
-        let autoRefreshInterval;
-        
-        // Configuration des layers Ventusky
-        const layerConfig = {
-            'wind': '?p=wind',
-            'temp': '?p=temp',
-            'prec': '?p=prec', 
-            'press': '?p=press',
-            'cloud': '?p=cloud',
-            'snow': '?p=snow',
-            'wave': '?p=wave'
-        };
-        
-        function refreshVentusky() {
-            showLoading(true);
-            const frame = document.getElementById('ventuskyFrame');
-            frame.src = frame.src;
-            updateStatus('Actualisation en cours...');
-            
-            setTimeout(() => {
-                showLoading(false);
-                updateLastUpdate();
-                updateStatus('Ventusky actualisé avec succès');
-            }, 3000);
-        }
+    
+    def build_climate_trends_figure(self, resolution='month'):
+        """Construit le graphique des tendances à partir des agrégats pré-calculés"""
+        from plotly.subplots import make_subplots
         
-        function fullscreenVentusky() {
-            const frame = document.getElementById('ventuskyFrame');
-            if (frame.requestFullscreen) {
-                frame.requestFullscreen();
-            } else if (frame.webkitRequestFullscreen) {
-                frame.webkitRequestFullscreen();
-            } else if (frame.msRequestFullscreen) {
-                frame.msRequestFullscreen();
-            }
-            updateStatus('Mode plein écran activé');
-        }
+        period_data = self.rollups.aggregate(resolution, {
+            'temperature': 'mean',
+            'precipitation': 'sum',
+            'wind_speed': 'mean'
+        })
         
-        function switchLayer(layer) {
-            showLoading(true);
-            currentLayer = layer;
-            
-            // Mettre à jour les boutons
-            document.querySelectorAll('.layer-btn').forEach(btn => {
-                btn.classList.remove('active');
-            });
-            event.target.classList.add('active');
-            
-            // Changer la layer
-            const baseUrl = 'https://www.ventusky.com';
-            const frame = document.getElementById('ventuskyFrame');
-            frame.src = baseUrl + layerConfig[layer];
-            
-            updateStatus(`Layer activée: ${getLayerName(layer)}`);
-            
-            setTimeout(() => {
-                showLoading(false);
-            }, 2000);
-        }
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
         
-        function getLayerName(layer) {
-            const names = {
-                'wind': 'Vent',
-                'temp': 'Température',
-                'prec': 'Précipitation',
-                'press': 'Pression',
-                'cloud': 'Nuages',
-                'snow': 'Neige',
-                'wave': 'Vagues'
-            };
-            return names[layer] || layer;
-        }
+        fig.add_trace(
+            go.Scatter(x=period_data['datetime'], y=period_data['temperature'],
+                      name='Température Moyenne', line=dict(color='red', width=3)),
+            secondary_y=False,
+        )
         
-        function showAnalytics() {
-            updateStatus('Ouverture des analytics Ventusky...');
-            // Ici on pourrait ouvrir un modal avec des analytics supplémentaires
-            alert('Fonctionnalité Analytics avancée - En développement');
-        }
+        fig.add_trace(
+            go.Bar(x=period_data['datetime'], y=period_data['precipitation'],
+                   name='Précipitations', marker_color='blue', opacity=0.6),
+            secondary_y=True,
+        )
         
-        function showLoading(show) {
-            const overlay = document.getElementById('loadingOverlay');
-            overlay.style.display = show ? 'flex' : 'none';
-        }
+        fig.update_layout(
+            title=f"Tendances par {ClimateRollups.LABELS[resolution]}",
+            xaxis_title=f"{ClimateRollups.LABELS[resolution]} (UTC)",
+            height=400
+        )
         
-        function updateStatus(message) {
-            document.getElementById('statusText').textContent = message;
-        }
+        fig.update_yaxes(title_text="Température (°C)", secondary_y=False)
+        fig.update_yaxes(title_text="Précipitations (mm)", secondary_y=True)
+        return fig
+    
+    def build_conditions_radar_figure(self):
+        """Construit le radar des conditions actuelles"""
+        current = self.observations.latest()
+        categories = ['Température', 'Vent', 'Précipitation', 'Visibilité', 'Humidité']
+        values = [current['temperature']/40, current['wind_speed']/50, 
+                 current['precipitation']/10, current['visibility']/20, current['humidity']/100]
         
-        function updateLastUpdate() {
-            const now = new Date();
-            document.getElementById('updateTime').textContent = 
-                now.toLocaleTimeString('fr-FR');
-        }
+        fig_radar = go.Figure(data=go.Scatterpolar(
+            r=values,
+            theta=categories,
+            fill='toself',
+            line=dict(color='blue', width=2)
+        ))
         
-        function startAutoRefresh() {
-            // Actualisation automatique toutes les 10 minutes
-            autoRefreshInterval = setInterval(refreshVentusky, 600000);
-        }
+        fig_radar.update_layout(
+            polar=dict(
+                radialaxis=dict(visible=True, range=[0, 1])
+            ),
+            showlegend=False,
+            height=300,
+            margin=dict(l=50, r=50, t=30, b=30)
+        )
+        return fig_radar
+
+# Composant Ventusky statique : le gabarit HTML/JS est servi une fois et l'iframe survit aux reruns
+VENTUSKY_COMPONENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'components', 'ventusky')
+VENTUSKY_LAYERS = {
+    'wind': "💨 Vent",
+    'temp': "🌡️ Température",
+    'prec': "🌧️ Précipitation",
+    'press': "📊 Pression",
+    'cloud': "☁️ Nuages"
+}
+
+_ventusky_component = components.declare_component("ventusky_pro", path=VENTUSKY_COMPONENT_DIR)
+
+def get_ventusky_state():
+    """État Python du composant Ventusky pour la session courante"""
+    return st.session_state.setdefault('ventusky', {'layer': 'wind', 'refresh_token': 0, 'last_event': None})
+
+def request_ventusky_refresh():
+    """Demande au composant de recharger la carte au prochain rendu"""
+    get_ventusky_state()['refresh_token'] += 1
+
+def _on_ventusky_layer_change():
+    get_ventusky_state()['layer'] = st.session_state['ventusky_layer_select']
+
+@timed_section()
+def create_enhanced_ventusky_integration(status=None, auto_refresh_minutes=10):
+    """Affiche l'intégration Ventusky améliorée (composant bidirectionnel persistant)
+    
+    Seuls de petits messages (couche, jeton d'actualisation, statut) transitent entre
+    Python et JS : un rerun ne recharge plus l'iframe ventusky.com.
+    Retourne le nouvel événement envoyé par le composant depuis le dernier rendu, ou None.
+    """
+    state = get_ventusky_state()
+    event = _ventusky_component(
+        layer=state['layer'],
+        refresh_token=state['refresh_token'],
+        status=status,
+        auto_refresh_minutes=auto_refresh_minutes,
+        key="ventusky_component",
+        default=None
+    )
+    
+    # Événement JS -> Python (changement de couche depuis la barre du composant)
+    if not event or event.get('id') == state['last_event']:
+        event = None
+    else:
+        state['last_event'] = event['id']
+        if event.get('type') == 'layer' and event.get('layer') in VENTUSKY_LAYERS:
+            state['layer'] = event['layer']
+    
+    st.session_state['ventusky_layer_select'] = state['layer']
+    st.selectbox("Couche Ventusky:", list(VENTUSKY_LAYERS), format_func=VENTUSKY_LAYERS.get,
+                 key="ventusky_layer_select", on_change=_on_ventusky_layer_change)
+    return event
+
+# Instantanés partagés entre toutes les sessions, rafraîchis en arrière-plan (stale-while-revalidate)
+@st.cache_resource(show_spinner=False)
+def get_process_state():
+    """État partagé par tout le processus
+    
+    Le script étant ré-exécuté à chaque rerun, les variables de module ne persistent pas :
+    les compteurs et registres partagés vivent dans une ressource mise en cache.
+    """
+    return {
+        'lock': threading.Lock(),
+        'live_sessions': {}
+    }
+
+DATA_SOURCES = ["Simulation", "Open-Meteo"]
+REFRESH_RATE_OPTIONS = [1, 5, 10, 15, 30]
+DEFAULT_REFRESH_RATE = 5
+
+DASHBOARD_HEADER_HTML = '<h1 class="main-header">🌪️ Ventusky Pro+ - Analytics Météo Avancées</h1>'
+
+@st.cache_resource(show_spinner=False)
+def get_dashboard_style():
+    """Feuille de style minifiée une fois par processus (réémise à chaque run, mais plus légère)"""
+    css = re.sub(r'/\*.*?\*/', '', DASHBOARD_CSS, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    return re.sub(r'\s*([{};,>])\s*', r'\1', css).strip()
+
+@st.cache_resource(show_spinner=False)
+def get_section_timer():
+    """Chronométrage des sections unique pour tout le processus"""
+    return SectionTimer()
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    """Cache de figures unique pour tout le processus"""
+    return FigureCache()
+
+@st.cache_resource(show_spinner=False)
+def get_weather_provider():
+    """Fournisseur HTTP unique pour tout le processus (sessions et validateurs partagés)"""
+    return WeatherProvider()
+
+ARCHIVE_ROOT = os.environ.get('METEO_ARCHIVE_DIR', os.path.join('data', 'archive'))
+
+@st.cache_resource(show_spinner=False)
+def get_storm_executor():
+    """Pool de processus partagé pour les ensembles de tempêtes (None sur un seul cœur)"""
+    if (os.cpu_count() or 1) < 2:
+        return None
+    return ProcessPoolExecutor(max_workers=os.cpu_count(),
+                               mp_context=multiprocessing.get_context(STORM_EXECUTOR_START_METHOD))
+
+@st.cache_resource(show_spinner=False)
+def get_poi_index():
+    """Index spatial du répertoire de lieux, construit une fois par processus"""
+    if GAZETTEER_PATH and os.path.exists(GAZETTEER_PATH):
+        return PointOfInterestIndex.from_csv(GAZETTEER_PATH)
+    return PointOfInterestIndex.default()
+
+@st.cache_resource(show_spinner=False)
+def get_storm_history():
+    """Trajectoires historiques partagées (générées une fois par processus)"""
+    return historical_storm_tracks(seed=0)
+
+@st.cache_resource(show_spinner=False)
+def get_weather_archive():
+    """Archive sur disque unique pour tout le processus (None si pyarrow est absent)"""
+    return WeatherArchive(ARCHIVE_ROOT) if pa is not None else None
+
+def _build_live_analytics(source, storms=None, previous=None):
+    """Construit les analytics depuis la source temps réel choisie
+    
+    `storms` : tempêtes partagées de la fenêtre. Avec `previous`, l'instantané précédent est
+    prolongé des seules heures nouvelles ;
+    si l'API ne répond plus, un instantané réel précédent reste servi plutôt qu'une simulation.
+    """
+    if source == "Open-Meteo":
+        import requests
         
-        function stopAutoRefresh() {
-            if (autoRefreshInterval) {
-                clearInterval(autoRefreshInterval);
-            }
-        }
+        try:
+            weather_data = get_weather_provider().fetch_location(
+                DEFAULT_LOCATION['latitude'], DEFAULT_LOCATION['longitude'])
+        except (requests.RequestException, KeyError, ValueError):
+            if previous is not None:
+                return previous.refreshed(storms=storms)
+            analytics = EnhancedWeatherAnalytics(storms=storms)
+            analytics.data_source = "Simulation (API indisponible)"
+            return analytics
+        if previous is not None and previous.provider == 'open-meteo':
+            return previous.refreshed(weather_data, storms=storms)
+        analytics = EnhancedWeatherAnalytics(weather_data=weather_data, storms=storms)
+        analytics.data_source = f"Open-Meteo • {DEFAULT_LOCATION['name']}"
+        analytics.provider = 'open-meteo'
+        return analytics
+    
+    if previous is not None:
+        return previous.refreshed(storms=storms)
+    analytics = EnhancedWeatherAnalytics(storms=storms)
+    analytics.data_source = "Simulation"
+    return analytics
+
+STATION_COUNT_OPTIONS = [1, 10, 100, 1000]
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _build_storm_outlook(refresh_rate, window):
+    """Tempêtes et ensembles d'une fenêtre d'actualisation, communs à toutes les stations et sources
+    
+    Tirés d'une graine dérivée de la fenêtre : changer de station ne les modifie pas, et
+    chaque instantané par station ne porte plus que sa propre série.
+    """
+    rng = np.random.default_rng([refresh_rate, window])
+    storm_tracks = simulate_active_storms(rng)
+    return storm_tracks, forecast_active_storms(storm_tracks, rng)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _build_station_network(refresh_rate, window, n_stations):
+    """Réseau de stations partagé d'une fenêtre d'actualisation"""
+    now = utc_now()
+    return StationNetwork.generate(n_stations, now - timedelta(days=14), now + timedelta(days=7))
+
+def _build_shared_analytics(refresh_rate, source, history, station, previous=None):
+    """Construit un instantané d'analytics : données, tempêtes, prédictions et alertes
+    
+    `previous` (rafraîchissement périodique) est prolongé des seules lignes nouvelles au lieu
+    d'être reconstruit ; les instantanés d'archive, figés, sont relus.
+    """
+    window = int(time.time() // (refresh_rate * 60))
+    storms = _build_storm_outlook(refresh_rate, window)
+    archive = get_weather_archive()
+    if history is not None and archive is not None:
+        archived_station, start, end = history
+        weather_data = archive.read_range(archived_station, start, end)
+        if len(weather_data) >= 2:
+            analytics = EnhancedWeatherAnalytics(weather_data=weather_data, storms=storms)
+            analytics.data_source = f"Archive • {archived_station}"
+            analytics.station_id = analytics.alert_region = archived_station
+            analytics.weather_alerts = analytics.generate_weather_alerts()
+            return analytics
+    
+    if station is not None and source == "Simulation":
+        n_stations, station_id = station
+        network = _build_station_network(refresh_rate, window, n_stations)
+        if previous is not None:
+            analytics = previous.refreshed(network.station_frame(station_id), storms=storms)
+        else:
+            analytics = EnhancedWeatherAnalytics(weather_data=network.station_frame(station_id), storms=storms)
+            analytics.station_id = analytics.alert_region = station_id
+            analytics.weather_alerts = analytics.generate_weather_alerts()
+            analytics.data_source = f"Réseau simulé • {station_id}"
+        analytics.stations = network
+    else:
+        analytics = _build_live_analytics(source, storms, previous)
+        analytics.station_id = analytics.provider or 'simulation'
+    
+    if archive is not None and analytics.provider is not None:
+        # Archivage incrémental des seules observations passées du fournisseur (heures UTC) :
+        # ni prévisions, ni données simulées, y compris en repli quand l'API est indisponible
+        observed = analytics.weather_data[analytics.weather_data['datetime'] <= utc_now()]
+        try:
+            archive.append(analytics.provider, observed)
+        except OSError:
+            pass
+    return analytics
+
+class SnapshotPrefetcher:
+    """Rafraîchissement en arrière-plan des instantanés d'analytics (stale-while-revalidate)
+    
+    Les sessions lisent toujours le dernier instantané prêt et n'attendent jamais un
+    rafraîchissement : un unique thread de fond reconstruit les instantanés arrivés à
+    échéance puis les remplace d'un bloc. Seule la première demande d'une configuration
+    est construite de manière synchrone ; les configurations délaissées ne sont plus suivies.
+    Un échec de reconstruction est retenté après un délai doublé à chaque échec
+    (de `retry_delay` jusqu'à une période d'actualisation). Un instantané arrivé à
+    échéance est passé à `build` (`previous=`) pour être prolongé ; après `invalidate`,
+    il est reconstruit entièrement.
+    """
+    
+    def __init__(self, build, max_entries=8, idle_intervals=3, retry_delay=5.0):
+        self._build = build
+        self.max_entries = max_entries
+        self.idle_intervals = idle_intervals
+        self.retry_delay = retry_delay
+        # clé -> {'analytics', 'interval', 'requested_at', 'stale', 'failed', 'retry_at'}
+        self._snapshots = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self.requests = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.failures = 0
+    
+    def get(self, key, interval):
+        """Dernier instantané prêt de `key` ; signale au thread de fond s'il est périmé"""
+        with self._lock:
+            self.requests += 1
+            analytics = self._lookup(key, interval)
+        if analytics is not None:
+            return analytics
         
-        // Événements
-        document.addEventListener('DOMContentLoaded', function() {
-            // Configurer les boutons de layer
-            document.querySelectorAll('.layer-btn').forEach(btn => {
-                btn.addEventListener('click', function() {
-                    const layer = this.getAttribute('data-layer');
-                    switchLayer(layer);
-                });
-            });
-            
-            // Surveillance de la connexion
-            setInterval(() => {
-                const frame = document.getElementById('ventuskyFrame');
-                try {
-                    if (frame.contentWindow && frame.contentWindow.location.href) {
-                        document.getElementById('connectionStatus').textContent = 'Connecté';
-                        document.querySelector('.status-indicator').style.background = '#28ca42';
-                    }
-                } catch (e) {
-                    document.getElementById('connectionStatus').textContent = 'Chargement...';
-                    document.querySelector('.status-indicator').style.background = '#ffbd2e';
-                }
-            }, 5000);
-            
-            // Démarrer l'actualisation automatique
-            startAutoRefresh();
-            updateLastUpdate();
-        });
-        
-        // Raccourcis clavier
-        document.addEventListener('keydown', function(event) {
-            if (event.ctrlKey || event.metaKey) {
-                switch(event.key) {
-                    case 'r':
-                        event.preventDefault();
-                        refreshVentusky();
-                        break;
-                    case 'f':
-                        event.preventDefault();
-                        fullscreenVentusky();
-                        break;
-                }
-            }
-            
-            // Changer de layer avec les chiffres
-            if (event.key >= '1' && event.key <= '6') {
-                const layers = Object.keys(layerConfig);
-                const layerIndex = parseInt(event.key) - 1;
-                if (layerIndex < layers.length) {
-                    const layer = layers[layerIndex];
-                    switchLayer(layer);
-                }
-            }
-        });
-        </script>
-    </body>
-    </html>
+        # Premier accès : aucun instantané à servir, construction synchrone (une à la fois)
+        with self._build_lock:
+            with self._lock:
+                analytics = self._lookup(key, interval)
+            if analytics is None:
+                analytics = self._build(*key)
+                with self._lock:
+                    self.misses += 1
+                    self._store(key, analytics, interval)
+        self._ensure_worker()
+        return analytics
+    
+    def invalidate(self):
+        """Marque tous les instantanés comme périmés ; ils restent servis jusqu'au remplacement"""
+        with self._lock:
+            for entry in self._snapshots.values():
+                entry['stale'] = True
+        self._wakeup.set()
+    
+    def stats(self):
+        with self._lock:
+            return {'requests': self.requests, 'misses': self.misses, 'refreshes': self.refreshes,
+                    'failures': self.failures, 'snapshots': len(self._snapshots)}
+    
+    def _lookup(self, key, interval):
+        entry = self._snapshots.get(key)
+        if entry is None:
+            return None
+        self._snapshots.move_to_end(key)
+        entry['requested_at'] = time.time()
+        entry['interval'] = interval
+        if entry['stale'] or self._age(entry) >= interval:
+            self._wakeup.set()
+        return entry['analytics']
+    
+    def _store(self, key, analytics, interval):
+        entry = self._snapshots.setdefault(key, {'requested_at': time.time(), 'interval': interval})
+        entry.update(analytics=analytics, stale=False, failed=0, retry_at=0.0)
+        self._snapshots.move_to_end(key)
+        while len(self._snapshots) > self.max_entries:
+            self._snapshots.popitem(last=False)
+    
+    @staticmethod
+    def _age(entry):
+        return time.time() - entry['analytics'].built_at
+    
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="analytics-prefetch", daemon=True)
+                self._thread.start()
+    
+    def _due(self):
+        """(clé, instantané à prolonger ou None) à reconstruire et délai avant la prochaine échéance"""
+        now = time.time()
+        due, wait = [], 60.0
+        with self._lock:
+            for key, entry in list(self._snapshots.items()):
+                if now - entry['requested_at'] > self.idle_intervals * entry['interval']:
+                    del self._snapshots[key]  # plus aucune session ne lit cette configuration
+                    continue
+                if entry['retry_at'] > now:
+                    wait = min(wait, entry['retry_at'] - now)  # attente après un échec
+                    continue
+                remaining = entry['interval'] - self._age(entry)
+                if entry['stale'] or remaining <= 0:
+                    due.append((key, None if entry['stale'] else entry['analytics']))
+                else:
+                    wait = min(wait, remaining)
+        return due, max(wait, 1.0)
+    
+    def _run(self):
+        while True:
+            due, wait = self._due()
+            for key, previous in due:
+                try:
+                    analytics = self._build(*key, previous=previous)
+                except Exception:
+                    # L'instantané précédent reste servi ; nouvel essai après un délai exponentiel
+                    with self._lock:
+                        self.failures += 1
+                        entry = self._snapshots.get(key)
+                        if entry is not None:
+                            entry['failed'] += 1
+                            backoff = self.retry_delay * 2 ** (entry['failed'] - 1)
+                            entry['retry_at'] = time.time() + min(backoff, max(entry['interval'], self.retry_delay))
+                    continue
+                with self._lock:
+                    if key in self._snapshots:
+                        self.refreshes += 1
+                        self._store(key, analytics, self._snapshots[key]['interval'])
+            if not due:
+                self._wakeup.wait(timeout=wait)
+                self._wakeup.clear()
+
+@st.cache_resource(show_spinner=False)
+def get_analytics_prefetcher():
+    """Thread de rafraîchissement unique pour tout le processus"""
+    return SnapshotPrefetcher(_build_shared_analytics)
+
+def get_shared_analytics(refresh_rate, source="Simulation", history=None, station=None):
+    """Retourne les analytics partagés de la fenêtre d'actualisation courante
+    
+    Le jeu de données est partagé par toutes les sessions : il ne doit pas être modifié.
+    `history` = (station, début, fin) charge la fenêtre depuis l'archive sur disque ;
+    `station` = (nombre de stations, identifiant) sélectionne une station du réseau simulé.
+    L'instantané peut dater d'au plus une période d'actualisation (plus la durée de sa reconstruction).
     """
-    return enhanced_ventusky_html
+    return get_analytics_prefetcher().get((refresh_rate, source, history, station), refresh_rate * 60)
 
-def main():
-    st.markdown('<h1 class="main-header">🌪️ Ventusky Pro+ - Analytics Météo Avancées</h1>', 
-                unsafe_allow_html=True)
+def get_analytics_cache_stats():
+    """Retourne les compteurs hits/misses des instantanés et les rafraîchissements de fond"""
+    stats = get_analytics_prefetcher().stats()
+    hits = max(stats['requests'] - stats['misses'], 0)
+    return {
+        'hits': hits,
+        'misses': stats['misses'],
+        'hit_rate': hits / stats['requests'] if stats['requests'] else 0.0,
+        'refreshes': stats['refreshes'],
+        'failures': stats['failures']
+    }
+
+def invalidate_shared_analytics():
+    """Demande le rafraîchissement des instantanés (bouton Sync Data) sans bloquer les sessions"""
+    get_analytics_prefetcher().invalidate()
+
+def _warm_up_plotly():
+    import plotly.express  # noqa: F401
+    from plotly.subplots import make_subplots
+    make_subplots(rows=2, cols=1)  # charge les validateurs des traces et de la mise en page
+
+def warm_up():
+    """Pré-construit les caches du processus pour que les premiers clics ne paient pas le démarrage
+    
+    Modules chargés paresseusement (plotly.express, make_subplots et ses validateurs),
+    ressources partagées (moteur de règles, index des lieux, historique des tempêtes, pool de processus)
+    et instantané par défaut du dashboard. Retourne la durée de chaque étape (s).
+    """
+    steps = {
+        'plotly': _warm_up_plotly,
+        'alert_engine': get_alert_engine,
+        'poi_index': get_poi_index,
+        'storm_history': get_storm_history,
+        'storm_executor': get_storm_executor,
+        'analytics': lambda: get_shared_analytics(DEFAULT_REFRESH_RATE)
+    }
+    durations = {}
+    for name, step in steps.items():
+        t0 = time.perf_counter()
+        step()
+        durations[name] = time.perf_counter() - t0
+    return durations
+
+@st.cache_resource(show_spinner=False)
+def start_warm_up():
+    """Lance `warm_up` une seule fois par processus, dans un thread de fond
+    
+    Streamlit n'expose pas de crochet de démarrage du serveur : le préchauffage part
+    du premier rendu du processus, une fois la page affichée, pour ne pas la retarder.
+    """
+    thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+# Planificateur d'actualisation non bloquant : aucune session ne garde de thread en attente
+LIVE_SESSION_GRACE = 60  # secondes de tolérance avant de considérer une session fermée
+
+def register_live_session(interval_seconds):
+    """Enregistre la prochaine échéance d'actualisation de la session courante"""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    now = time.time()
+    state = get_process_state()
+    with state['lock']:
+        live_sessions = state['live_sessions']
+        live_sessions[ctx.session_id] = now + interval_seconds
+        # Purge des sessions qui n'ont pas honoré leur échéance (onglet fermé)
+        for session_id, due in list(live_sessions.items()):
+            if due < now - LIVE_SESSION_GRACE:
+                del live_sessions[session_id]
+
+def unregister_live_session():
+    """Retire la session courante du planificateur"""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    state = get_process_state()
+    with state['lock']:
+        state['live_sessions'].pop(ctx.session_id, None)
+
+def count_waiting_sessions():
+    """Nombre de sessions en attente d'une actualisation planifiée"""
+    now = time.time()
+    state = get_process_state()
+    with state['lock']:
+        return sum(1 for due in state['live_sessions'].values() if due >= now - LIVE_SESSION_GRACE)
+
+def run_live_section(render, refresh_rate, auto_refresh, **analytics_options):
+    """Exécute une section dépendante des données dans un fragment ré-exécuté selon le planning
+    
+    Seul le fragment est relancé à l'échéance, sur le jeu de données partagé le plus récent.
+    """
+    run_every = timedelta(minutes=refresh_rate) if auto_refresh else None
+    
+    def _live_section():
+        if auto_refresh:
+            register_live_session(refresh_rate * 60)
+        render(get_shared_analytics(refresh_rate, **analytics_options))
+    
+    st.fragment(_live_section, run_every=run_every)()
+
+def format_age(seconds):
+    """Âge lisible d'un instantané : « 42 s », « 3 min », « 2 h 05 »"""
+    seconds = max(int(seconds), 0)
+    if seconds < 60:
+        return f"{seconds} s"
+    if seconds < 3600:
+        return f"{seconds // 60} min"
+    return f"{seconds // 3600} h {seconds % 3600 // 60:02d}"
+
+def render_quick_stats(analytics):
+    """Affiche les statistiques rapides de la sidebar et l'âge de l'instantané"""
+    st.caption(f"🕒 Instantané d'il y a {format_age(time.time() - analytics.built_at)}")
+    current_data = analytics.observations.latest()
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("🌡️ Temp", f"{current_data['temperature']:.1f}°C")
+        st.metric("💨 Vent", f"{current_data['wind_speed']:.1f} km/h")
+    with col2:
+        st.metric("📊 Press", f"{current_data['pressure']:.1f} hPa")
+        st.metric("💧 Humid", f"{current_data['humidity']:.1f}%")
+
+def render_live_alerts(analytics):
+    """Affiche les alertes en temps réel et les métriques avancées"""
+    with get_section_timer().section("alert_banners"):
+        alert_level = st.session_state.get('alert_level', "Toutes")
+        alerts = filter_alerts(analytics.weather_alerts, alert_level)
+        for alert in alerts:
+            if alert['severity'] == 'Élevée':
+                st.markdown(f'<div class="alert-critical">🚨 {alert["title"]} - {alert["region"]}<br>{alert["description"]}</div>', 
+                           unsafe_allow_html=True)
+            else:
+                st.markdown(f'<div class="alert-warning">⚠️ {alert["title"]} - {alert["region"]}<br>{alert["description"]}</div>', 
+                           unsafe_allow_html=True)
+        if not alerts and alert_level != "Désactivées":
+            st.markdown('<div class="alert-info">✅ Aucune vigilance en cours ou à venir</div>', unsafe_allow_html=True)
+    
+    analytics.create_advanced_metrics_dashboard()
+    
+    if analytics.stations is not None:
+        render_station_network(analytics.stations)
+
+def render_station_network(network):
+    """Vue d'ensemble du réseau : conditions et tendances de toutes les stations"""
+    summary = network.summary()
+    with st.expander(f"🏢 Réseau de stations ({len(network)} stations • {network.nbytes / 1e6:.1f} Mo)"):
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("🌡️ Température moyenne", f"{summary['temperature'].mean():.1f}°C",
+                      f"{summary['delta_temperature'].mean():+.1f}°C")
+        with col2:
+            st.metric("🔥 Indice Chaleur max", f"{summary['heat_index'].max():.1f}°C",
+                      summary.loc[summary['heat_index'].idxmax(), 'station'], delta_color="off")
+        with col3:
+            st.metric("📉 Stations en baisse de pression", int((summary['delta_pressure'] < -2).sum()))
+        with col4:
+            alerts = network.alerts(get_alert_engine(), after=utc_now())
+            critical = {alert['region'] for alert in alerts if alert['severity'] == 'Élevée'}
+            st.metric("🚨 Stations en vigilance", len({alert['region'] for alert in alerts}),
+                      f"{len(critical)} critique(s)", delta_color="off")
+        st.dataframe(summary.sort_values('heat_index', ascending=False).round(1),
+                     use_container_width=True, hide_index=True, height=300)
+
+def render_storm_center(analytics):
+    """Affiche les analytics tempêtes et les alertes tempêtes actives"""
+    analytics.create_advanced_storm_analytics()
+    
+    st.markdown("#### ⚠️ Alertes Tempêtes Actives")
+    storms = analytics.storm_tracks
+    index = get_poi_index()
+    t0 = time.perf_counter()
+    threats = storm_threats(storms, analytics.storm_ensembles, index)
+    query_ms = (time.perf_counter() - t0) * 1000
+    
+    for i, name in enumerate(storms.names):
+        threatened = threats[threats['storm'] == name]
+        threat = storms.current_threat[i]
+        if threat != 'Élevé' and threatened.empty:
+            continue
+        # Villes d'abord, puis par échéance d'exposition
+        threatened = threatened.sort_values(['kind', 'lead_hours', 'distance_km'], key=lambda column:
+                                            column.ne('Ville') if column.name == 'kind' else column)
+        places = ", ".join(
+            f"{row.location} ({'maintenant' if row.lead_hours == 0 else f'+{row.lead_hours:.0f} h'}, {row.distance_km:.0f} km)"
+            for row in threatened.head(4).itertuples()
+        )
+        if len(threatened) > 4:
+            places += f" et {len(threatened) - 4} autre(s)"
+        css_class, icon = ('alert-critical', '🚨') if threat == 'Élevé' else ('alert-warning', '⚠️')
+        st.markdown(f'<div class="{css_class}">{icon} {name} - Menace {threat}<br>'
+                    f'Intensité: {analytics.storm_ensembles[name]["start_intensity"]:.1f} km/h<br>'
+                    f'Lieux menacés: {places or "aucun lieu répertorié"}</div>', unsafe_allow_html=True)
+    
+    if threats.empty:
+        st.success("✅ Aucun lieu répertorié dans le rayon d'une tempête")
+    st.caption(f"📍 {len(threats)} lieu(x) exposé(s) sur {len(index):,} répertoriés • recherche {query_ms:.1f} ms")
+
+def render_tab_ventusky(analytics, live):
+    """Onglet Ventusky Pro+ : alertes, métriques et carte interactive"""
+    st.markdown("### 💨 Ventusky Pro+ - Interface Avancée")
+    
+    # Alertes en temps réel et métriques avancées
+    run_live_section(render_live_alerts, **live)
+    
+    # Intégration Ventusky améliorée
+    st.markdown("#### 🗺️ Interface Ventusky Pro+")
+    ventusky_event = create_enhanced_ventusky_integration(
+        status=f"Ventusky Pro+ - {len(filter_alerts(analytics.weather_alerts, st.session_state.get('alert_level')))} alerte(s) active(s) • {analytics.data_source}"
+    )
+    if ventusky_event and ventusky_event.get('type') == 'analytics':
+        st.info("Fonctionnalité Analytics avancée - En développement")
+    
+    # Panel de contrôle rapide
+    st.markdown("#### 🎮 Contrôles Rapides")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        if st.button("🔄 Sync Data", use_container_width=True):
+            invalidate_shared_analytics()
+            request_ventusky_refresh()
+            st.rerun()
+    with col2:
+        if st.button("📊 Export", use_container_width=True):
+            st.session_state['export_open'] = not st.session_state.get('export_open', False)
+    with col3:
+        if st.button("📱 Mobile View", use_container_width=True):
+            st.info("Vue mobile activée")
+    with col4:
+        if st.button("⚙️ Settings", use_container_width=True):
+            st.info("Paramètres ouverts")
+
+    if st.session_state.get('export_open'):
+        render_export_panel(analytics)
+
+def render_export_panel(analytics):
+    """Export de la période et des variables choisies, écrit par morceaux dans des fichiers temporaires"""
+    observed = analytics.observations.variables
+    variables = observed + [name for name in DERIVED_VARIABLES if name not in observed]
+    times = analytics.observations.times()
+    first, last = pd.Timestamp(times[0]).date(), pd.Timestamp(times[-1]).date()
+    formats = list(EXPORT_FORMATS) if pa is not None else ['CSV']
+    
+    with st.expander("📊 Export des données", expanded=True):
+        col1, col2 = st.columns(2)
+        with col1:
+            period = st.date_input("Période:", value=(first, last), min_value=first, max_value=last,
+                                   key="export_period")
+            selected = st.multiselect("Variables:", variables, key="export_variables",
+                                      default=['temperature', 'humidity', 'pressure', 'wind_speed', 'precipitation'])
+        with col2:
+            export_format = st.selectbox("Format:", formats, key="export_format")
+            compressions = EXPORT_FORMATS[export_format]['compressions'] if pa is not None else [None, 'gzip']
+            compression = st.selectbox("Compression:", compressions, key="export_compression",
+                                       format_func=lambda codec: codec or "Aucune")
+            all_stations = analytics.stations is not None and st.checkbox(
+                f"Toutes les stations ({len(analytics.stations)})", key="export_all_stations")
+        
+        if st.button("⚙️ Générer le fichier", disabled=not selected or len(period) != 2):
+            start = pd.Timestamp(period[0])
+            end = pd.Timestamp(period[1]) + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')
+            source = analytics.stations if all_stations else analytics.derived
+            stem = f"meteo_{'reseau' if all_stations else analytics.station_id}_{period[0]:%Y%m%d}_{period[1]:%Y%m%d}"
+            name = export_file_name(stem, export_format, compression)
+            sweep_stale_exports()
+            
+            t0 = time.perf_counter()
+            with st.spinner("Export en cours..."):
+                parts = write_export_parts(source.iter_chunks(start, end, selected),
+                                           functools.partial(new_export_path, name), export_format, compression)
+            previous = st.session_state.get('export_file')
+            if previous:
+                for part in previous['parts']:
+                    if os.path.exists(part['path']):
+                        os.remove(part['path'])
+            if len(parts) > 1:
+                names = [export_file_name(f"{stem}_partie{i:02d}", export_format, compression)
+                         for i in range(1, len(parts) + 1)]
+            else:
+                names = [name]
+            st.session_state['export_file'] = dict(
+                name=name, mime=EXPORT_FORMATS[export_format]['mime'], seconds=time.perf_counter() - t0,
+                parts=[dict(path=path, name=part_name, rows=rows) for (path, rows), part_name in zip(parts, names)]
+            )
+        
+        export = st.session_state.get('export_file')
+        if export and all(os.path.exists(part['path']) for part in export['parts']):
+            rows = sum(part['rows'] for part in export['parts'])
+            if rows == 0:
+                st.warning("Aucune donnée sur la période sélectionnée")
+            else:
+                size = sum(os.path.getsize(part['path']) for part in export['parts'])
+                n_parts = len(export['parts'])
+                st.caption(f"{export['name']} • {rows:,} lignes • {size / 1e6:.1f} Mo"
+                           f"{f' en {n_parts} parties' if n_parts > 1 else ''} • généré en {export['seconds']:.2f} s")
+                for part in export['parts']:
+                    label = f"⬇️ {part['name']}" if n_parts > 1 else "⬇️ Télécharger"
+                    st.download_button(label, functools.partial(read_export, part['path']),
+                                       file_name=part['name'], mime=export['mime'],
+                                       key=f"export_download_{part['name']}", use_container_width=True)
+
+def render_tab_ai(analytics, live):
+    """Onglet IA Analytics"""
+    st.markdown("### 🧠 Intelligence Artificielle Météo")
+    run_live_section(EnhancedWeatherAnalytics.create_ai_weather_analysis, **live)
+    
+    # Insights supplémentaires
+    st.markdown("#### 🔍 Détection d'Anomalies Avancée")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("##### 📊 Modèles de Comportement")
+        for behavior, status, icon in analytics.anomaly_detector.behaviors():
+            st.write(f"{icon} {behavior}: {status}")
+    
+    with col2:
+        st.markdown("##### 🎯 Recommandations IA")
+        recommendations = [
+            "Surveiller l'évolution de la pression",
+            "Prévoir une augmentation des précipitations sous 24h",
+            "Conditions favorables pour l'énergie éolienne",
+            "Risque de brouillard matinal modéré"
+        ]
+        
+        for rec in recommendations:
+            st.write(f"• {rec}")
+
+def render_tab_storms(analytics, live):
+    """Onglet Storm Center"""
+    st.markdown("### 🌀 Centre de Surveillance des Tempêtes")
+    run_live_section(render_storm_center, **live)
+
+def render_tab_impact(analytics, live):
+    """Onglet Impact Analysis"""
+    st.markdown("### 📈 Analyse d'Impact Économique")
+    analytics.create_weather_impact_analysis()
     
-    # Initialisation des analytics avancés
-    analytics = EnhancedWeatherAnalytics()
+    # Graphique d'impact temporel
+    st.markdown("#### 📅 Impact Temporel")
+    analytics.create_impact_timeline()
+
+def render_tab_climate(analytics, live):
+    """Onglet Climate Analytics"""
+    st.markdown("### 🌍 Analytics Climatiques Avancés")
+    run_live_section(EnhancedWeatherAnalytics.create_climate_analytics, **live)
+    
+    # Indices climatiques globaux
+    st.markdown("#### 🌡️ Indices Climatiques Globaux")
+    indices = [
+        ("Indice de Réchauffement", "+1.2°C", "📈"),
+        ("Anomalie de Précipitation", "+5%", "🌧️"),
+        ("Fréquence des Événements Extrêmes", "+15%", "⚠️"),
+        ("Niveau de la Mer", "+3.2 mm/an", "🌊")
+    ]
+    
+    cols = st.columns(4)
+    for idx, (name, value, icon) in enumerate(indices):
+        with cols[idx]:
+            st.metric(f"{icon} {name}", value)
+
+def render_performance_panel(timer):
+    """Bloc Performance de la sidebar : histogrammes par section et exports"""
+    st.markdown("---")
+    st.markdown("## ⏱️ Performance")
+    summary = timer.summary()
+    if not summary:
+        st.caption("Aucune mesure pour le moment")
+        return
+    
+    st.dataframe(
+        pd.DataFrame(summary).set_index('section').round(1),
+        use_container_width=True
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("JSONL", timer.to_jsonl(), file_name="performance.jsonl",
+                           mime="application/x-ndjson", use_container_width=True)
+    with col2:
+        st.download_button("Prometheus", timer.to_prometheus(), file_name="performance.prom",
+                           mime="text/plain", use_container_width=True)
+
+# Onglets du dashboard, dans l'ordre d'affichage
+DASHBOARD_TABS = {
+    "🗺️ Ventusky Pro+": render_tab_ventusky,
+    "🧠 IA Analytics": render_tab_ai,
+    "🌀 Storm Center": render_tab_storms,
+    "📈 Impact Analysis": render_tab_impact,
+    "🌍 Climate Analytics": render_tab_climate
+}
+
+def main():
+    st.markdown(get_dashboard_style(), unsafe_allow_html=True)
+    st.markdown(DASHBOARD_HEADER_HTML, unsafe_allow_html=True)
     
     # Sidebar avancée
     with st.sidebar:
@@ -1064,159 +3841,98 @@ def main():
         )
         
         auto_refresh = st.checkbox("🔄 Actualisation Auto", value=True)
-        refresh_rate = st.select_slider("Fréquence:", options=[1, 5, 10, 15, 30], value=5)
+        refresh_rate = st.select_slider("Fréquence:", options=REFRESH_RATE_OPTIONS, value=DEFAULT_REFRESH_RATE)
+        data_source = st.selectbox("🛰️ Source des données:", DATA_SOURCES, index=0)
+        
+        station = None
+        if data_source == "Simulation":
+            n_stations = st.select_slider("🏢 Stations du réseau:", options=STATION_COUNT_OPTIONS, value=1)
+            if n_stations > 1:
+                station = (n_stations, st.selectbox("📍 Station:", station_ids(n_stations)))
+        
+        history = None
+        if analysis_mode == "Historique":
+            archive = get_weather_archive()
+            archived_stations = archive.stations() if archive is not None else []
+            if archived_stations:
+                history_station = st.selectbox("🗄️ Station archivée:", archived_stations)
+                archived_days = archive.days(history_station)
+                history_range = st.date_input(
+                    "Période:",
+                    value=(max(archived_days[0], archived_days[-1] - timedelta(days=30)), archived_days[-1]),
+                    min_value=archived_days[0],
+                    max_value=archived_days[-1]
+                )
+                if len(history_range) == 2:
+                    history = (history_station,
+                               pd.Timestamp(history_range[0]),
+                               pd.Timestamp(history_range[1]) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1))
+            else:
+                st.info("Aucun historique archivé pour le moment")
         
         st.markdown("### ⚠️ System Alerts")
         alert_level = st.radio(
             "Niveau d'alerte:",
-            ["Toutes", "Critiques seulement", "Désactivées"],
-            index=0
+            list(ALERT_LEVELS),
+            index=0,
+            key="alert_level"
         )
         
+        st.select_slider("🖥️ Points par courbe:", options=LOD_POINT_OPTIONS,
+                         value=MAX_POINTS_PER_TRACE, key="lod_max_points")
+        
         st.markdown("### 🔧 Advanced Features")
         ai_analysis = st.checkbox("🧠 Analyse IA", value=True)
         storm_tracking = st.checkbox("🌀 Suivi Tempêtes", value=True)
         impact_analysis = st.checkbox("📈 Analyse d'Impact", value=True)
+        lazy_tabs = st.checkbox("⚡ Calculer l'onglet actif uniquement", value=True)
+        show_performance = st.checkbox("⏱️ Performance", value=False)
+    
+    # Initialisation des analytics avancés (partagés entre sessions)
+    timer = get_section_timer()
+    with timer.section("load_analytics"):
+        analytics = get_shared_analytics(refresh_rate, source=data_source, history=history, station=station)
+    
+    with st.sidebar:
+        st.caption(f"🛰️ Données: {analytics.data_source}")
+        cache_stats = get_analytics_cache_stats()
+        st.caption(f"🗄️ Cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                   f"({cache_stats['hit_rate']*100:.0f}%) • {cache_stats['refreshes']} rafraîchissement(s) en fond")
+        figure_stats = get_figure_cache().stats()
+        st.caption(f"🖼️ Figures: {figure_stats['hits']} hits / {figure_stats['misses']} misses "
+                   f"({figure_stats['hit_rate']*100:.0f}%)")
+        if auto_refresh:
+            st.caption(f"⏱️ Sessions en attente d'actualisation: {count_waiting_sessions()}")
         
         st.markdown("---")
         st.markdown("## 📈 Quick Stats")
-        
-        current_data = analytics.weather_data.iloc[-1]
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric("🌡️ Temp", f"{current_data['temperature']:.1f}°C")
-            st.metric("💨 Vent", f"{current_data['wind_speed']:.1f} km/h")
-        with col2:
-            st.metric("📊 Press", f"{current_data['pressure']:.1f} hPa")
-            st.metric("💧 Humid", f"{current_data['humidity']:.1f}%")
-    
-    # Navigation par onglets principale améliorée
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "🗺️ Ventusky Pro+", 
-        "🧠 IA Analytics", 
-        "🌀 Storm Center",
-        "📈 Impact Analysis", 
-        "🌍 Climate Analytics"
-    ])
+        run_live_section(render_quick_stats, refresh_rate, auto_refresh, source=data_source,
+                         history=history, station=station)
     
-    with tab1:
-        st.markdown("### 💨 Ventusky Pro+ - Interface Avancée")
-        
-        # Alertes en temps réel
-        for alert in analytics.weather_alerts:
-            if alert['severity'] == 'Élevée':
-                st.markdown(f'<div class="alert-critical">🚨 {alert["title"]} - {alert["region"]}<br>{alert["description"]}</div>', 
-                           unsafe_allow_html=True)
-            else:
-                st.markdown(f'<div class="alert-warning">⚠️ {alert["title"]} - {alert["region"]}<br>{alert["description"]}</div>', 
-                           unsafe_allow_html=True)
-        
-        # Métriques avancées
-        analytics.create_advanced_metrics_dashboard()
-        
-        # Intégration Ventusky améliorée
-        st.markdown("#### 🗺️ Interface Ventusky Pro+")
-        ventusky_html = create_enhanced_ventusky_integration()
-        html(ventusky_html, height=800, scrolling=False)
-        
-        # Panel de contrôle rapide
-        st.markdown("#### 🎮 Contrôles Rapides")
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            if st.button("🔄 Sync Data", use_container_width=True):
-                st.rerun()
-        with col2:
-            if st.button("📊 Export", use_container_width=True):
-                st.success("Données exportées avec succès")
-        with col3:
-            if st.button("📱 Mobile View", use_container_width=True):
-                st.info("Vue mobile activée")
-        with col4:
-            if st.button("⚙️ Settings", use_container_width=True):
-                st.info("Paramètres ouverts")
+    live = dict(refresh_rate=refresh_rate, auto_refresh=auto_refresh, source=data_source,
+                history=history, station=station)
     
-    with tab2:
-        st.markdown("### 🧠 Intelligence Artificielle Météo")
-        analytics.create_ai_weather_analysis()
-        
-        # Insights supplémentaires
-        st.markdown("#### 🔍 Détection d'Anomalies Avancée")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("##### 📊 Modèles de Comportement")
-            behaviors = [
-                ("Cycle diurne", "Normal", "✅"),
-                ("Pression atmosphérique", "Légère baisse", "⚠️"),
-                ("Modèles de vent", "Stable", "✅"),
-                ("Humidité relative", "Augmentation", "🔍")
-            ]
-            
-            for behavior, status, icon in behaviors:
-                st.write(f"{icon} {behavior}: {status}")
-        
-        with col2:
-            st.markdown("##### 🎯 Recommandations IA")
-            recommendations = [
-                "Surveiller l'évolution de la pression",
-                "Prévoir une augmentation des précipitations sous 24h",
-                "Conditions favorables pour l'énergie éolienne",
-                "Risque de brouillard matinal modéré"
-            ]
-            
-            for rec in recommendations:
-                st.write(f"• {rec}")
-    
-    with tab3:
-        st.markdown("### 🌀 Centre de Surveillance des Tempêtes")
-        analytics.create_advanced_storm_analytics()
-        
-        # Alertes tempêtes en temps réel
-        st.markdown("#### ⚠️ Alertes Tempêtes Actives")
-        for storm in analytics.storm_tracks:
-            if storm['current_threat'] == 'Élevé':
-                st.markdown(f'<div class="alert-critical">🚨 {storm["name"]} - Menace Élevée<br>Intensité: {storm["track"][-1]["intensity"]:.1f} km/h</div>', 
-                           unsafe_allow_html=True)
+    # Navigation principale : seul l'onglet actif est calculé en mode paresseux
+    if lazy_tabs:
+        active_tab = st.radio("Navigation:", list(DASHBOARD_TABS), horizontal=True,
+                              key="active_tab", label_visibility="collapsed")
+        with timer.section(f"tab:{active_tab}"):
+            DASHBOARD_TABS[active_tab](analytics, live)
+    else:
+        for (label, render_tab), tab in zip(DASHBOARD_TABS.items(), st.tabs(list(DASHBOARD_TABS))):
+            with tab, timer.section(f"tab:{label}"):
+                render_tab(analytics, live)
     
-    with tab4:
-        st.markdown("### 📈 Analyse d'Impact Économique")
-        analytics.create_weather_impact_analysis()
-        
-        # Graphique d'impact temporel
-        st.markdown("#### 📅 Impact Temporel")
-        impact_timeline = pd.DataFrame({
-            'Date': pd.date_range(start=datetime.now(), periods=7, freq='D'),
-            'Impact Agricole': np.random.uniform(10, 50, 7),
-            'Impact Transport': np.random.uniform(20, 80, 7),
-            'Impact Énergie': np.random.uniform(5, 30, 7)
-        })
-        
-        fig = px.area(impact_timeline, x='Date', y=['Impact Agricole', 'Impact Transport', 'Impact Énergie'],
-                     title="Projection d'Impact sur 7 Jours")
-        st.plotly_chart(fig, use_container_width=True)
+    if show_performance:
+        with st.sidebar:
+            render_performance_panel(timer)
     
-    with tab5:
-        st.markdown("### 🌍 Analytics Climatiques Avancés")
-        analytics.create_climate_analytics()
-        
-        # Indices climatiques globaux
-        st.markdown("#### 🌡️ Indices Climatiques Globaux")
-        indices = [
-            ("Indice de Réchauffement", "+1.2°C", "📈"),
-            ("Anomalie de Précipitation", "+5%", "🌧️"),
-            ("Fréquence des Événements Extrêmes", "+15%", "⚠️"),
-            ("Niveau de la Mer", "+3.2 mm/an", "🌊")
-        ]
-        
-        cols = st.columns(4)
-        for idx, (name, value, icon) in enumerate(indices):
-            with cols[idx]:
-                st.metric(f"{icon} {name}", value)
+    # Actualisation automatique : les fragments sont relancés par le planificateur, sans thread bloqué
+    if not auto_refresh:
+        unregister_live_session()
     
-    # Actualisation automatique
-    if auto_refresh:
-        time.sleep(refresh_rate * 60)
-        st.rerun()
+    # Après le premier rendu, pré-construction en fond de ce que les autres onglets utiliseront
+    start_warm_up()
 
 if __name__ == "__main__":
     main()
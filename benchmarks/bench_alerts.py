@@ -0,0 +1,70 @@
+"""Benchmark du moteur de règles de vigilance : des centaines de règles sur un réseau de stations.
+
+Les règles de base sont déclinées sur une grille de seuils pour atteindre le nombre demandé.
+
+Usage :
+    python benchmarks/bench_alerts.py --rules 300 --stations 2000 --days 7
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta  # noqa: E402
+
+from app import WEATHER_ALERT_RULES, AlertRuleEngine, StationNetwork, parse_condition  # noqa: E402
+
+
+def scaled_rules(n_rules):
+    """`n_rules` règles obtenues en décalant les seuils des règles de base"""
+    rules = []
+    for i in range(n_rules):
+        rule = dict(WEATHER_ALERT_RULES[i % len(WEATHER_ALERT_RULES)])
+        factor = 1 + 0.02 * (i // len(WEATHER_ALERT_RULES))
+        rule['condition'] = ' and '.join(f"{variable} {operator} {threshold * factor:g}"
+                                         for variable, operator, threshold in parse_condition(rule['condition']))
+        rules.append(rule)
+    return rules
+
+
+def run(n_rules, n_stations, days, seed):
+    now = datetime.now()
+    network = StationNetwork.generate(n_stations, now - timedelta(days=days), now, seed=seed)
+
+    t0 = time.perf_counter()
+    engine = AlertRuleEngine(scaled_rules(n_rules))
+    compile_seconds = time.perf_counter() - t0
+
+    values = {variable: network._block(variable, slice(None)) for variable in engine.variables}
+    t0 = time.perf_counter()
+    intervals = engine.evaluate(network.times, values)
+    seconds = time.perf_counter() - t0
+
+    cells = n_rules * n_stations * len(network.times)
+    return {
+        'rules': n_rules,
+        'stations': n_stations,
+        'times': len(network.times),
+        'compile_ms': round(compile_seconds * 1000, 3),
+        'evaluate_s': round(seconds, 3),
+        'cells_per_second': int(cells / seconds),
+        'intervals': len(intervals)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rules', type=int, default=300)
+    parser.add_argument('--stations', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for key, value in run(args.rules, args.stations, args.days, args.seed).items():
+        print(f"{key:>20}: {value}")
+
+
+if __name__ == '__main__':
+    main()
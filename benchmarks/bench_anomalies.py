@@ -0,0 +1,55 @@
+"""Benchmark du détecteur d'anomalies en ligne sur un réseau de stations à cadence minute.
+
+Usage :
+    python benchmarks/bench_anomalies.py --stations 5000 --minutes 1440
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from app import SyntheticWeatherGenerator, StreamingAnomalyDetector  # noqa: E402
+
+VARIABLES = ['temperature', 'humidity', 'pressure', 'wind_speed']
+
+
+def run(n_stations, n_minutes, seed):
+    generator = SyntheticWeatherGenerator(seed=seed, n_stations=n_stations)
+    block = generator.generate_block(np.arange(n_minutes) / 60)
+    values = np.stack([block[name] for name in VARIABLES], axis=-1)  # stations × minutes × variables
+    times = np.datetime64('2024-01-01T00:00') + np.arange(n_minutes).astype('timedelta64[m]')
+
+    detector = StreamingAnomalyDetector(n_stations, VARIABLES)
+    t0 = time.perf_counter()
+    for i, timestamp in enumerate(times):
+        detector.update(timestamp, values[:, i, :])
+    seconds = time.perf_counter() - t0
+
+    samples = n_stations * n_minutes * len(VARIABLES)
+    return {
+        'stations': n_stations,
+        'minutes': n_minutes,
+        'seconds': round(seconds, 3),
+        'update_ms': round(seconds / n_minutes * 1000, 3),
+        'samples_per_second': int(samples / seconds),
+        'events': len(detector.events)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stations', type=int, default=5000)
+    parser.add_argument('--minutes', type=int, default=1440)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for key, value in run(args.stations, args.minutes, args.seed).items():
+        print(f"{key:>20}: {value}")
+
+
+if __name__ == '__main__':
+    main()
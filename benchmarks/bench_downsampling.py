@@ -0,0 +1,71 @@
+"""Benchmark du niveau de détail : taille JSON et temps de sérialisation avant/après.
+
+Usage :
+    python benchmarks/bench_downsampling.py --days 365 --freq h --max-points 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import plotly.graph_objects as go  # noqa: E402
+
+from app import DerivedVariables, ObservationRingBuffer, SyntheticWeatherGenerator, level_of_detail  # noqa: E402
+
+COLUMNS = ['temperature', 'pressure', 'heat_index', 'dew_point']
+
+
+def build_figure(series):
+    fig = go.Figure()
+    for column, (x, y) in series.items():
+        fig.add_trace(go.Scatter(x=x, y=y, name=column))
+    return fig
+
+
+def measure(series):
+    t0 = time.perf_counter()
+    payload = build_figure(series).to_json()
+    return len(payload), time.perf_counter() - t0
+
+
+def run(days, freq, max_points, method):
+    start = np.datetime64('2024-01-01T00:00')
+    observed = SyntheticWeatherGenerator(seed=42).generate_frame(start, start + np.timedelta64(days, 'D'), freq=freq)
+    frame = DerivedVariables(ObservationRingBuffer.from_frame(observed)).frame(COLUMNS)
+
+    raw = {column: (frame['datetime'].to_numpy(), frame[column].to_numpy()) for column in COLUMNS}
+    raw_bytes, raw_seconds = measure(raw)
+
+    t0 = time.perf_counter()
+    reduced = level_of_detail(frame, COLUMNS, max_points=max_points, method=method)
+    downsample_seconds = time.perf_counter() - t0
+    lod_bytes, lod_seconds = measure(reduced)
+
+    return {
+        'points_per_trace': len(frame),
+        'raw_json_mb': round(raw_bytes / 1e6, 2),
+        'raw_serialize_seconds': round(raw_seconds, 3),
+        'lod_points_per_trace': len(reduced[COLUMNS[0]][0]),
+        'lod_json_mb': round(lod_bytes / 1e6, 3),
+        'lod_downsample_seconds': round(downsample_seconds, 3),
+        'lod_serialize_seconds': round(lod_seconds, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--freq', default='h')
+    parser.add_argument('--max-points', type=int, default=2000)
+    parser.add_argument('--method', choices=['lttb', 'minmax'], default='lttb')
+    args = parser.parse_args()
+
+    for key, value in run(args.days, args.freq, args.max_points, args.method).items():
+        print(f"{key:>24}: {value}")
+
+
+if __name__ == '__main__':
+    main()
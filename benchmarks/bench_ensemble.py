@@ -0,0 +1,111 @@
+"""Benchmark des ensembles Monte-Carlo de tempêtes, en série et sur un pool de processus.
+
+Usage :
+    python benchmarks/bench_ensemble.py --storms 30 --members 10000 --workers 4
+    python benchmarks/bench_ensemble.py --calibrate   # seuil PARALLEL_ENSEMBLE_MIN_MEMBERS
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import STORM_EXECUTOR_START_METHOD, StormTrackStore, forecast_storm_ensembles  # noqa: E402
+
+
+def make_store(n_storms, seed):
+    names = [f"{basin}-{i:03d}" for i, basin in zip(range(n_storms), ['ATLANTIC', 'PACIFIC', 'INDIAN'] * n_storms)]
+    return StormTrackStore.generate(names, rng=seed)
+
+
+def make_executor(workers):
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(STORM_EXECUTOR_START_METHOD))
+
+
+def timed(function, repeat=5):
+    """Médiane des durées de `repeat` appels (secondes)"""
+    durations = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - t0)
+    return statistics.median(durations)
+
+
+def run(n_storms, n_members, n_steps, workers, seed):
+    store = make_store(n_storms, seed)
+
+    t0 = time.perf_counter()
+    forecast_storm_ensembles(store, n_members=n_members, n_steps=n_steps, seed=seed)
+    serial_seconds = time.perf_counter() - t0
+
+    results = {
+        'storms': n_storms,
+        'members': n_members,
+        'points': n_storms * n_members * n_steps,
+        'serial_seconds': round(serial_seconds, 3)
+    }
+    if workers > 1:
+        with make_executor(workers) as executor:
+            forecast_storm_ensembles(store, n_members=10, executor=executor, parallel_min_members=0)  # démarrage
+            t0 = time.perf_counter()
+            forecast_storm_ensembles(store, n_members=n_members, n_steps=n_steps, seed=seed, executor=executor,
+                                     parallel_min_members=0)
+            results['pool_seconds'] = round(time.perf_counter() - t0, 3)
+        results['speedup'] = round(serial_seconds / results['pool_seconds'], 2)
+    return results
+
+
+def calibrate(n_storms, n_steps, workers, seed):
+    """Seuil de parallélisation : coût fixe d'un passage par le pool rapporté au gain par membre
+
+    Le coût fixe (envoi des tâches, retour des résultats) est mesuré avec un seul processus de
+    travail, où le pool ne peut rien gagner ; le gain par membre suppose `workers` cœurs
+    réellement disponibles.
+    """
+    store = make_store(n_storms, seed)
+    small, large = 100, 5000
+    serial_small = timed(lambda: forecast_storm_ensembles(store, n_members=small, n_steps=n_steps, seed=seed))
+    serial_large = timed(lambda: forecast_storm_ensembles(store, n_members=large, n_steps=n_steps, seed=seed))
+    per_member = (serial_large - serial_small) / ((large - small) * n_storms)
+    with make_executor(1) as executor:
+        forecast_storm_ensembles(store, n_members=10, executor=executor, parallel_min_members=0)
+        pooled_small = timed(lambda: forecast_storm_ensembles(store, n_members=small, n_steps=n_steps, seed=seed,
+                                                              executor=executor, parallel_min_members=0))
+    overhead = max(pooled_small - serial_small, 0.0)
+    parallelism = max(min(workers, n_storms), 2)
+    threshold = overhead / (per_member * (1 - 1 / parallelism))
+    return {
+        'start_method': STORM_EXECUTOR_START_METHOD,
+        'storms': n_storms,
+        'us_per_member': round(per_member * 1e6, 2),
+        'pool_overhead_ms': round(overhead * 1e3, 2),
+        'parallelism': parallelism,
+        'min_members': int(round(threshold, -2))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--storms', type=int, default=30)
+    parser.add_argument('--members', type=int, default=10_000)
+    parser.add_argument('--steps', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--calibrate', action='store_true', help="mesure le seuil de parallélisation (3 tempêtes)")
+    args = parser.parse_args()
+
+    if args.calibrate:
+        results = calibrate(3, args.steps, args.workers, args.seed)
+    else:
+        results = run(args.storms, args.members, args.steps, args.workers, args.seed)
+    for key, value in results.items():
+        print(f"{key:>16}: {value}")
+
+
+if __name__ == '__main__':
+    main()
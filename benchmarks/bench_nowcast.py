@@ -0,0 +1,61 @@
+"""Benchmark du moteur de prévision immédiate (Holt-Winters) : ajustement, mise à jour et prévision.
+
+Usage :
+    python benchmarks/bench_nowcast.py --stations 1,100,1000,5000 --days 14
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from app import HoltWintersNowcaster, SyntheticWeatherGenerator  # noqa: E402
+
+VARIABLES = ['temperature', 'humidity', 'pressure', 'wind_speed']
+
+
+def run(n_stations, days, seed):
+    hours = np.arange(days * 24 + 1)
+    block = SyntheticWeatherGenerator(seed=seed, n_stations=n_stations).generate_block(hours)
+    values = np.stack([block[name] for name in VARIABLES], axis=-1).swapaxes(0, 1)  # instants × stations × variables
+    times = np.datetime64('2024-01-01T00') + hours.astype('timedelta64[h]')
+
+    nowcaster = HoltWintersNowcaster(n_stations, VARIABLES)
+    t0 = time.perf_counter()
+    nowcaster.fit(times[:-1], values[:-1])
+    fit_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    nowcaster.update(times[-1], values[-1])
+    update_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    forecast = nowcaster.forecast()
+    forecast_seconds = time.perf_counter() - t0
+
+    return {
+        'stations': n_stations,
+        'models': n_stations * len(VARIABLES),
+        'fit_seconds': round(fit_seconds, 4),
+        'update_ms': round(update_seconds * 1000, 3),
+        'forecast_ms': round(forecast_seconds * 1000, 3),
+        'mean_interval_width': round(float(np.nanmean(forecast['upper'] - forecast['lower'])), 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stations', default='1,100,1000,5000', help="tailles de réseau, séparées par des virgules")
+    parser.add_argument('--days', type=int, default=14)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for n_stations in (int(size) for size in args.stations.split(',')):
+        print(' • '.join(f"{key}: {value}" for key, value in run(n_stations, args.days, args.seed).items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark du démarrage à froid : temps jusqu'au premier rendu dans un processus neuf.
+
+Chaque mesure lance un interpréteur Python neuf qui exécute le dashboard via AppTest :
+imports de l'application, construction du premier instantané et rendu complet de main().
+Sont aussi mesurés, après le préchauffage de fond, un rerun et le premier passage sur un
+autre onglet (par défaut l'onglet Impact, qui charge plotly.express).
+
+Usage :
+    python benchmarks/bench_startup.py --repeat 5
+    python benchmarks/bench_startup.py --budget 6.0      # code retour 1 si dépassé
+    python benchmarks/bench_startup.py --importtime 15   # imports les plus coûteux
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, 'app.py')
+
+CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+from streamlit import logger
+logger.set_log_level("error")
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+at = AppTest.from_file({app!r}, default_timeout=300)
+at.run()
+t2 = time.perf_counter()
+time.sleep({settle})  # laisse le préchauffage de fond se terminer
+t3 = time.perf_counter()
+at.run()
+t4 = time.perf_counter()
+[radio for radio in at.radio if radio.label.startswith("Navigation")][0].set_value({tab!r}).run()
+t5 = time.perf_counter()
+print(json.dumps({{
+    'framework_s': t1 - t0,
+    'first_render_s': t2 - t1,
+    'rerun_s': t4 - t3,
+    'first_tab_switch_s': t5 - t4,
+    'exceptions': len(at.exception),
+    'modules': len(sys.modules)
+}}))
+"""
+
+
+def run_fresh_process(settle, tab, importtime=False):
+    """Une mesure dans un interpréteur neuf ; retourne les durées et la sortie -X importtime"""
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', CHILD.format(app=APP_PATH, settle=settle, tab=tab)]
+    with tempfile.TemporaryDirectory() as archive_dir:
+        # Archive vide : un démarrage à froid ne relit aucun historique
+        env = dict(os.environ, METEO_ARCHIVE_DIR=archive_dir)
+        t0 = time.perf_counter()
+        completed = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+        total = time.perf_counter() - t0
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['process_s'] = total
+    return result, completed.stderr
+
+
+def slowest_imports(stderr, top):
+    """Imports de premier niveau au coût cumulé le plus élevé (sortie de -X importtime)"""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Les imports imbriqués sont indentés ; l'en-tête n'est pas numérique
+        if cumulative.strip().isdigit() and not name[1:].startswith(' '):
+            imports.append((int(cumulative), name.strip()))
+    return sorted(imports, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--settle', type=float, default=3.0, help="attente (s) après le premier rendu")
+    parser.add_argument('--tab', default="📈 Impact Analysis", help="onglet ouvert après le premier rendu")
+    parser.add_argument('--budget', type=float, help="budget du premier rendu en secondes (médiane)")
+    parser.add_argument('--importtime', type=int, default=0, metavar='N', help="afficher les N imports les plus coûteux")
+    args = parser.parse_args()
+
+    runs = [run_fresh_process(args.settle, args.tab)[0] for _ in range(args.repeat)]
+    for key in ('framework_s', 'first_render_s', 'rerun_s', 'first_tab_switch_s', 'process_s'):
+        values = [run[key] for run in runs]
+        print(f"{key:>20}: médiane {statistics.median(values):.3f}s  min {min(values):.3f}s")
+    print(f"{'modules':>20}: {runs[-1]['modules']}")
+    print(f"{'exceptions':>20}: {sum(run['exceptions'] for run in runs)}")
+
+    if args.importtime:
+        _, stderr = run_fresh_process(args.settle, args.tab, importtime=True)
+        print("\nImports les plus coûteux (cumulé) :")
+        for microseconds, name in slowest_imports(stderr, args.importtime):
+            print(f"{microseconds / 1e6:>10.3f}s  {name}")
+
+    first_render = statistics.median(run['first_render_s'] for run in runs)
+    if args.budget is not None and first_render > args.budget:
+        print(f"\n⚠️ Premier rendu {first_render:.3f}s > budget {args.budget:.3f}s")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark de génération et de catégorisation des trajectoires de tempêtes.
+
+Mesure aussi la carte d'ensemble (toutes les trajectoires en traces WebGL séparées par des NaN).
+
+Usage :
+    python benchmarks/bench_storms.py --storms 10000 --points 100
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import EnhancedWeatherAnalytics, StormTrackStore, categorize_storm_intensity  # noqa: E402
+
+
+def run(n_storms, n_points, seed):
+    names = [f"{basin}-{i:05d}" for i, basin in
+             zip(range(n_storms), ['ATLANTIC', 'PACIFIC', 'INDIAN'] * n_storms)]
+
+    t0 = time.perf_counter()
+    store = StormTrackStore.generate(names, n_points=n_points, rng=seed)
+    generate_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    categorize_storm_intensity(store.intensity)
+    categorize_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for i in range(len(store)):
+        store.track(i)
+    track_seconds = time.perf_counter() - t0
+
+    analytics = EnhancedWeatherAnalytics(seed=seed)
+    t0 = time.perf_counter()
+    figure = analytics.build_storm_overview_figure(store)
+    overview_seconds = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    overview_json = figure.to_json()
+    serialize_seconds = time.perf_counter() - t0
+
+    return {
+        'storms': n_storms,
+        'points': int(store.offsets[-1]),
+        'generate_seconds': round(generate_seconds, 4),
+        'categorize_seconds': round(categorize_seconds, 4),
+        'track_views_seconds': round(track_seconds, 4),
+        'overview_points': int(sum(len(trace.lat) for trace in figure.data)),
+        'overview_seconds': round(overview_seconds, 4),
+        'overview_json_seconds': round(serialize_seconds, 4),
+        'overview_json_mb': round(len(overview_json) / 1e6, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--storms', type=int, default=10_000)
+    parser.add_argument('--points', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for key, value in run(args.storms, args.points, args.seed).items():
+        print(f"{key:>22}: {value}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""Suite de benchmarks du dashboard : méthodes d'EnhancedWeatherAnalytics et reruns complets.
+
+Micro-benchmarks de chaque méthode generate_* / create_* (et des build_*_figure associés)
+sur plusieurs tailles de données, puis exécution complète de main() via AppTest.
+Les résultats sont écrits en JSON pour être comparés à une référence.
+
+Usage :
+    python benchmarks/bench_suite.py --output benchmarks/results.json
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json --threshold 1.2
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit import logger  # noqa: E402
+
+logger.set_log_level("error")
+
+import numpy as np  # noqa: E402
+
+import app  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, 'app.py')
+
+GENERATE_METHODS = [
+    'generate_enhanced_sample_data',
+    'generate_enhanced_storm_data',
+    'generate_ai_predictions',
+    'generate_weather_alerts'
+]
+
+CREATE_METHODS = [
+    'create_advanced_metrics_dashboard',
+    'create_ai_weather_analysis',
+    'create_advanced_storm_analytics',
+    'create_weather_impact_analysis',
+    'create_impact_timeline',
+    'create_climate_analytics'
+]
+
+
+def measure(func, repeat):
+    """Exécute `func` `repeat` fois ; retourne durées (s) et pic mémoire (octets)"""
+    durations = []
+    peak = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        result = func()
+        durations.append(time.perf_counter() - t0)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {
+        'min_s': round(min(durations), 6),
+        'median_s': round(statistics.median(durations), 6),
+        'peak_bytes': peak
+    }, result
+
+
+def build_analytics(days):
+    """Analytics reproductibles avec `days` jours de données horaires"""
+    analytics = app.EnhancedWeatherAnalytics(seed=42)
+    analytics.weather_data = analytics.generate_enhanced_sample_data(days_back=days, days_ahead=7)
+    analytics.data_version = app.compute_data_version(analytics.weather_data, analytics.storm_tracks)
+    return analytics
+
+
+def bench_methods(sizes, repeat):
+    results = {}
+    for days in sizes:
+        analytics = build_analytics(days)
+        rows = len(analytics.weather_data)
+
+        for name in GENERATE_METHODS:
+            method = getattr(analytics, name)
+            if name == 'generate_enhanced_sample_data':
+                stats, _ = measure(lambda: method(days_back=days, days_ahead=7), repeat)
+            else:
+                stats, _ = measure(method, repeat)
+            results[f"{name}[{days}d]"] = dict(stats, rows=rows)
+
+        figure_cache = app.get_figure_cache()
+        for name in CREATE_METHODS:
+            method = getattr(analytics, name)
+
+            def cold_call():
+                figure_cache.clear()
+                method()
+
+            stats, _ = measure(cold_call, repeat)
+            results[f"{name}[{days}d]"] = dict(stats, rows=rows)
+
+        for name in sorted(dir(analytics)):
+            if not (name.startswith('build_') and name.endswith('_figure')):
+                continue
+            method = getattr(analytics, name)
+            args = {
+                'build_ai_analysis_figure': ("Tout", app.MAX_POINTS_PER_TRACE),
+                'build_storm_track_figure': (analytics.storm_tracks.names[0],),
+                'build_storm_intensity_figure': (analytics.storm_tracks.names[0],),
+                'build_storm_overview_figure': (app.get_storm_history(),),
+                'build_impact_matrix_figure': (["Agriculture", "Transport", "Énergie", "Tourisme"],)
+            }.get(name, ())
+            stats, figure = measure(lambda: method(*args), repeat)
+            results[f"{name}[{days}d]"] = dict(stats, rows=rows, json_bytes=len(figure.to_json()))
+    return results
+
+
+def element_tree_bytes(node):
+    """Taille sérialisée (protobuf) de tous les éléments d'un arbre AppTest"""
+    total = 0
+    proto = getattr(node, 'proto', None)
+    if proto is not None and hasattr(proto, 'ByteSize'):
+        total += proto.ByteSize()
+    for child in getattr(node, 'children', {}).values():
+        total += element_tree_bytes(child)
+    return total
+
+
+def bench_full_reruns(repeat):
+    """Temps d'une exécution complète de main() (premier rendu puis reruns) via AppTest"""
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    at = AppTest.from_file(APP_PATH, default_timeout=300)
+    at.run()
+    results['main[first_run]'] = {
+        'min_s': round(time.perf_counter() - t0, 6),
+        'peak_bytes': tracemalloc.get_traced_memory()[1],
+        'output_bytes': element_tree_bytes(at._tree),
+        'exceptions': len(at.exception)
+    }
+    tracemalloc.stop()
+
+    stats, _ = measure(at.run, repeat)
+    results['main[rerun]'] = dict(stats, output_bytes=element_tree_bytes(at._tree))
+
+    # Chaque onglet, en navigation paresseuse
+    navigation = [radio for radio in at.radio if radio.label.startswith("Navigation")]
+    if navigation:
+        for option in navigation[0].options:
+            def select_tab(option=option):
+                [radio for radio in at.radio if radio.label.startswith("Navigation")][0].set_value(option).run()
+
+            stats, _ = measure(select_tab, repeat)
+            results[f"main[tab={option}]"] = dict(stats, output_bytes=element_tree_bytes(at._tree))
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Affiche les ratios par rapport à la référence ; retourne les régressions"""
+    regressions = []
+    for name, current in results['benchmarks'].items():
+        reference = baseline.get('benchmarks', {}).get(name)
+        if not reference or not reference.get('min_s'):
+            continue
+        ratio = current['min_s'] / reference['min_s']
+        flag = "  ⚠️ régression" if ratio > threshold else ""
+        print(f"{name:<60} {reference['min_s']:>10.4f}s -> {current['min_s']:>10.4f}s  x{ratio:.2f}{flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='21,90,365', help="tailles de données en jours, séparées par des virgules")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--skip-app', action='store_true', help="ne pas exécuter main() via AppTest")
+    parser.add_argument('--output', default=os.path.join(ROOT, 'benchmarks', 'results.json'))
+    parser.add_argument('--baseline', help="fichier JSON de référence à comparer")
+    parser.add_argument('--threshold', type=float, default=1.2, help="ratio au-delà duquel signaler une régression")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    benchmarks = bench_methods(sizes, args.repeat)
+    if not args.skip_app:
+        benchmarks.update(bench_full_reruns(args.repeat))
+
+    results = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': app.pd.__version__,
+        'sizes_days': sizes,
+        'repeat': args.repeat,
+        'benchmarks': benchmarks
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    for name, stats in benchmarks.items():
+        print(f"{name:<60} {stats['min_s']:>10.4f}s  peak {stats['peak_bytes'] / 1e6:>8.1f} MB")
+    print(f"\nRésultats écrits dans {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        print()
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
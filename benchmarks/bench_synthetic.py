@@ -0,0 +1,59 @@
+"""Benchmark de débit du générateur de données synthétiques.
+
+Usage :
+    python benchmarks/bench_synthetic.py --stations 1000 --days 30 --freq min
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from app import SyntheticWeatherGenerator  # noqa: E402
+
+
+def run(stations, days, freq, chunk_size, seed, dtype):
+    generator = SyntheticWeatherGenerator(seed=seed, n_stations=stations, dtype=dtype)
+    start = np.datetime64('2024-01-01T00:00')
+    end = start + np.timedelta64(days, 'D')
+
+    rows = 0
+    nbytes = 0
+    t0 = time.perf_counter()
+    for chunk in generator.iter_chunks(start, end, freq=freq, chunk_size=chunk_size):
+        rows += len(chunk)
+        nbytes += chunk.memory_usage(index=False).sum()
+    elapsed = time.perf_counter() - t0
+
+    return {
+        'stations': stations,
+        'days': days,
+        'freq': freq,
+        'rows': rows,
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(rows / elapsed),
+        'mb_per_second': round(nbytes / elapsed / 1e6, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stations', type=int, default=100)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--freq', default='h')
+    parser.add_argument('--chunk-size', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--float32', action='store_true')
+    args = parser.parse_args()
+
+    result = run(args.stations, args.days, args.freq, args.chunk_size, args.seed,
+                 np.float32 if args.float32 else np.float64)
+    for key, value in result.items():
+        print(f"{key:>16}: {value}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+import numpy as np
+
+from app import PRESSURE_TENDENCY_THRESHOLD, EnhancedWeatherAnalytics, StreamingAnomalyDetector
+
+
+def pressure_events(pressures):
+    detector = StreamingAnomalyDetector(1, ['pressure'])
+    start = np.datetime64('2024-01-01T00:00')
+    events = []
+    for hour, pressure in enumerate(pressures):
+        events += detector.update(start + np.timedelta64(hour, 'h'), [pressure])
+    return detector, [event for event in events if event['kind'] == 'pressure_tendency']
+
+
+def test_rapid_pressure_fall_emits_tendency_event():
+    rng = np.random.default_rng(0)
+    steady = 1013 + rng.normal(0, 0.2, 72)
+    fall = steady[-1] - 4 / 3 * np.arange(1, 4)  # −4 hPa en 3 h
+    detector, events = pressure_events(np.concatenate([steady, fall, np.full(6, fall[-1])]))
+    assert len(events) == 1
+    assert events[0]['value'] <= -PRESSURE_TENDENCY_THRESHOLD
+    assert events[0]['time'] == np.datetime64('2024-01-01T00:00') + np.timedelta64(74, 'h')
+
+
+def test_sensor_noise_does_not_emit_tendency_event():
+    rng = np.random.default_rng(1)
+    _, events = pressure_events(1013 + rng.normal(0, 0.5, 240))
+    assert events == []
+
+
+def test_simulated_pressure_does_not_flood_tendency_events():
+    for seed in range(3):
+        analytics = EnhancedWeatherAnalytics(seed=seed)
+        events = [event for event in analytics.anomaly_detector.events if event['kind'] == 'pressure_tendency']
+        assert len(events) <= 1
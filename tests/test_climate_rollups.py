@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+import pandas as pd
+
+from app import ClimateRollups, EnhancedWeatherAnalytics, utc_now
+
+SPEC = {'temperature': 'mean', 'precipitation': 'sum', 'wind_speed': 'max', 'pressure': 'min'}
+
+
+def test_rollups_advanced_on_refresh_match_a_full_rebuild():
+    analytics = EnhancedWeatherAnalytics(seed=3)
+    refreshed = analytics.refreshed(now=utc_now() + timedelta(hours=30))
+    rebuilt = ClimateRollups.from_frame(refreshed.weather_data)
+
+    for resolution in ('hour', 'day', 'month'):
+        pd.testing.assert_frame_equal(refreshed.rollups.aggregate(resolution, SPEC),
+                                      rebuilt.aggregate(resolution, SPEC))
+    # Les agrégats de l'instantané partagé ne voient pas les nouvelles heures
+    assert analytics.rollups.levels['hour'].size == len(analytics.weather_data)
@@ -0,0 +1,64 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as pa_ipc
+import pyarrow.parquet as pq
+import pytest
+
+import app
+
+
+def test_sweep_removes_only_stale_exports(tmp_path):
+    stale = tmp_path / f"{app.EXPORT_FILE_PREFIX}old.csv"
+    fresh = tmp_path / f"{app.EXPORT_FILE_PREFIX}new.csv"
+    other = tmp_path / "other.csv"
+    for path in (stale, fresh, other):
+        path.write_text("x")
+    old = time.time() - app.EXPORT_FILE_TTL - 60
+    os.utime(stale, (old, old))
+    os.utime(other, (old, old))
+
+    assert app.sweep_stale_exports(directory=tmp_path) == 1
+    assert not stale.exists()
+    assert fresh.exists() and other.exists()
+
+
+def _chunks(n_chunks=3, rows=1000):
+    for i in range(n_chunks):
+        times = pd.date_range("2024-01-01", periods=rows, freq="h") + pd.Timedelta(hours=i * rows)
+        yield pd.DataFrame({'datetime': times, 'temperature': np.arange(rows, dtype=np.float32) + i})
+
+
+def _read(path, export_format, compression):
+    if export_format == 'CSV':
+        return pd.read_csv(path, parse_dates=['datetime'], compression=compression)
+    if export_format == 'Parquet':
+        return pq.read_table(path).to_pandas()
+    with pa.memory_map(str(path)) as source:
+        return pa_ipc.open_file(source).read_all().to_pandas()
+
+
+@pytest.mark.parametrize("export_format, compression", [
+    ('CSV', None), ('CSV', 'gzip'), ('Parquet', 'zstd'), ('Arrow IPC', None), ('Arrow IPC', 'lz4')
+])
+def test_write_export_round_trip(tmp_path, export_format, compression):
+    path = tmp_path / app.export_file_name("export", export_format, compression)
+    expected = pd.concat(_chunks(), ignore_index=True)
+
+    assert app.write_export(_chunks(), str(path), export_format, compression) == len(expected)
+    result = _read(path, export_format, compression)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("export_format", ['CSV', 'Parquet', 'Arrow IPC'])
+def test_write_export_parts_are_standalone_files(tmp_path, export_format):
+    paths = iter(tmp_path / f"part{i}" for i in range(10))
+    expected = pd.concat(_chunks(4), ignore_index=True)
+
+    parts = app.write_export_parts(_chunks(4), lambda: str(next(paths)), export_format, part_bytes=1)
+    assert [rows for _, rows in parts] == [1000] * 4
+    result = pd.concat([_read(path, export_format, None) for path, _ in parts], ignore_index=True)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
@@ -0,0 +1,27 @@
+import copy
+from datetime import timedelta
+
+import numpy as np
+
+from app import EnhancedWeatherAnalytics, utc_now
+
+
+def test_refresh_updates_the_fitted_nowcaster_without_refitting():
+    analytics = EnhancedWeatherAnalytics(seed=4)
+    now = utc_now() + timedelta(hours=6)
+    refreshed = analytics.refreshed(now=now)
+
+    # Même résultat qu'en rejouant les heures devenues passées sur le modèle ajusté
+    expected = copy.deepcopy(analytics.nowcaster)
+    times = refreshed.observations.times()
+    passed = (times > analytics.observed_until) & (times <= np.datetime64(now, 'ns'))
+    for i in np.flatnonzero(passed):
+        expected.update(times[i], [refreshed.observations.values(name)[i] for name in expected.variables])
+
+    nowcaster = refreshed.nowcaster
+    assert nowcaster.last_hour == analytics.nowcaster.last_hour + 6
+    for name in ('alpha', 'beta', 'gamma'):
+        np.testing.assert_array_equal(getattr(nowcaster, name), getattr(analytics.nowcaster, name))
+    for name in ('level', 'trend', 'season', 'sse'):
+        np.testing.assert_allclose(getattr(nowcaster, name), getattr(expected, name))
+    assert refreshed.ai_predictions != analytics.ai_predictions
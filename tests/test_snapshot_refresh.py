@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from app import EnhancedWeatherAnalytics, SnapshotPrefetcher, _build_shared_analytics, station_ids, utc_now
+
+
+def test_refresh_appends_only_new_hours_without_touching_the_shared_snapshot():
+    analytics = EnhancedWeatherAnalytics(seed=1)
+    size, last = analytics.observations.size, analytics.observations.times()[-1]
+    samples, last_hour = analytics.anomaly_detector.samples, analytics.nowcaster.last_hour
+
+    refreshed = analytics.refreshed(now=utc_now() + timedelta(hours=3))
+
+    times = refreshed.observations.times()
+    assert refreshed.observations.size == size + 3
+    assert np.array_equal(times[-4:], last + np.arange(4) * np.timedelta64(1, 'h'))
+    assert refreshed.anomaly_detector.samples == samples + 3
+    assert refreshed.nowcaster.last_hour == last_hour + 3
+    assert refreshed.weather_alerts == refreshed.generate_weather_alerts()
+    assert refreshed.data_version != analytics.data_version
+    # L'instantané d'origine est lu par d'autres sessions : il reste intact
+    assert analytics.observations.size == size and analytics.observations.times()[-1] == last
+    assert analytics.anomaly_detector.samples == samples and analytics.nowcaster.last_hour == last_hour
+
+
+def test_refresh_from_provider_frame_skips_hours_already_buffered():
+    analytics = EnhancedWeatherAnalytics(seed=2)
+    frame = analytics.weather_data.copy()
+    last = frame['datetime'].iloc[-1]
+    extra = frame.tail(2).assign(datetime=[last + timedelta(hours=1), last + timedelta(hours=2)])
+    analytics._generator = None  # données d'un fournisseur : pas de générateur à poursuivre
+
+    refreshed = analytics.refreshed(frame=pd.concat([frame, extra], ignore_index=True))
+
+    assert refreshed.observations.size == analytics.observations.size + 2
+    assert refreshed.observations.times()[-1] == np.datetime64(last + timedelta(hours=2), 'ns')
+
+
+class _Snapshot:
+    def __init__(self, previous):
+        self.previous = previous
+        self.built_at = 0.0  # toujours échu
+
+
+def test_prefetcher_extends_due_snapshots_and_rebuilds_after_invalidate():
+    builds = []
+
+    def build(key, previous=None):
+        builds.append(previous)
+        return _Snapshot(previous)
+
+    prefetcher = SnapshotPrefetcher(build)
+    prefetcher._ensure_worker = lambda: None  # cycles de fond pilotés par le test
+    first = prefetcher.get(('config',), interval=60)
+    assert builds == [None]
+    assert prefetcher._due()[0] == [(('config',), first)]
+    prefetcher.invalidate()
+    assert prefetcher._due()[0] == [(('config',), None)]
+
+
+def test_storms_are_shared_across_stations_of_a_window():
+    stations = station_ids(10)
+    first = _build_shared_analytics(5, "Simulation", None, (10, stations[1]))
+    second = _build_shared_analytics(5, "Simulation", None, (10, stations[7]))
+
+    assert first.storm_tracks is second.storm_tracks
+    assert first.storm_ensembles is second.storm_ensembles
+    assert first.station_id != second.station_id
+
+
+def test_impact_figures_do_not_draw_from_the_shared_generator():
+    analytics = EnhancedWeatherAnalytics(seed=3)
+    state = analytics.rng.bit_generator.state
+
+    matrix = analytics.build_impact_matrix_figure(['Agriculture', 'Transport'])
+    timeline = analytics.build_impact_timeline_figure()
+
+    assert analytics.rng.bit_generator.state == state
+    assert matrix.data[0].x.tolist() == analytics.build_impact_matrix_figure(['Agriculture', 'Transport']).data[0].x.tolist()
+    assert timeline.data[0].y.tolist() == analytics.build_impact_timeline_figure().data[0].y.tolist()
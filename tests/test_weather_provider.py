@@ -0,0 +1,117 @@
+import json
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+import app
+from app import OPEN_METEO_VARIABLES, WeatherProvider
+
+ETAG = '"forecast-v1"'
+
+
+def forecast_payload(hours=48):
+    times = pd.date_range('2024-01-01', periods=hours, freq='h').strftime('%Y-%m-%dT%H:%M').tolist()
+    hourly = {'time': times}
+    hourly.update({source: [float(i) for i in range(hours)] for source in OPEN_METEO_VARIABLES})
+    return {'hourly': hourly}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Répond selon `server.failures` (réponses 503 initiales) et l'ETag courant"""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append({'path': self.path, 'if_none_match': self.headers.get('If-None-Match')})
+        if server.failures > 0:
+            server.failures -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.send_header('ETag', ETAG)
+            self.end_headers()
+            return
+        body = json.dumps(forecast_payload()).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.requests = []
+    server.failures = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def provider_for(server, **options):
+    options.setdefault('backoff_factor', 0)
+    return WeatherProvider(base_url=f"http://127.0.0.1:{server.server_port}/v1/forecast", **options)
+
+
+def test_not_modified_reuses_cached_frame(stub_server):
+    provider = provider_for(stub_server)
+    first = provider.fetch_location(-20.9, 55.5)
+    second = provider.fetch_location(-20.9, 55.5)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert len(first) == 48
+    assert [request['if_none_match'] for request in stub_server.requests] == [None, ETAG]
+    assert provider.stats == {'requests': 2, 'not_modified': 1}
+
+
+def test_retries_server_errors(stub_server):
+    stub_server.failures = 2
+    frame = provider_for(stub_server, retries=3).fetch_location(-20.9, 55.5)
+
+    assert len(frame) == 48
+    assert len(stub_server.requests) == 3
+
+
+def test_falls_back_to_simulation_on_connection_error(monkeypatch):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]  # port libéré : connexion refusée
+    provider = WeatherProvider(base_url=f"http://127.0.0.1:{port}/v1/forecast", timeout=1, retries=0)
+    monkeypatch.setattr(app, 'get_weather_provider', lambda: provider)
+
+    analytics = app._build_live_analytics("Open-Meteo")
+
+    assert analytics.data_source == "Simulation (API indisponible)"
+    assert analytics.provider is None
+    assert len(analytics.weather_data) > 0
+
+
+def test_provider_hours_split_at_utc_now_on_a_non_utc_host(monkeypatch):
+    monkeypatch.setenv('TZ', 'Pacific/Auckland')  # UTC+12/+13 : une demi-journée d'écart
+    time.tzset()
+    try:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        times = pd.date_range(pd.Timestamp(now).floor('h') - pd.Timedelta(hours=72), periods=144, freq='h')
+        frame = pd.DataFrame({'datetime': times, 'temperature': 20.0, 'humidity': 60.0, 'pressure': 1013.0,
+                              'wind_speed': 10.0, 'gust_speed': 15.0, 'precipitation': 0.0, 'visibility': 20.0})
+        analytics = app.EnhancedWeatherAnalytics(weather_data=frame)
+    finally:
+        monkeypatch.delenv('TZ')
+        time.tzset()
+
+    observed = times[times <= now]
+    assert analytics.anomaly_detector.samples == len(observed)
+    assert analytics.nowcaster.last_hour == observed[-1].value // 3_600_000_000_000